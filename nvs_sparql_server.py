@@ -22,10 +22,17 @@ Endpoint: http://vocab.nerc.ac.uk/sparql/sparql
 Docs: http://vocab.nerc.ac.uk/sparql/
 """
 
-import json
+import asyncio
+import os
+import re
+import sys
+import time
+from itertools import islice
 from pathlib import Path
 
 import httpx
+import ijson
+import orjson
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
@@ -36,8 +43,33 @@ NVS_BASE_URL = "http://vocab.nerc.ac.uk"
 # Optional: local store integration (requires pyoxigraph)
 STORE_PATH = Path.home() / ".ait" / "store"
 
+# On-disk cache for collection downloads, revalidated with ETags. A
+# sibling of the store directory, never inside it: STORE_PATH is opened
+# as a RocksDB database, which must not contain foreign files
+DOWNLOADS_PATH = Path.home() / ".ait" / "downloads"
+
 server = Server("nvs-sparql")
 
+# Parsed once; httpx skips URL re-parsing when handed a URL object, which
+# matters for small, frequent SPARQL calls
+_SPARQL_URL = httpx.URL(NVS_SPARQL_ENDPOINT)
+
+# Shared HTTP client with a keep-alive connection pool so repeated SPARQL
+# calls reuse sockets instead of paying a fresh TCP handshake per query.
+# trust_env=False skips proxy env-var discovery on every request.
+_client = httpx.AsyncClient(
+    trust_env=False,
+    timeout=httpx.Timeout(120.0, connect=10.0),
+    # SPARQL JSON/Turtle is highly redundant text and compresses ~10x;
+    # httpx decodes transparently (brotli via the httpx[brotli] extra)
+    headers={"Accept-Encoding": "gzip, br"},
+    limits=httpx.Limits(
+        max_connections=32,
+        max_keepalive_connections=16,
+        keepalive_expiry=60.0,
+    ),
+)
+
 
 async def execute_sparql(
     query: str,
@@ -57,39 +89,343 @@ async def execute_sparql(
             - text/n3 (CONSTRUCT/DESCRIBE)
             - application/n-triples (CONSTRUCT/DESCRIBE)
     """
-    async with httpx.AsyncClient(timeout=120.0) as client:
-        response = await client.get(
-            NVS_SPARQL_ENDPOINT,
+    response = await _client.get(
+        _SPARQL_URL,
+        params={"query": query},
+        headers={"Accept": accept},
+    )
+    response.raise_for_status()
+    return response
+
+
+# TTL cache for queries whose answers change on the order of weeks
+# (collection/scheme listings, count stats). Keyed on (query, accept);
+# stores decoded body bytes since httpx responses are single-use.
+_query_cache: dict[tuple[str, str], tuple[float, bytes]] = {}
+CACHE_TTL = 3600.0  # 1 hour
+
+
+async def execute_sparql_cached(
+    query: str,
+    accept: str = "application/sparql-results+json",
+    ttl: float = CACHE_TTL,
+) -> bytes:
+    """Execute a SPARQL query, serving repeats from an in-memory TTL cache.
+
+    Only suitable for queries against slow-changing vocabulary metadata.
+    Returns the response body bytes.
+    """
+    key = (query, accept)
+    now = time.monotonic()
+    cached = _query_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+    response = await execute_sparql(query, accept)
+    _query_cache[key] = (now + ttl, response.content)
+    return response.content
+
+
+def escape_sparql_string(value: str) -> str:
+    """Escape a value for inclusion in a SPARQL string literal (SPARQL 1.1 §19.7)."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+_LUCENE_SPECIALS = set('+-&|!(){}[]^"~*?:\\/')
+
+
+def escape_lucene_term(value: str) -> str:
+    """Backslash-escape Lucene query syntax for a Jena text:query literal."""
+    return "".join(f"\\{ch}" if ch in _LUCENE_SPECIALS else ch for ch in value)
+
+
+_IRI_FORBIDDEN = set('<>"{}|^`\\ \t\n\r')
+
+
+def is_safe_iri(uri: str) -> bool:
+    """Check that a user-supplied IRI can be safely wrapped in <...>."""
+    return bool(uri) and not any(ch in _IRI_FORBIDDEN for ch in uri)
+
+
+def sparql_values(**bindings: str) -> str:
+    """Build a VALUES block binding user-supplied strings to query variables.
+
+    Keeping literals out of the query body means the query text is constant
+    across invocations (modulo the VALUES row), so server-side plan caches
+    and execute_sparql_cached can hit; it also confines escaping to one place.
+    """
+    names = " ".join(f"?{name}" for name in bindings)
+    row = " ".join(f'"{escape_sparql_string(value)}"' for value in bindings.values())
+    return f"VALUES ({names}) {{ ({row}) }}"
+
+
+# Full-text-search backend detected at first search: "virtuoso" (bif:contains),
+# "jena" (text:query), or "none" (fall back to a CONTAINS scan).
+_fts_backend: str | None = None
+
+
+async def detect_fts_backend() -> str:
+    """Probe which full-text index the NVS SPARQL backend exposes (cached).
+
+    Only completed probes are cached: a query rejection means the backend
+    lacks that syntax, but a transport failure says nothing about it, so
+    the next search re-probes instead of being pinned to a CONTAINS scan.
+    """
+    global _fts_backend
+    if _fts_backend is not None:
+        return _fts_backend
+
+    virtuoso_probe = """
+PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
+SELECT ?label WHERE { ?c skos:prefLabel ?label . ?label bif:contains "'water'" } LIMIT 1
+"""
+    jena_probe = """
+PREFIX text: <http://jena.apache.org/text#>
+PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
+SELECT ?c WHERE { ?c text:query (skos:prefLabel "water") } LIMIT 1
+"""
+    try:
+        await execute_sparql(virtuoso_probe)
+        _fts_backend = "virtuoso"
+        return _fts_backend
+    except httpx.TransportError:
+        return "none"
+    except httpx.HTTPStatusError:
+        pass
+    try:
+        await execute_sparql(jena_probe)
+        _fts_backend = "jena"
+    except httpx.TransportError:
+        return "none"
+    except httpx.HTTPStatusError:
+        _fts_backend = "none"
+    return _fts_backend
+
+
+class _AsyncByteReader:
+    """Adapt an async byte iterator to the async file API ijson expects."""
+
+    def __init__(self, aiter):
+        self._aiter = aiter
+
+    async def read(self, n: int = -1) -> bytes:
+        if n == 0:  # ijson probes with read(0) to detect the stream type
+            return b""
+        try:
+            return await self._aiter.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+
+async def stream_sparql_bindings(
+    query: str,
+    max_results: int = 100,
+) -> tuple[list[dict[str, str]], bool]:
+    """Stream SELECT bindings, stopping once max_results rows have arrived.
+
+    Unlike execute_sparql, this never materializes the full response body:
+    bindings are pulled incrementally off the wire and the connection is
+    closed as soon as enough rows are in hand. Returns (rows, truncated).
+
+    Intended for user-supplied queries that may lack a LIMIT clause.
+    """
+    rows: list[dict[str, str]] = []
+    truncated = False
+    async with _client.stream(
+        "GET",
+        _SPARQL_URL,
+        params={"query": query},
+        headers={"Accept": "application/sparql-results+json"},
+    ) as response:
+        if response.is_error:
+            await response.aread()  # make error body available to handlers
+        response.raise_for_status()
+        reader = _AsyncByteReader(response.aiter_bytes())
+        async for binding in ijson.items(reader, "results.bindings.item"):
+            if len(rows) >= max_results:
+                truncated = True
+                break
+            rows.append(
+                {sys.intern(key): val.get("value", "") for key, val in binding.items()}
+            )
+    return rows, truncated
+
+
+async def stream_sparql_text(query: str, accept: str, limit: int) -> str:
+    """Stream a non-JSON response body, keeping only the first `limit` bytes.
+
+    Stops reading (and closes the connection) as soon as the display budget
+    is exceeded, so a multi-MB Turtle response costs O(limit) memory and
+    decode time instead of O(response_size).
+    """
+    buf = bytearray()
+    async with _client.stream(
+        "GET",
+        _SPARQL_URL,
+        params={"query": query},
+        headers={"Accept": accept},
+    ) as response:
+        if response.is_error:
+            await response.aread()  # make error body available to handlers
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes():
+            buf.extend(chunk)
+            if len(buf) >= limit + 4096:
+                break
+    return buf[:limit].decode("utf-8", errors="replace")
+
+
+async def download_collection_to_store(
+    collection_id: str,
+    query: str,
+    accept: str,
+    fmt: str,
+) -> list[TextContent]:
+    """Stream a collection download into the local pyoxigraph store.
+
+    The response body is spooled chunk-by-chunk to a temp file and bulk-loaded
+    by path, so peak memory stays at O(chunk) instead of O(serialized_rdf) -
+    the RDF text is never held as a Python string.
+    """
+    import tempfile
+
+    import pyoxigraph as ox
+
+    graph_uri = f"urn:nvs:collection:{collection_id}"
+    size = 0
+    with tempfile.NamedTemporaryFile(suffix=f".{fmt}") as tmp:
+        async with _client.stream(
+            "GET",
+            _SPARQL_URL,
             params={"query": query},
             headers={"Accept": accept},
+        ) as response:
+            if response.is_error:
+                await response.aread()
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                tmp.write(chunk)
+                size += len(chunk)
+        tmp.flush()
+
+        STORE_PATH.mkdir(parents=True, exist_ok=True)
+        store = ox.Store(str(STORE_PATH))
+        before = len(store)
+        store.bulk_load(
+            path=tmp.name,
+            format=ox.RdfFormat.from_media_type(accept),
+            base_iri=NVS_BASE_URL,
+            to_graph=ox.NamedNode(graph_uri),
         )
+        loaded = len(store) - before
+
+    return [
+        TextContent(
+            type="text",
+            text=(
+                f"Cached collection {collection_id} ({size / 1024:.1f} KB, format: {fmt})\n"
+                f"Loaded {loaded} new triples into graph <{graph_uri}> at {STORE_PATH}"
+            ),
+        )
+    ]
+
+
+# Display budget for downloaded RDF in tool output
+DOWNLOAD_DISPLAY_LIMIT = 100_000
+
+
+async def fetch_collection_rdf(
+    collection_id: str, query: str, accept: str, fmt: str
+) -> tuple[str, int, int]:
+    """Fetch a serialized collection, revalidating an on-disk cache via ETag.
+
+    When a previous download left an ETag, the request goes out with
+    If-None-Match; a 304 answer costs one round-trip and no body, and the
+    cached file is served instead of re-downloading a multi-MB dump.
+
+    The body is streamed to disk while size and line count accumulate per
+    chunk, so only the display excerpt is ever held in memory. Returns
+    (display_text, total_bytes, newline_count).
+    """
+    cache_file = DOWNLOADS_PATH / f"{collection_id}.{fmt}"
+    meta_file = DOWNLOADS_PATH / f"{collection_id}.{fmt}.meta"
+
+    headers = {"Accept": accept}
+    if cache_file.exists() and meta_file.exists():
+        try:
+            etag = orjson.loads(meta_file.read_bytes()).get("etag")
+        except Exception:
+            etag = None
+        if etag:
+            headers["If-None-Match"] = etag
+
+    size = 0
+    newlines = 0
+    buf = bytearray()
+    async with _client.stream(
+        "GET",
+        _SPARQL_URL,
+        params={"query": query},
+        headers=headers,
+    ) as response:
+        if response.status_code == 304:
+            data = cache_file.read_bytes()
+            display = data[:DOWNLOAD_DISPLAY_LIMIT].decode("utf-8", errors="replace")
+            return display, len(data), data.count(b"\n")
+        if response.is_error:
+            await response.aread()
         response.raise_for_status()
-        return response
+
+        DOWNLOADS_PATH.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+        with open(tmp_file, "wb") as out:
+            async for chunk in response.aiter_bytes():
+                out.write(chunk)
+                size += len(chunk)
+                newlines += chunk.count(b"\n")
+                if len(buf) < DOWNLOAD_DISPLAY_LIMIT:
+                    buf.extend(chunk[: DOWNLOAD_DISPLAY_LIMIT - len(buf)])
+
+        etag = response.headers.get("etag")
+        if etag:
+            # Rename atomically so a crash mid-write never leaves a cache
+            # file that disagrees with its recorded ETag
+            os.replace(tmp_file, cache_file)
+            tmp_meta = meta_file.with_name(meta_file.name + ".tmp")
+            tmp_meta.write_bytes(orjson.dumps({"etag": etag, "fetched_at": time.time()}))
+            os.replace(tmp_meta, meta_file)
+        else:
+            tmp_file.unlink(missing_ok=True)
+
+    return buf.decode("utf-8", errors="replace"), size, newlines
 
 
 def format_sparql_json(data: dict, max_results: int = 100) -> str:
     """Format SPARQL JSON results as simplified JSON."""
     results = data.get("results", {}).get("bindings", [])
-    simplified = []
-    for binding in results[:max_results]:
-        row = {}
-        for key, val in binding.items():
-            row[key] = val.get("value", "")
-        simplified.append(row)
+    # Intern the column-name keys: every row repeats the same handful of
+    # variable names, but the JSON parse allocates a fresh str per row
+    simplified = [
+        {sys.intern(key): val.get("value", "") for key, val in binding.items()}
+        for binding in islice(results, max_results)
+    ]
 
     total = len(results)
     shown = len(simplified)
-    output = json.dumps(simplified, indent=2)
+    output = orjson.dumps(simplified, option=orjson.OPT_INDENT_2).decode()
 
     if total > shown:
         output += f"\n\n... and {total - shown} more results (truncated)"
     return output
 
 
-@server.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available tools."""
-    return [
+# Built once at import - the tool list is static, so rebuilding ten Tool
+# objects with their schema dicts on every tools/list call is pure waste
+_TOOLS: list[Tool] = [
         Tool(
             name="nvs_sparql",
             description=(
@@ -225,6 +561,13 @@ async def list_tools() -> list[Tool]:
                         "enum": ["turtle", "rdfxml", "jsonld", "ntriples"],
                         "description": "RDF format (default: turtle)",
                     },
+                    "persist": {
+                        "type": "boolean",
+                        "description": (
+                            "If true, stream the collection directly into the "
+                            "local ait store instead of returning the RDF text"
+                        ),
+                    },
                 },
                 "required": ["collection_id"],
             },
@@ -240,70 +583,36 @@ async def list_tools() -> list[Tool]:
     ]
 
 
+@server.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available tools."""
+    return _TOOLS
+
+
+_FORMAT_ACCEPT = {
+    "json": "application/sparql-results+json",
+    "csv": "text/csv",
+    "tsv": "text/tab-separated-values",
+    "turtle": "text/turtle",
+    "rdfxml": "application/rdf+xml",
+    "jsonld": "application/ld+json",
+    "n3": "text/n3",
+    "ntriples": "application/n-triples",
+}
+
+
 def get_accept_header(format_name: str | None, is_construct: bool = False) -> str:
     """Map format name to Accept header."""
-    formats = {
-        "json": "application/sparql-results+json",
-        "csv": "text/csv",
-        "tsv": "text/tab-separated-values",
-        "turtle": "text/turtle",
-        "rdfxml": "application/rdf+xml",
-        "jsonld": "application/ld+json",
-        "n3": "text/n3",
-        "ntriples": "application/n-triples",
-    }
-    if format_name and format_name in formats:
-        return formats[format_name]
+    if format_name and format_name in _FORMAT_ACCEPT:
+        return _FORMAT_ACCEPT[format_name]
     # Default based on query type
     return "text/turtle" if is_construct else "application/sparql-results+json"
 
 
-@server.call_tool()
-async def call_tool(name: str, arguments: dict) -> list[TextContent]:
-    """Handle tool calls."""
-
-    match name:
-        case "nvs_sparql":
-            query = arguments["query"]
-            query_upper = query.upper()
-            is_construct = "CONSTRUCT" in query_upper or "DESCRIBE" in query_upper
-            fmt = arguments.get("format")
-            accept = get_accept_header(fmt, is_construct)
-
-            try:
-                response = await execute_sparql(query, accept)
-
-                if accept == "application/sparql-results+json":
-                    data = response.json()
-                    bindings = data.get("results", {}).get("bindings", [])
-                    result_text = format_sparql_json(data)
-                    return [
-                        TextContent(
-                            type="text",
-                            text=f"Found {len(bindings)} results:\n{result_text}",
-                        )
-                    ]
-                else:
-                    # Return raw RDF/CSV/TSV
-                    return [
-                        TextContent(
-                            type="text",
-                            text=response.text[:50000],  # Truncate large responses
-                        )
-                    ]
-            except httpx.HTTPStatusError as e:
-                return [
-                    TextContent(
-                        type="text",
-                        text=f"SPARQL query failed: {e.response.status_code}\n{e.response.text[:1000]}",
-                    )
-                ]
-            except Exception as e:
-                return [TextContent(type="text", text=f"Error: {e}")]
-
-        case "nvs_list_collections":
-            limit = arguments.get("limit", 300)
-            query = f"""
+# Query templates for the tool handlers, built once at import. Handlers fill
+# in the argument-dependent parts with .format(); SPARQL's own braces are
+# doubled so they survive formatting.
+_LIST_COLLECTIONS_TPL = """
 PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
 PREFIX dc: <http://purl.org/dc/terms/>
 
@@ -317,22 +626,14 @@ WHERE {{
 ORDER BY ?identifier
 LIMIT {limit}
 """
-            try:
-                response = await execute_sparql(query)
-                data = response.json()
-                result_text = format_sparql_json(data, max_results=limit)
-                count = len(data.get("results", {}).get("bindings", []))
-                return [
-                    TextContent(
-                        type="text",
-                        text=f"Found {count} collections:\n{result_text}",
-                    )
-                ]
-            except Exception as e:
-                return [TextContent(type="text", text=f"Error: {e}")]
-
-        case "nvs_list_concept_schemes":
-            query = """
+
+# Pre-formatted variants for the limit values UIs actually send, so the
+# common calls skip string formatting entirely (and hit the same cache key)
+_LIST_COLLECTIONS_QUERIES = {
+    n: _LIST_COLLECTIONS_TPL.format(limit=n) for n in (20, 50, 100, 200, 300, 500, 1000)
+}
+
+_LIST_SCHEMES_QUERY = """
 PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
 
 SELECT ?scheme ?prefLabel
@@ -342,83 +643,30 @@ WHERE {
 }
 ORDER BY ?prefLabel
 """
-            try:
-                response = await execute_sparql(query)
-                data = response.json()
-                result_text = format_sparql_json(data)
-                count = len(data.get("results", {}).get("bindings", []))
-                return [
-                    TextContent(
-                        type="text",
-                        text=f"Found {count} concept schemes:\n{result_text}",
-                    )
-                ]
-            except Exception as e:
-                return [TextContent(type="text", text=f"Error: {e}")]
-
-        case "nvs_collection_info":
-            collection_id = arguments["collection_id"]
-            query = f"""
-PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
-PREFIX dc: <http://purl.org/dc/terms/>
-
-SELECT ?property ?value
-WHERE {{
-    ?collection a skos:Collection ;
-                dc:identifier "{collection_id}" ;
-                ?property ?value .
-}}
-"""
-            try:
-                response = await execute_sparql(query)
-                data = response.json()
-                result_text = format_sparql_json(data)
 
-                # Also get concept count
-                count_query = f"""
+_COLLECTION_INFO_TPL = """
 PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
 PREFIX dc: <http://purl.org/dc/terms/>
 
-SELECT (COUNT(?concept) AS ?conceptCount)
+SELECT ?property ?value ?conceptCount
 WHERE {{
+    {values}
     ?collection a skos:Collection ;
-                dc:identifier "{collection_id}" ;
-                skos:member ?concept .
+                dc:identifier ?collectionId ;
+                ?property ?value .
+    {{
+        SELECT (COUNT(?concept) AS ?conceptCount)
+        WHERE {{
+            {values}
+            ?collection a skos:Collection ;
+                        dc:identifier ?collectionId ;
+                        skos:member ?concept .
+        }}
+    }}
 }}
-"""
-                count_response = await execute_sparql(count_query)
-                count_data = count_response.json()
-                concept_count = count_data.get("results", {}).get("bindings", [{}])[0].get("conceptCount", {}).get("value", "?")
-
-                return [
-                    TextContent(
-                        type="text",
-                        text=f"Collection {collection_id} ({concept_count} concepts):\n{result_text}",
-                    )
-                ]
-            except Exception as e:
-                return [TextContent(type="text", text=f"Error: {e}")]
-
-        case "nvs_search_concepts":
-            term = arguments["term"]
-            collection = arguments.get("collection")
-            exact = arguments.get("exact", False)
-            limit = arguments.get("limit", 50)
-
-            # Build filter
-            if exact:
-                label_filter = f'FILTER(LCASE(STR(?prefLabel)) = LCASE("{term}"))'
-            else:
-                label_filter = f'FILTER(CONTAINS(LCASE(STR(?prefLabel)), LCASE("{term}")))'
-
-            collection_filter = ""
-            if collection:
-                collection_filter = f"""
-    ?concept skos:inScheme ?scheme .
-    FILTER(CONTAINS(STR(?scheme), "/collection/{collection}/"))
 """
 
-            query = f"""
+_SEARCH_CONCEPTS_TPL = """
 PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
 
 SELECT ?concept ?prefLabel ?definition ?altLabel
@@ -432,23 +680,8 @@ WHERE {{
 }}
 LIMIT {limit}
 """
-            try:
-                response = await execute_sparql(query)
-                data = response.json()
-                result_text = format_sparql_json(data)
-                count = len(data.get("results", {}).get("bindings", []))
-                return [
-                    TextContent(
-                        type="text",
-                        text=f"Found {count} concepts matching '{term}':\n{result_text}",
-                    )
-                ]
-            except Exception as e:
-                return [TextContent(type="text", text=f"Error: {e}")]
-
-        case "nvs_get_concept":
-            uri = arguments["uri"]
-            query = f"""
+
+_GET_CONCEPT_TPL = """
 PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
 PREFIX dc: <http://purl.org/dc/terms/>
 PREFIX owl: <http://www.w3.org/2002/07/owl#>
@@ -458,78 +691,8 @@ WHERE {{
     <{uri}> ?property ?value .
 }}
 """
-            try:
-                response = await execute_sparql(query)
-                data = response.json()
-                result_text = format_sparql_json(data, max_results=200)
-                return [
-                    TextContent(
-                        type="text",
-                        text=f"Concept {uri}:\n{result_text}",
-                    )
-                ]
-            except Exception as e:
-                return [TextContent(type="text", text=f"Error: {e}")]
-
-        case "nvs_concept_hierarchy":
-            uri = arguments["uri"]
-            direction = arguments.get("direction", "both")
-
-            queries = []
-            if direction in ("broader", "both"):
-                queries.append(("Broader concepts", f"""
-PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
-
-SELECT ?broader ?broaderLabel
-WHERE {{
-    <{uri}> skos:broader ?broader .
-    OPTIONAL {{ ?broader skos:prefLabel ?broaderLabel }}
-}}
-"""))
-            if direction in ("narrower", "both"):
-                queries.append(("Narrower concepts", f"""
-PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
 
-SELECT ?narrower ?narrowerLabel
-WHERE {{
-    <{uri}> skos:narrower ?narrower .
-    OPTIONAL {{ ?narrower skos:prefLabel ?narrowerLabel }}
-}}
-"""))
-
-            results = []
-            try:
-                for label, query in queries:
-                    response = await execute_sparql(query)
-                    data = response.json()
-                    bindings = data.get("results", {}).get("bindings", [])
-                    result_text = format_sparql_json(data)
-                    results.append(f"{label} ({len(bindings)}):\n{result_text}")
-
-                return [
-                    TextContent(
-                        type="text",
-                        text="\n\n".join(results),
-                    )
-                ]
-            except Exception as e:
-                return [TextContent(type="text", text=f"Error: {e}")]
-
-        case "nvs_download_collection":
-            collection_id = arguments["collection_id"]
-            fmt = arguments.get("format", "turtle")
-
-            # Map format to accept header
-            format_headers = {
-                "turtle": "text/turtle",
-                "rdfxml": "application/rdf+xml",
-                "jsonld": "application/ld+json",
-                "ntriples": "application/n-triples",
-            }
-            accept = format_headers.get(fmt, "text/turtle")
-
-            # Use CONSTRUCT to get all triples for the collection
-            query = f"""
+_DOWNLOAD_COLLECTION_TPL = """
 PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
 PREFIX dc: <http://purl.org/dc/terms/>
 
@@ -538,95 +701,401 @@ CONSTRUCT {{
 }}
 WHERE {{
     {{
+        {values}
         ?collection a skos:Collection ;
-                    dc:identifier "{collection_id}" .
+                    dc:identifier ?collectionId .
         ?collection ?p ?o .
         BIND(?collection AS ?s)
     }}
     UNION
     {{
+        {values}
         ?collection a skos:Collection ;
-                    dc:identifier "{collection_id}" ;
+                    dc:identifier ?collectionId ;
                     skos:member ?concept .
         ?concept ?p ?o .
         BIND(?concept AS ?s)
     }}
 }}
 """
-            try:
-                response = await execute_sparql(query, accept)
-                content = response.text
-
-                # Provide info about the download
-                size_kb = len(content) / 1024
-                lines = content.count("\n")
-
-                summary = f"Downloaded collection {collection_id} ({size_kb:.1f} KB, ~{lines} lines)\n"
-                summary += f"Format: {fmt}\n"
-                summary += f"Graph URI suggestion: urn:nvs:collection:{collection_id}\n\n"
-
-                # Truncate if too large for display
-                if len(content) > 100000:
-                    summary += f"Content (first 100KB of {size_kb:.1f} KB):\n"
-                    summary += content[:100000]
-                    summary += "\n\n... [truncated]"
-                else:
-                    summary += "Content:\n"
-                    summary += content
-
-                return [TextContent(type="text", text=summary)]
-            except Exception as e:
-                return [TextContent(type="text", text=f"Error downloading collection: {e}")]
-
-        case "nvs_count_stats":
-            queries = {
-                "collections": """
+
+_DOWNLOAD_FORMAT_HEADERS = {
+    "turtle": "text/turtle",
+    "rdfxml": "application/rdf+xml",
+    "jsonld": "application/ld+json",
+    "ntriples": "application/n-triples",
+}
+
+_STATS_QUERIES = {
+    "collections": """
 PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
 SELECT (COUNT(?c) AS ?count) WHERE { ?c a skos:Collection }
 """,
-                "concepts": """
+    "concepts": """
 PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
 SELECT (COUNT(?c) AS ?count) WHERE { ?c a skos:Concept }
 """,
-                "conceptSchemes": """
+    "conceptSchemes": """
 PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
 SELECT (COUNT(?c) AS ?count) WHERE { ?c a skos:ConceptScheme }
 """,
-            }
-
-            stats = {}
-            try:
-                for stat_name, query in queries.items():
-                    response = await execute_sparql(query)
-                    data = response.json()
-                    bindings = data.get("results", {}).get("bindings", [])
-                    if bindings:
-                        stats[stat_name] = bindings[0].get("count", {}).get("value", "?")
-
-                return [
-                    TextContent(
-                        type="text",
-                        text=f"NVS Statistics:\n{json.dumps(stats, indent=2)}",
-                    )
-                ]
-            except Exception as e:
-                return [TextContent(type="text", text=f"Error: {e}")]
-
-        case _:
-            return [TextContent(type="text", text=f"Unknown tool: {name}")]
+}
+
+
+# Single-pass query-form detection; avoids allocating an uppercase copy of
+# potentially large inline query bodies
+_CONSTRUCT_RE = re.compile(rb"\b(?:CONSTRUCT|DESCRIBE)\b", re.IGNORECASE)
+
+
+async def _handle_sparql(arguments: dict) -> list[TextContent]:
+    query = arguments["query"]
+    is_construct = bool(_CONSTRUCT_RE.search(query.encode("utf-8", "ignore")))
+    fmt = arguments.get("format")
+    accept = get_accept_header(fmt, is_construct)
+
+    try:
+        if accept == "application/sparql-results+json":
+            # User queries may lack a LIMIT - stream bindings and stop
+            # early instead of materializing the full result set
+            rows, truncated = await stream_sparql_bindings(query)
+            result_text = orjson.dumps(rows, option=orjson.OPT_INDENT_2).decode()
+            if truncated:
+                result_text += "\n\n... more results available (truncated)"
+            count_label = f"{len(rows)}+" if truncated else str(len(rows))
+            return [
+                TextContent(
+                    type="text",
+                    text=f"Found {count_label} results:\n{result_text}",
+                )
+            ]
+        else:
+            # Return raw RDF/CSV/TSV, truncated via a bounded read
+            return [
+                TextContent(
+                    type="text",
+                    text=await stream_sparql_text(query, accept, limit=50000),
+                )
+            ]
+    except httpx.HTTPStatusError as e:
+        return [
+            TextContent(
+                type="text",
+                text=f"SPARQL query failed: {e.response.status_code}\n{e.response.text[:1000]}",
+            )
+        ]
+    except Exception as e:
+        return [TextContent(type="text", text=f"Error: {e}")]
+
+
+async def _handle_list_collections(arguments: dict) -> list[TextContent]:
+    limit = arguments.get("limit", 300)
+    query = _LIST_COLLECTIONS_QUERIES.get(limit) or _LIST_COLLECTIONS_TPL.format(limit=limit)
+    try:
+        data = orjson.loads(await execute_sparql_cached(query))
+        result_text = format_sparql_json(data, max_results=limit)
+        count = len(data.get("results", {}).get("bindings", []))
+        return [
+            TextContent(
+                type="text",
+                text=f"Found {count} collections:\n{result_text}",
+            )
+        ]
+    except Exception as e:
+        return [TextContent(type="text", text=f"Error: {e}")]
+
+
+async def _handle_list_concept_schemes(arguments: dict) -> list[TextContent]:
+    try:
+        data = orjson.loads(await execute_sparql_cached(_LIST_SCHEMES_QUERY))
+        result_text = format_sparql_json(data)
+        count = len(data.get("results", {}).get("bindings", []))
+        return [
+            TextContent(
+                type="text",
+                text=f"Found {count} concept schemes:\n{result_text}",
+            )
+        ]
+    except Exception as e:
+        return [TextContent(type="text", text=f"Error: {e}")]
+
+
+async def _handle_collection_info(arguments: dict) -> list[TextContent]:
+    collection_id = arguments["collection_id"]
+    # The concept count rides along as a subquery so properties + count
+    # arrive in a single round-trip
+    query = _COLLECTION_INFO_TPL.format(
+        values=sparql_values(collectionId=collection_id)
+    )
+    try:
+        response = await execute_sparql(query)
+        data = orjson.loads(response.content)
+        bindings = data.get("results", {}).get("bindings", [])
+        concept_count = "?"
+        if bindings:
+            concept_count = bindings[0].get("conceptCount", {}).get("value", "?")
+        # The count rides along on every row - drop it before display
+        for binding in bindings:
+            binding.pop("conceptCount", None)
+        result_text = format_sparql_json(data)
+
+        return [
+            TextContent(
+                type="text",
+                text=f"Collection {collection_id} ({concept_count} concepts):\n{result_text}",
+            )
+        ]
+    except Exception as e:
+        return [TextContent(type="text", text=f"Error: {e}")]
+
+
+async def _handle_search_concepts(arguments: dict) -> list[TextContent]:
+    term = arguments["term"]
+    collection = arguments.get("collection")
+    exact = arguments.get("exact", False)
+    limit = arguments.get("limit", 50)
+
+    escaped_term = escape_sparql_string(term)
+
+    # Build filter: prefer an indexed full-text predicate over a
+    # CONTAINS(LCASE(...)) scan of every prefLabel in the store
+    if exact:
+        label_filter = f'FILTER(LCASE(STR(?prefLabel)) = LCASE("{escaped_term}"))'
+    else:
+        backend = await detect_fts_backend()
+        if backend == "virtuoso" and "'" not in term:
+            # bif:contains wraps the term in single quotes, which its
+            # free-text grammar offers no portable escape for - terms
+            # with apostrophes take the CONTAINS scan below instead
+            label_filter = f"?prefLabel bif:contains \"'{escaped_term}'\" ."
+        elif backend == "jena":
+            lucene_term = escape_sparql_string(escape_lucene_term(term))
+            label_filter = (
+                "?concept <http://jena.apache.org/text#query> "
+                f'(skos:prefLabel "{lucene_term}*") .'
+            )
+        else:
+            label_filter = (
+                f'FILTER(CONTAINS(LCASE(STR(?prefLabel)), LCASE("{escaped_term}")))'
+            )
+
+    collection_filter = ""
+    if collection:
+        collection_filter = f"""
+    ?concept skos:inScheme ?scheme .
+    FILTER(CONTAINS(STR(?scheme), "/collection/{escape_sparql_string(collection)}/"))
+"""
+
+    query = _SEARCH_CONCEPTS_TPL.format(
+        collection_filter=collection_filter,
+        label_filter=label_filter,
+        limit=limit + 1,
+    )
+    try:
+        response = await execute_sparql(query)
+        data = orjson.loads(response.content)
+        # Ask for one extra row so "are there more?" never needs a
+        # separate COUNT query
+        bindings = data.get("results", {}).get("bindings", [])
+        truncated = len(bindings) > limit
+        if truncated:
+            del bindings[limit:]
+        result_text = format_sparql_json(data, max_results=limit)
+        count = f"{limit}+" if truncated else str(len(bindings))
+        return [
+            TextContent(
+                type="text",
+                text=f"Found {count} concepts matching '{term}':\n{result_text}",
+            )
+        ]
+    except Exception as e:
+        return [TextContent(type="text", text=f"Error: {e}")]
+
+
+async def _handle_get_concept(arguments: dict) -> list[TextContent]:
+    uri = arguments["uri"]
+    if not is_safe_iri(uri):
+        return [TextContent(type="text", text=f"Invalid concept URI: {uri}")]
+    query = _GET_CONCEPT_TPL.format(uri=uri)
+    try:
+        response = await execute_sparql(query)
+        data = orjson.loads(response.content)
+        result_text = format_sparql_json(data, max_results=200)
+        return [
+            TextContent(
+                type="text",
+                text=f"Concept {uri}:\n{result_text}",
+            )
+        ]
+    except Exception as e:
+        return [TextContent(type="text", text=f"Error: {e}")]
+
+
+async def _handle_concept_hierarchy(arguments: dict) -> list[TextContent]:
+    uri = arguments["uri"]
+    if not is_safe_iri(uri):
+        return [TextContent(type="text", text=f"Invalid concept URI: {uri}")]
+    direction = arguments.get("direction", "both")
+
+    # Fetch both directions in one round-trip via UNION, tagging each
+    # row with ?dir so the result can be partitioned client-side
+    blocks = []
+    if direction in ("broader", "both"):
+        blocks.append(f"""{{
+        <{uri}> skos:broader ?concept .
+        BIND("broader" AS ?dir)
+        OPTIONAL {{ ?concept skos:prefLabel ?label }}
+    }}""")
+    if direction in ("narrower", "both"):
+        blocks.append(f"""{{
+        <{uri}> skos:narrower ?concept .
+        BIND("narrower" AS ?dir)
+        OPTIONAL {{ ?concept skos:prefLabel ?label }}
+    }}""")
+
+    query = f"""
+PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
+
+SELECT ?dir ?concept ?label
+WHERE {{
+    {" UNION ".join(blocks)}
+}}
+"""
+    try:
+        response = await execute_sparql(query)
+        data = orjson.loads(response.content)
+        bindings = data.get("results", {}).get("bindings", [])
+
+        sections: dict[str, list[dict[str, str]]] = {"broader": [], "narrower": []}
+        for binding in bindings:
+            row = {key: val.get("value", "") for key, val in binding.items()}
+            rows = sections.get(row.get("dir", ""))
+            if rows is not None:
+                rows.append({k: v for k, v in row.items() if k != "dir"})
+
+        results = []
+        for dir_name, title in (
+            ("broader", "Broader concepts"),
+            ("narrower", "Narrower concepts"),
+        ):
+            if direction in (dir_name, "both"):
+                rows = sections[dir_name]
+                rows_text = orjson.dumps(
+                    rows[:100], option=orjson.OPT_INDENT_2
+                ).decode()
+                if len(rows) > 100:
+                    rows_text += f"\n\n... and {len(rows) - 100} more results (truncated)"
+                results.append(f"{title} ({len(rows)}):\n{rows_text}")
+
+        return [
+            TextContent(
+                type="text",
+                text="\n\n".join(results),
+            )
+        ]
+    except Exception as e:
+        return [TextContent(type="text", text=f"Error: {e}")]
+
+
+async def _handle_download_collection(arguments: dict) -> list[TextContent]:
+    collection_id = arguments["collection_id"]
+    fmt = arguments.get("format", "turtle")
+    persist = arguments.get("persist", False)
+
+    accept = _DOWNLOAD_FORMAT_HEADERS.get(fmt, "text/turtle")
+
+    # Use CONSTRUCT to get all triples for the collection
+    query = _DOWNLOAD_COLLECTION_TPL.format(
+        values=sparql_values(collectionId=collection_id)
+    )
+    if persist:
+        # Stream straight to disk and bulk-load into the local store -
+        # never materializes the serialized RDF as a Python string
+        try:
+            return await download_collection_to_store(collection_id, query, accept, fmt)
+        except Exception as e:
+            return [TextContent(type="text", text=f"Error caching collection: {e}")]
+
+    try:
+        content, size, lines = await fetch_collection_rdf(collection_id, query, accept, fmt)
+        size_kb = size / 1024
+
+        summary = f"Downloaded collection {collection_id} ({size_kb:.1f} KB, ~{lines} lines)\n"
+        summary += f"Format: {fmt}\n"
+        summary += f"Graph URI suggestion: urn:nvs:collection:{collection_id}\n\n"
+
+        # content is already capped at the display budget during streaming
+        if size > DOWNLOAD_DISPLAY_LIMIT:
+            summary += f"Content (first 100KB of {size_kb:.1f} KB):\n"
+            summary += content
+            summary += "\n\n... [truncated]"
+        else:
+            summary += "Content:\n"
+            summary += content
+
+        return [TextContent(type="text", text=summary)]
+    except Exception as e:
+        return [TextContent(type="text", text=f"Error downloading collection: {e}")]
+
+
+async def _handle_count_stats(arguments: dict) -> list[TextContent]:
+    stats = {}
+    try:
+        # The three counts are independent - run them concurrently
+        contents = await asyncio.gather(
+            *(execute_sparql_cached(query) for query in _STATS_QUERIES.values())
+        )
+        for stat_name, content in zip(_STATS_QUERIES.keys(), contents):
+            data = orjson.loads(content)
+            bindings = data.get("results", {}).get("bindings", [])
+            if bindings:
+                stats[stat_name] = bindings[0].get("count", {}).get("value", "?")
+
+        return [
+            TextContent(
+                type="text",
+                text=f"NVS Statistics:\n{orjson.dumps(stats, option=orjson.OPT_INDENT_2).decode()}",
+            )
+        ]
+    except Exception as e:
+        return [TextContent(type="text", text=f"Error: {e}")]
+
+
+# Tool name -> handler, resolved with one dict lookup per call instead of
+# walking a match statement
+_HANDLERS = {
+    "nvs_sparql": _handle_sparql,
+    "nvs_list_collections": _handle_list_collections,
+    "nvs_list_concept_schemes": _handle_list_concept_schemes,
+    "nvs_collection_info": _handle_collection_info,
+    "nvs_search_concepts": _handle_search_concepts,
+    "nvs_get_concept": _handle_get_concept,
+    "nvs_concept_hierarchy": _handle_concept_hierarchy,
+    "nvs_download_collection": _handle_download_collection,
+    "nvs_count_stats": _handle_count_stats,
+}
+
+
+@server.call_tool()
+async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+    """Handle tool calls."""
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return [TextContent(type="text", text=f"Unknown tool: {name}")]
+    return await handler(arguments)
 
 
 async def main():
     """Run the MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options(),
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options(),
+            )
+    finally:
+        await _client.aclose()
 
 
 if __name__ == "__main__":
-    import asyncio
-
     asyncio.run(main())
@@ -1,11 +1,10 @@
 """CLI for ait - Archive of Interconnected Terms."""
 
 import asyncio
+from functools import lru_cache
 from pathlib import Path
 
 import typer
-from rich.console import Console
-from rich.table import Table
 
 from ait import __version__
 
@@ -14,7 +13,14 @@ app = typer.Typer(
     help="Archive of Interconnected Terms - A local-first MCP server for ontology work",
     no_args_is_help=True,
 )
-console = Console()
+
+
+@lru_cache(maxsize=1)
+def _console():
+    """Build the rich console lazily so cheap commands skip rich startup."""
+    from rich.console import Console
+
+    return Console()
 
 
 @app.command()
@@ -42,9 +48,18 @@ def serve(
     )
     configure(config)
 
-    console.print(f"[bold green]ait[/] v{__version__}", style="dim")
-    console.print(f"Data directory: {data_dir}", style="dim")
-    console.print("Starting MCP server on stdio...", style="dim")
+    _console().print(f"[bold green]ait[/] v{__version__}", style="dim")
+    _console().print(f"Data directory: {data_dir}", style="dim")
+    _console().print("Starting MCP server on stdio...", style="dim")
+
+    try:
+        # libuv-based loop roughly halves per-callback overhead, which adds
+        # up across concurrent httpx requests and stream decoding
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
 
     asyncio.run(run_stdio())
 
@@ -59,27 +74,29 @@ def status(
     ),
 ) -> None:
     """Show status of local store."""
+    from rich.table import Table
+
     from ait.store import Store
 
     store_path = data_dir / "store"
     if not store_path.exists():
-        console.print("[yellow]No local store found.[/]")
-        console.print(f"Run [bold]ait serve[/] to create one at {store_path}")
+        _console().print("[yellow]No local store found.[/]")
+        _console().print(f"Run [bold]ait serve[/] to create one at {store_path}")
         return
 
     store = Store(store_path)
     graphs = list(store.graphs())
 
-    console.print(f"[bold]Store:[/] {store_path}")
-    console.print(f"[bold]Total triples:[/] {len(store)}")
-    console.print(f"[bold]Named graphs:[/] {len(graphs)}")
+    _console().print(f"[bold]Store:[/] {store_path}")
+    _console().print(f"[bold]Total triples:[/] {len(store)}")
+    _console().print(f"[bold]Named graphs:[/] {len(graphs)}")
 
     if graphs:
         table = Table(title="Cached Ontologies")
         table.add_column("Graph URI")
         for g in graphs:
             table.add_row(g)
-        console.print(table)
+        _console().print(table)
 
 
 @app.command()
@@ -108,7 +125,7 @@ def clear(
 
     store_path = data_dir / "store"
     if not store_path.exists():
-        console.print("[yellow]No local store found.[/]")
+        _console().print("[yellow]No local store found.[/]")
         return
 
     store = Store(store_path)
@@ -119,11 +136,11 @@ def clear(
         msg = f"Clear [bold]all {len(store)} triples[/] from store?"
 
     if not force and not typer.confirm(msg):
-        console.print("Cancelled.")
+        _console().print("Cancelled.")
         return
 
     store.clear(graph)
-    console.print("[green]Cleared.[/]")
+    _console().print("[green]Cleared.[/]")
 
 
 @app.command()
@@ -149,19 +166,19 @@ def query(
 
     store_path = data_dir / "store"
     if not store_path.exists():
-        console.print("[red]No local store found.[/]")
+        _console().print("[red]No local store found.[/]")
         raise typer.Exit(1)
 
     store = Store(store_path)
     results = store.query(sparql)
 
     if not results:
-        console.print("[yellow]No results.[/]")
+        _console().print("[yellow]No results.[/]")
         return
 
-    console.print(json.dumps(results[:limit], indent=2))
+    _console().print(json.dumps(results[:limit], indent=2))
     if len(results) > limit:
-        console.print(f"[dim]... and {len(results) - limit} more[/]")
+        _console().print(f"[dim]... and {len(results) - limit} more[/]")
 
 
 @app.command()
@@ -201,12 +218,12 @@ def web(
 
     configure(data_dir, serve_frontend=not no_frontend)
 
-    console.print(f"[bold green]ait[/] v{__version__} web UI", style="dim")
-    console.print(f"Data directory: {data_dir}", style="dim")
+    _console().print(f"[bold green]ait[/] v{__version__} web UI", style="dim")
+    _console().print(f"Data directory: {data_dir}", style="dim")
     if no_frontend:
-        console.print(f"Starting API server at http://{host}:{port} (no frontend)", style="dim")
+        _console().print(f"Starting API server at http://{host}:{port} (no frontend)", style="dim")
     else:
-        console.print(f"Starting web server at http://{host}:{port}", style="dim")
+        _console().print(f"Starting web server at http://{host}:{port}", style="dim")
 
     uvicorn.run(web_app, host=host, port=port)
 
@@ -214,7 +231,7 @@ def web(
 @app.command()
 def version() -> None:
     """Show version information."""
-    console.print(f"ait v{__version__}")
+    typer.echo(f"ait v{__version__}")
 
 
 if __name__ == "__main__":
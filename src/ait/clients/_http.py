@@ -0,0 +1,23 @@
+"""Shared HTTP transport helpers for API clients."""
+
+from pathlib import Path
+
+import httpx
+from hishel import AsyncSqliteStorage
+from hishel.httpx import AsyncCacheTransport
+
+
+def cache_transport(cache_dir: Path | None) -> httpx.AsyncBaseTransport | None:
+    """Build a SQLite-backed caching transport, or None for a plain client.
+
+    The cache honors upstream ETag/Last-Modified headers, so unchanged
+    listings revalidate with a 304 instead of a full re-download.
+    """
+    if cache_dir is None:
+        return None
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    storage = AsyncSqliteStorage(
+        database_path=cache_dir / "http-cache.sqlite",
+        default_ttl=86400.0,
+    )
+    return AsyncCacheTransport(httpx.AsyncHTTPTransport(http2=True), storage=storage)
@@ -1,7 +1,14 @@
 """Client for NERC Vocabulary Server (NVS) - SKOS-based vocabularies."""
 
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+
 import httpx
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, model_validator
+
+from ait.clients._http import cache_transport
+from ait.clients._json import loads
 
 
 class Collection(BaseModel):
@@ -14,6 +21,22 @@ class Collection(BaseModel):
     version: str | None = None
     modified: str | None = None
 
+    # Frozen models skip per-instance __dict__ mutation plumbing; extras are
+    # dropped instead of scanned and stored
+    model_config = {"extra": "ignore", "frozen": True}
+
+    @model_validator(mode="before")
+    @classmethod
+    def _normalize_jsonld(cls, data):
+        """Map JSON-LD keys so raw members validate without a Python-side loop."""
+        if isinstance(data, dict):
+            if "@id" in data and "uri" not in data:
+                data["uri"] = data["@id"]
+            data.setdefault("uri", "")
+            data.setdefault("identifier", "")
+            data.setdefault("title", "")
+        return data
+
 
 class Concept(BaseModel):
     """A SKOS concept from NVS."""
@@ -27,7 +50,77 @@ class Concept(BaseModel):
     related: list[str] = Field(default_factory=list)
     deprecated: bool = False
 
-    model_config = {"populate_by_name": True}
+    model_config = {"populate_by_name": True, "extra": "ignore", "frozen": True}
+
+    @model_validator(mode="before")
+    @classmethod
+    def _normalize_jsonld(cls, data):
+        """Normalize JSON-LD value shapes (str vs list vs list-of-dict).
+
+        Runs inside pydantic-core's validation pass, so raw JSON-LD members
+        can be validated directly without a separate Python parse step.
+        """
+        if not isinstance(data, dict):
+            return data
+        if "@id" in data and "uri" not in data:
+            data["uri"] = data["@id"]
+        data.setdefault("uri", "")
+        if "prefLabel" not in data and "pref_label" not in data:
+            data["prefLabel"] = ""
+        alt = data.get("altLabel")
+        if alt is not None and "altLabels" not in data:
+            data["altLabels"] = [alt] if isinstance(alt, str) else alt
+        for key in ("broader", "narrower", "related"):
+            value = data.get(key)
+            if isinstance(value, str):
+                data[key] = [value]
+            elif isinstance(value, list):
+                data[key] = [v.get("@id", v) if isinstance(v, dict) else v for v in value]
+        return data
+
+
+_ConceptList = TypeAdapter(list[Concept])
+_CollectionList = TypeAdapter(list[Collection])
+
+
+# Parsed once at import; substitute() only splices the three values instead
+# of re-formatting the whole multi-line literal per call
+_SPARQL_TEMPLATE = Template("""
+        PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
+        SELECT ?concept ?prefLabel ?definition
+        WHERE {
+            ?concept a skos:Concept .
+            ?concept skos:prefLabel ?prefLabel .
+            OPTIONAL { ?concept skos:definition ?definition }
+            $collection_filter
+            FILTER(CONTAINS(LCASE(?prefLabel), LCASE("$query")))
+        }
+        LIMIT $limit
+        """)
+
+
+def _escape_sparql_string(value: str) -> str:
+    """Escape a value for embedding in a double-quoted SPARQL literal."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r")
+
+
+@lru_cache(maxsize=512)
+def _search_sparql(base_url: str, query: str, collection: str | None, limit: int) -> str:
+    """Build the search SPARQL for a (query, collection) pair, memoized.
+
+    LLM-driven callers tend to repeat and refine the same queries; caching
+    the rendered text skips the template work and keeps the query string
+    byte-identical so server-side plan caches can hit.
+    """
+    collection_filter = ""
+    if collection:
+        collection_filter = f"?concept skos:inScheme <{base_url}/collection/{collection}/current/> ."
+
+    return _SPARQL_TEMPLATE.substitute(
+        collection_filter=collection_filter,
+        query=_escape_sparql_string(query),
+        limit=limit,
+    )
 
 
 class NvsClient:
@@ -35,16 +128,23 @@ class NvsClient:
 
     BASE_URL = "https://vocab.nerc.ac.uk"
 
-    def __init__(self, base_url: str | None = None):
+    def __init__(self, base_url: str | None = None, cache_dir: Path | None = None):
         """Initialize the client.
 
         Args:
             base_url: Base URL of the NVS instance. Defaults to NERC's public server.
+            cache_dir: Directory for an on-disk HTTP cache. When set, responses
+                are cached in SQLite and revalidated with ETag/Last-Modified,
+                so unchanged listings cost a 304 instead of a re-download.
         """
         self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        # HTTP/2 lets concurrent requests multiplex over one warm connection
         self._client = httpx.AsyncClient(
             base_url=self.base_url,
             timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            transport=cache_transport(cache_dir),
         )
 
     async def list_collections(self) -> list[Collection]:
@@ -54,22 +154,10 @@ class NvsClient:
             headers={"Accept": "application/ld+json"},
         )
         response.raise_for_status()
-        data = response.json()
-
-        collections = []
-        members = data.get("member", [])
-        for item in members:
-            collections.append(
-                Collection(
-                    uri=item.get("@id", ""),
-                    identifier=item.get("identifier", ""),
-                    title=item.get("title", ""),
-                    description=item.get("description"),
-                    version=item.get("version"),
-                    modified=item.get("modified"),
-                )
-            )
-        return collections
+        data = loads(response)
+        # One pydantic-core pass over the member list; the before-validator
+        # maps @id -> uri, so no Python-side dict rebuilding per item
+        return _CollectionList.validate_python(data.get("member", []))
 
     async def get_collection(self, identifier: str) -> Collection:
         """Get metadata for a specific collection.
@@ -82,16 +170,9 @@ class NvsClient:
             headers={"Accept": "application/ld+json"},
         )
         response.raise_for_status()
-        data = response.json()
-
-        return Collection(
-            uri=data.get("@id", ""),
-            identifier=data.get("identifier", identifier),
-            title=data.get("title", ""),
-            description=data.get("description"),
-            version=data.get("version"),
-            modified=data.get("modified"),
-        )
+        data = loads(response)
+        data.setdefault("identifier", identifier)
+        return Collection.model_validate(data)
 
     async def get_concepts(self, collection: str) -> list[Concept]:
         """Get all concepts in a collection.
@@ -104,13 +185,8 @@ class NvsClient:
             headers={"Accept": "application/ld+json"},
         )
         response.raise_for_status()
-        data = response.json()
-
-        concepts = []
-        members = data.get("member", [])
-        for item in members:
-            concepts.append(self._parse_concept(item))
-        return concepts
+        data = loads(response)
+        return _ConceptList.validate_python(data.get("member", []))
 
     async def get_concept(self, collection: str, concept_id: str) -> Concept:
         """Get a specific concept.
@@ -124,28 +200,76 @@ class NvsClient:
             headers={"Accept": "application/ld+json"},
         )
         response.raise_for_status()
-        return self._parse_concept(response.json())
-
-    async def search(self, query: str, collection: str | None = None) -> list[Concept]:
+        return Concept.model_validate_json(response.content)
+
+    async def search(
+        self,
+        query: str,
+        collection: str | None = None,
+        limit: int | None = None,
+    ) -> list[Concept]:
         """Search for concepts.
 
+        Tries the Lucene-backed /search endpoint first - an inverted-index
+        lookup server-side - and falls back to a SPARQL CONTAINS scan only
+        when the search endpoint is unavailable or returns nothing.
+
         Args:
             query: Search string.
             collection: Optional collection to search within.
+            limit: Maximum number of results to fetch and deserialize.
         """
-        params = {"searchstr": query}
+        concepts = await self._search_lucene(query, limit)
+        if concepts is None:
+            return await self._search_sparql_scan(query, collection, limit)
         if collection:
-            params["collection"] = collection
-
-        response = await self._client.get(
+            # Cheaper to post-filter by URI prefix than to force a SPARQL join
+            prefix = f"{self.base_url}/collection/{collection}/"
+            concepts = [c for c in concepts if c.uri.startswith(prefix)]
+        return concepts[:limit] if limit else concepts
+
+    async def _search_lucene(self, query: str, limit: int | None) -> list[Concept] | None:
+        """Query the NVS text-search endpoint; None means fall back to SPARQL."""
+        try:
+            response = await self._client.get(
+                "/search/search/",
+                params={"q": query, "limit": limit or 100},
+                headers={"Accept": "application/json"},
+            )
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            data = loads(response)
+        except Exception:
+            return None
+
+        hits = data.get("results", data.get("member", [])) if isinstance(data, dict) else data
+        if not hits:
+            return None
+        try:
+            return _ConceptList.validate_python(hits)
+        except ValidationError:
+            # Unrecognized hit shape - treat like an unavailable endpoint
+            return None
+
+    async def _search_sparql_scan(
+        self,
+        query: str,
+        collection: str | None,
+        limit: int | None,
+    ) -> list[Concept]:
+        """Label search via a SPARQL CONTAINS filter (full prefLabel scan)."""
+        # POST keeps the ~400-byte query out of the URL, so httpx skips
+        # percent-encoding braces/quotes into the request line on every call
+        response = await self._client.post(
             "/sparql/sparql",
-            params={
-                "query": self._search_sparql(query, collection),
+            data={
+                "query": _search_sparql(self.base_url, query, collection, limit or 100),
                 "output": "json",
             },
         )
         response.raise_for_status()
-        data = response.json()
+        data = loads(response)
 
         concepts = []
         for binding in data.get("results", {}).get("bindings", []):
@@ -158,62 +282,6 @@ class NvsClient:
             )
         return concepts
 
-    def _search_sparql(self, query: str, collection: str | None = None) -> str:
-        """Generate SPARQL query for search."""
-        collection_filter = ""
-        if collection:
-            collection_filter = f"""
-            ?concept skos:inScheme <{self.base_url}/collection/{collection}/current/> .
-            """
-
-        return f"""
-        PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
-        SELECT ?concept ?prefLabel ?definition
-        WHERE {{
-            ?concept a skos:Concept .
-            ?concept skos:prefLabel ?prefLabel .
-            OPTIONAL {{ ?concept skos:definition ?definition }}
-            {collection_filter}
-            FILTER(CONTAINS(LCASE(?prefLabel), LCASE("{query}")))
-        }}
-        LIMIT 100
-        """
-
-    def _parse_concept(self, data: dict) -> Concept:
-        """Parse concept from JSON-LD."""
-        alt_labels = data.get("altLabel", [])
-        if isinstance(alt_labels, str):
-            alt_labels = [alt_labels]
-
-        broader = data.get("broader", [])
-        if isinstance(broader, str):
-            broader = [broader]
-        elif isinstance(broader, list):
-            broader = [b.get("@id", b) if isinstance(b, dict) else b for b in broader]
-
-        narrower = data.get("narrower", [])
-        if isinstance(narrower, str):
-            narrower = [narrower]
-        elif isinstance(narrower, list):
-            narrower = [n.get("@id", n) if isinstance(n, dict) else n for n in narrower]
-
-        related = data.get("related", [])
-        if isinstance(related, str):
-            related = [related]
-        elif isinstance(related, list):
-            related = [r.get("@id", r) if isinstance(r, dict) else r for r in related]
-
-        return Concept(
-            uri=data.get("@id", ""),
-            prefLabel=data.get("prefLabel", ""),
-            definition=data.get("definition"),
-            altLabels=alt_labels,
-            broader=broader,
-            narrower=narrower,
-            related=related,
-            deprecated=data.get("deprecated", False),
-        )
-
     async def download_collection(self, collection: str, format: str = "rdf") -> bytes:
         """Download a collection as RDF.
 
@@ -224,13 +292,32 @@ class NvsClient:
         Returns:
             Raw bytes of the vocabulary file.
         """
+        return b"".join([chunk async for chunk in self.stream_collection(collection, format)])
+
+    async def stream_collection(self, collection: str, format: str = "rdf"):
+        """Stream a collection download in 64KB chunks.
+
+        Lets callers spool large vocabularies to disk without holding the
+        whole serialization in memory.
+
+        Args:
+            collection: Collection identifier.
+            format: Format (rdf, ttl).
+
+        Yields:
+            Chunks of the vocabulary file as bytes.
+        """
         accept = "application/rdf+xml" if format == "rdf" else "text/turtle"
-        response = await self._client.get(
+        async with self._client.stream(
+            "GET",
             f"/collection/{collection}/current/",
             headers={"Accept": accept},
-        )
-        response.raise_for_status()
-        return response.content
+        ) as response:
+            if response.is_error:
+                await response.aread()
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(65536):
+                yield chunk
 
     async def close(self) -> None:
         """Close the HTTP client."""
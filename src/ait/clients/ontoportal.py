@@ -1,9 +1,18 @@
 """Client for OntoPortal-style ontology repositories (BioPortal, AgroPortal, etc.)."""
 
+import asyncio
+import os
 from enum import StrEnum
+from functools import lru_cache
+from itertools import chain
+from pathlib import Path
+from urllib.parse import quote
 
 import httpx
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+
+from ait.clients._http import cache_transport
+from ait.clients._json import loads
 
 
 class OntoPortalInstance(StrEnum):
@@ -26,7 +35,7 @@ class OntologyInfo(BaseModel):
     creation_date: str | None = Field(default=None, alias="creationDate")
     version: str | None = None
 
-    model_config = {"populate_by_name": True}
+    model_config = {"populate_by_name": True, "extra": "ignore", "frozen": True}
 
 
 class OntologyClass(BaseModel):
@@ -39,7 +48,7 @@ class OntologyClass(BaseModel):
     parents: list[str] | None = Field(default=None, alias="subClassOf")
     obsolete: bool = False
 
-    model_config = {"populate_by_name": True}
+    model_config = {"populate_by_name": True, "extra": "ignore", "frozen": True}
 
 
 class SearchResult(BaseModel):
@@ -51,7 +60,38 @@ class SearchResult(BaseModel):
     ontology: str | None = Field(default=None, alias="links")
     match_type: str | None = Field(default=None, alias="matchType")
 
-    model_config = {"populate_by_name": True}
+    model_config = {"populate_by_name": True, "extra": "ignore", "frozen": True}
+
+
+# List adapters validate a whole payload in one pydantic-core call instead
+# of one Python-level model_validate per element
+_OntologyInfoList = TypeAdapter(list[OntologyInfo])
+_OntologyClassList = TypeAdapter(list[OntologyClass])
+_SearchResultList = TypeAdapter(list[SearchResult])
+
+
+def _retry_after_delay(response: httpx.Response, default: float = 1.0) -> float:
+    """Seconds to wait from a Retry-After header, capped at 30.
+
+    Servers may send the RFC 7231 HTTP-date form instead of seconds;
+    fall back to the default rather than crash the retry path on it.
+    """
+    try:
+        delay = float(response.headers.get("Retry-After", default))
+    except ValueError:
+        delay = default
+    return min(delay, 30.0)
+
+
+@lru_cache(maxsize=4096)
+def _encode_class_id(class_id: str) -> str:
+    """Percent-encode a class IRI for use as a path segment, memoized.
+
+    Browsing sessions hit the same handful of IRIs repeatedly (get_class
+    then get_children on the same term), so the encode is paid once per
+    distinct IRI.
+    """
+    return quote(class_id, safe="") if "://" in class_id else class_id
 
 
 class OntoPortalClient:
@@ -61,19 +101,31 @@ class OntoPortalClient:
         self,
         base_url: str | OntoPortalInstance = OntoPortalInstance.BIOPORTAL,
         api_key: str | None = None,
+        cache_dir: Path | None = None,
     ):
         """Initialize the client.
 
         Args:
             base_url: Base URL of the OntoPortal instance.
             api_key: API key for authentication (required for most operations).
+            cache_dir: Directory for an on-disk HTTP cache. When set, responses
+                are cached in SQLite and revalidated with ETag/Last-Modified.
         """
         self.base_url = str(base_url).rstrip("/")
         self.api_key = api_key
+        # HTTP/2 lets concurrent requests multiplex over one warm connection
         self._client = httpx.AsyncClient(
             base_url=self.base_url,
             headers=self._headers(),
             timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            transport=cache_transport(cache_dir),
+        )
+        # Caps concurrent requests so bursts stay under OntoPortal rate
+        # limits instead of triggering 429 retry storms
+        self._semaphore = asyncio.Semaphore(
+            int(os.getenv("AIT_ONTOPORTAL_CONCURRENCY", "8"))
         )
 
     def _headers(self) -> dict[str, str]:
@@ -82,17 +134,32 @@ class OntoPortalClient:
             headers["Authorization"] = f"apikey token={self.api_key}"
         return headers
 
+    async def _get(self, path: str, **kwargs) -> httpx.Response:
+        """Issue a GET under the concurrency semaphore, retrying on 429/503.
+
+        A single retry honouring Retry-After covers transient rate-limit
+        responses without pulling in a retry library.
+        """
+        async with self._semaphore:
+            response = await self._client.get(path, **kwargs)
+            if response.status_code in (429, 503):
+                await asyncio.sleep(_retry_after_delay(response))
+                response = await self._client.get(path, **kwargs)
+        return response
+
     async def list_ontologies(self) -> list[OntologyInfo]:
         """List all ontologies in the repository."""
-        response = await self._client.get("/ontologies")
+        response = await self._get("/ontologies")
         response.raise_for_status()
-        return [OntologyInfo.model_validate(item) for item in response.json()]
+        return _OntologyInfoList.validate_json(response.content)
 
     async def get_ontology(self, acronym: str) -> OntologyInfo:
         """Get metadata for a specific ontology."""
-        response = await self._client.get(f"/ontologies/{acronym}")
+        response = await self._get(f"/ontologies/{acronym}")
         response.raise_for_status()
-        return OntologyInfo.model_validate(response.json())
+        # Parse JSON and build the model in one pydantic-core pass, skipping
+        # the intermediate Python dict
+        return OntologyInfo.model_validate_json(response.content)
 
     async def get_class(self, ontology: str, class_id: str) -> OntologyClass:
         """Get a specific class from an ontology.
@@ -101,26 +168,54 @@ class OntoPortalClient:
             ontology: Ontology acronym (e.g., "GO", "ENVO").
             class_id: Full class IRI (URL-encoded if needed).
         """
-        encoded_id = httpx.URL(class_id).raw_path.decode() if "://" in class_id else class_id
-        response = await self._client.get(
+        encoded_id = _encode_class_id(class_id)
+        response = await self._get(
             f"/ontologies/{ontology}/classes/{encoded_id}",
             params={"display": "prefLabel,definition,synonym,subClassOf,obsolete"},
         )
         response.raise_for_status()
-        return OntologyClass.model_validate(response.json())
+        return OntologyClass.model_validate_json(response.content)
 
     async def get_roots(self, ontology: str) -> list[OntologyClass]:
         """Get root classes of an ontology."""
-        response = await self._client.get(f"/ontologies/{ontology}/classes/roots")
+        response = await self._get(f"/ontologies/{ontology}/classes/roots")
         response.raise_for_status()
-        return [OntologyClass.model_validate(item) for item in response.json()]
+        return _OntologyClassList.validate_json(response.content)
 
     async def get_children(self, ontology: str, class_id: str) -> list[OntologyClass]:
         """Get child classes of a class."""
-        encoded_id = httpx.URL(class_id).raw_path.decode() if "://" in class_id else class_id
-        response = await self._client.get(f"/ontologies/{ontology}/classes/{encoded_id}/children")
+        encoded_id = _encode_class_id(class_id)
+        response = await self._get(f"/ontologies/{ontology}/classes/{encoded_id}/children")
+        response.raise_for_status()
+        return _OntologyClassList.validate_json(response.content)
+
+    async def _search_one(
+        self,
+        query: str,
+        ontology: str | None,
+        exact_match: bool,
+        include_obsolete: bool,
+        limit: int | None,
+    ) -> list[SearchResult]:
+        """Issue a single /search request, optionally scoped to one ontology."""
+        params: dict[str, str | bool | int] = {
+            "q": query,
+            "require_exact_match": exact_match,
+            "include_obsolete": include_obsolete,
+        }
+        if ontology:
+            params["ontologies"] = ontology
+        if limit:
+            params["pagesize"] = limit
+
+        response = await self._get("/search", params=params)
         response.raise_for_status()
-        return [OntologyClass.model_validate(item) for item in response.json()]
+        data = loads(response)
+        collection = data.get("collection", [])
+        if limit:
+            # Don't build models the caller will slice off anyway
+            collection = collection[:limit]
+        return _SearchResultList.validate_python(collection)
 
     async def search(
         self,
@@ -128,28 +223,34 @@ class OntoPortalClient:
         ontologies: list[str] | None = None,
         exact_match: bool = False,
         include_obsolete: bool = False,
+        limit: int | None = None,
     ) -> list[SearchResult]:
         """Search for terms across ontologies.
 
+        When several ontologies are requested, one request per ontology is
+        fanned out concurrently over the shared connection pool rather than
+        waiting on a single serialized server-side scan.
+
         Args:
             query: Search string.
             ontologies: List of ontology acronyms to search (None = all).
             exact_match: Only return exact matches.
             include_obsolete: Include obsolete terms.
+            limit: Maximum number of results to request and deserialize.
         """
-        params: dict[str, str | bool] = {
-            "q": query,
-            "require_exact_match": exact_match,
-            "include_obsolete": include_obsolete,
-        }
-        if ontologies:
-            params["ontologies"] = ",".join(ontologies)
-
-        response = await self._client.get("/search", params=params)
-        response.raise_for_status()
-        data = response.json()
-        collection = data.get("collection", [])
-        return [SearchResult.model_validate(item) for item in collection]
+        if ontologies and len(ontologies) > 1:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(
+                        self._search_one(query, ontology, exact_match, include_obsolete, limit)
+                    )
+                    for ontology in ontologies
+                ]
+            results = list(chain.from_iterable(task.result() for task in tasks))
+            return results[:limit] if limit else results
+
+        ontology = ontologies[0] if ontologies else None
+        return await self._search_one(query, ontology, exact_match, include_obsolete, limit)
 
     async def download_ontology(self, acronym: str, format: str = "rdf") -> bytes:
         """Download an ontology file.
@@ -161,13 +262,36 @@ class OntoPortalClient:
         Returns:
             Raw bytes of the ontology file.
         """
-        response = await self._client.get(
+        # Thin wrapper over the streaming path: one accumulating buffer
+        # instead of httpx's read buffer plus a full .content copy
+        return b"".join([chunk async for chunk in self.stream_ontology(acronym, format)])
+
+    async def stream_ontology(self, acronym: str, format: str = "rdf"):
+        """Stream an ontology download in 64KB chunks.
+
+        Lets callers spool multi-hundred-MB files to disk without ever
+        holding the whole download in memory.
+
+        Args:
+            acronym: Ontology acronym.
+            format: Download format (rdf, csv, etc.).
+
+        Yields:
+            Chunks of the ontology file as bytes.
+        """
+        # Downloads count against the portal's rate limit like any other
+        # request, so hold the semaphore for the duration of the stream
+        async with self._semaphore, self._client.stream(
+            "GET",
             f"/ontologies/{acronym}/download",
             params={"download_format": format},
             follow_redirects=True,
-        )
-        response.raise_for_status()
-        return response.content
+        ) as response:
+            if response.is_error:
+                await response.aread()
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(65536):
+                yield chunk
 
     async def close(self) -> None:
         """Close the HTTP client."""
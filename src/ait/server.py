@@ -1,14 +1,22 @@
 """MCP server for ontology tools."""
 
-import json
+import asyncio
+import tempfile
+from contextvars import ContextVar
 from pathlib import Path
 
+import orjson
 from mcp.server import Server
 from mcp.types import TextContent, Tool
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
-from ait.clients.nvs import NvsClient
-from ait.clients.ontoportal import OntoPortalClient, OntoPortalInstance
+from ait.clients.nvs import Concept, NvsClient
+from ait.clients.ontoportal import (
+    OntologyClass,
+    OntoPortalClient,
+    OntoPortalInstance,
+    SearchResult,
+)
 from ait.store import RdfFormat, Store
 
 
@@ -24,17 +32,37 @@ class ServerConfig(BaseModel):
 _config: ServerConfig | None = None
 _store: Store | None = None
 
+# Long-lived HTTP clients, reused across tool calls so keep-alive
+# connections (and their TLS sessions) survive between invocations
+_ontoportal_clients: dict[tuple[str, str | None], OntoPortalClient] = {}
+_nvs_client: NvsClient | None = None
+
 server = Server("ait")
 
+# Dump whole result lists in one pydantic-core call instead of invoking
+# model_dump per element
+_SearchResultList = TypeAdapter(list[SearchResult])
+_ConceptList = TypeAdapter(list[Concept])
+_OntologyClassList = TypeAdapter(list[OntologyClass])
+
+
+# Per-context handle onto the store; lets tests or nested tasks pin their
+# own store without racing on the module global
+_store_var: ContextVar[Store | None] = ContextVar("ait_store", default=None)
+
 
 def get_store() -> Store:
     """Get or create the local RDF store."""
     global _store
-    if _store is None:
-        config = _config or ServerConfig()
-        store_path = config.data_dir / "store"
-        _store = Store(store_path)
-    return _store
+    store = _store_var.get()
+    if store is None:
+        if _store is None:
+            config = _config or ServerConfig()
+            store_path = config.data_dir / "store"
+            _store = Store(store_path)
+        store = _store
+        _store_var.set(store)
+    return store
 
 
 def configure(config: ServerConfig) -> None:
@@ -44,10 +72,45 @@ def configure(config: ServerConfig) -> None:
     config.data_dir.mkdir(parents=True, exist_ok=True)
 
 
-@server.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available tools."""
-    return [
+def get_ontoportal_client(
+    instance: str | OntoPortalInstance,
+    api_key: str | None,
+) -> OntoPortalClient:
+    """Get or create a shared OntoPortal client for (instance, api_key)."""
+    key = (str(instance), api_key)
+    client = _ontoportal_clients.get(key)
+    if client is None:
+        config = _config or ServerConfig()
+        client = OntoPortalClient(instance, api_key, cache_dir=config.data_dir)
+        _ontoportal_clients[key] = client
+    return client
+
+
+def get_nvs_client() -> NvsClient:
+    """Get or create the shared NVS client."""
+    global _nvs_client
+    if _nvs_client is None:
+        config = _config or ServerConfig()
+        _nvs_client = NvsClient(cache_dir=config.data_dir)
+    return _nvs_client
+
+
+async def close_clients() -> None:
+    """Close all shared HTTP clients and their connection pools."""
+    global _nvs_client
+    for client in _ontoportal_clients.values():
+        await client.close()
+    _ontoportal_clients.clear()
+    if _nvs_client is not None:
+        await _nvs_client.close()
+        _nvs_client = None
+
+
+# The instance enum and tool list are static - build them once at import
+# instead of reconstructing every schema dict per tools/list call
+_INSTANCE_ENUM = [e.value for e in OntoPortalInstance]
+
+_TOOLS: list[Tool] = [
         Tool(
             name="search_ontoportal",
             description="Search for terms across ontologies in an OntoPortal repository (BioPortal, AgroPortal, etc.)",
@@ -65,7 +128,7 @@ async def list_tools() -> list[Tool]:
                     },
                     "instance": {
                         "type": "string",
-                        "enum": [e.value for e in OntoPortalInstance],
+                        "enum": _INSTANCE_ENUM,
                         "description": "OntoPortal instance to search",
                     },
                 },
@@ -80,7 +143,7 @@ async def list_tools() -> list[Tool]:
                 "properties": {
                     "instance": {
                         "type": "string",
-                        "enum": [e.value for e in OntoPortalInstance],
+                        "enum": _INSTANCE_ENUM,
                         "description": "OntoPortal instance",
                     },
                 },
@@ -102,7 +165,30 @@ async def list_tools() -> list[Tool]:
                     },
                     "instance": {
                         "type": "string",
-                        "enum": [e.value for e in OntoPortalInstance],
+                        "enum": _INSTANCE_ENUM,
+                        "description": "OntoPortal instance",
+                    },
+                },
+                "required": ["ontology", "class_id"],
+            },
+        ),
+        Tool(
+            name="get_class_with_context",
+            description="Get a class together with its children and ontology metadata in one call",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "ontology": {
+                        "type": "string",
+                        "description": "Ontology acronym (e.g., 'GO', 'ENVO')",
+                    },
+                    "class_id": {
+                        "type": "string",
+                        "description": "Class IRI or identifier",
+                    },
+                    "instance": {
+                        "type": "string",
+                        "enum": _INSTANCE_ENUM,
                         "description": "OntoPortal instance",
                     },
                 },
@@ -147,7 +233,7 @@ async def list_tools() -> list[Tool]:
                     },
                     "instance": {
                         "type": "string",
-                        "enum": [e.value for e in OntoPortalInstance],
+                        "enum": _INSTANCE_ENUM,
                         "description": "OntoPortal instance",
                     },
                 },
@@ -176,7 +262,13 @@ async def list_tools() -> list[Tool]:
                 "properties": {},
             },
         ),
-    ]
+]
+
+
+@server.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available tools."""
+    return _TOOLS
 
 
 @server.call_tool()
@@ -187,110 +279,145 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     match name:
         case "search_ontoportal":
             instance = arguments.get("instance", config.default_ontoportal)
-            async with OntoPortalClient(instance, config.bioportal_api_key) as client:
-                results = await client.search(
-                    arguments["query"],
-                    ontologies=arguments.get("ontologies"),
+            client = get_ontoportal_client(instance, config.bioportal_api_key)
+            # limit=20 stops the client deserializing rows we would slice off
+            results = await client.search(
+                arguments["query"],
+                ontologies=arguments.get("ontologies"),
+                limit=20,
+            )
+            return [
+                TextContent(
+                    type="text",
+                    text=_SearchResultList.dump_json(results, by_alias=True, indent=2).decode(),
                 )
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(
-                            [r.model_dump(by_alias=True) for r in results[:20]],
-                            indent=2,
-                        ),
-                    )
-                ]
+            ]
 
         case "list_ontoportal_ontologies":
             instance = arguments.get("instance", config.default_ontoportal)
-            async with OntoPortalClient(instance, config.bioportal_api_key) as client:
-                ontologies = await client.list_ontologies()
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(
-                            [{"acronym": o.acronym, "name": o.name} for o in ontologies],
-                            indent=2,
-                        ),
-                    )
-                ]
+            client = get_ontoportal_client(instance, config.bioportal_api_key)
+            ontologies = await client.list_ontologies()
+            return [
+                TextContent(
+                    type="text",
+                    text=orjson.dumps(
+                        [{"acronym": o.acronym, "name": o.name} for o in ontologies],
+                        option=orjson.OPT_INDENT_2,
+                    ).decode(),
+                )
+            ]
 
         case "get_ontology_class":
             instance = arguments.get("instance", config.default_ontoportal)
-            async with OntoPortalClient(instance, config.bioportal_api_key) as client:
-                cls = await client.get_class(arguments["ontology"], arguments["class_id"])
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(cls.model_dump(by_alias=True), indent=2),
-                    )
-                ]
+            client = get_ontoportal_client(instance, config.bioportal_api_key)
+            cls = await client.get_class(arguments["ontology"], arguments["class_id"])
+            return [
+                TextContent(
+                    type="text",
+                    text=cls.model_dump_json(by_alias=True, indent=2),
+                )
+            ]
+
+        case "get_class_with_context":
+            instance = arguments.get("instance", config.default_ontoportal)
+            client = get_ontoportal_client(instance, config.bioportal_api_key)
+            # The three requests multiplex over the shared HTTP/2 connection,
+            # so wall time is ~max(RTTs) instead of their sum
+            cls, children, onto = await asyncio.gather(
+                client.get_class(arguments["ontology"], arguments["class_id"]),
+                client.get_children(arguments["ontology"], arguments["class_id"]),
+                client.get_ontology(arguments["ontology"]),
+            )
+            return [
+                TextContent(
+                    type="text",
+                    text=orjson.dumps(
+                        {
+                            "class": cls.model_dump(by_alias=True),
+                            "children": _OntologyClassList.dump_python(
+                                children, by_alias=True
+                            ),
+                            "ontology": onto.model_dump(by_alias=True),
+                        },
+                        option=orjson.OPT_INDENT_2,
+                    ).decode(),
+                )
+            ]
 
         case "search_nvs":
-            async with NvsClient() as client:
-                results = await client.search(
-                    arguments["query"],
-                    collection=arguments.get("collection"),
+            client = get_nvs_client()
+            results = await client.search(
+                arguments["query"],
+                collection=arguments.get("collection"),
+                limit=20,
+            )
+            return [
+                TextContent(
+                    type="text",
+                    text=_ConceptList.dump_json(results, by_alias=True, indent=2).decode(),
                 )
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(
-                            [r.model_dump(by_alias=True) for r in results[:20]],
-                            indent=2,
-                        ),
-                    )
-                ]
+            ]
 
         case "list_nvs_collections":
-            async with NvsClient() as client:
-                collections = await client.list_collections()
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(
-                            [{"identifier": c.identifier, "title": c.title} for c in collections],
-                            indent=2,
-                        ),
-                    )
-                ]
+            client = get_nvs_client()
+            collections = await client.list_collections()
+            return [
+                TextContent(
+                    type="text",
+                    text=orjson.dumps(
+                        [{"identifier": c.identifier, "title": c.title} for c in collections],
+                        option=orjson.OPT_INDENT_2,
+                    ).decode(),
+                )
+            ]
 
         case "cache_ontology":
             instance = arguments.get("instance", config.default_ontoportal)
             ontology = arguments["ontology"]
-            async with OntoPortalClient(instance, config.bioportal_api_key) as client:
-                data = await client.download_ontology(ontology)
-                store = get_store()
-                graph_name = f"urn:ontoportal:{instance}:{ontology}"
-                count = store.load_rdf(data, RdfFormat.XML, graph_name)
-                return [
-                    TextContent(
-                        type="text",
-                        text=f"Cached {ontology}: loaded {count} triples into local store",
-                    )
-                ]
+            client = get_ontoportal_client(instance, config.bioportal_api_key)
+            store = get_store()
+            graph_name = f"urn:ontoportal:{instance}:{ontology}"
+            # Spool the download to disk and bulk-load in a worker thread, so
+            # large ontologies are never held in memory and parsing does not
+            # block the event loop
+            with tempfile.NamedTemporaryFile(suffix=".rdf") as tmp:
+                async for chunk in client.stream_ontology(ontology):
+                    tmp.write(chunk)
+                tmp.flush()
+                count = await asyncio.to_thread(
+                    store.load_rdf_file, Path(tmp.name), RdfFormat.XML, graph_name
+                )
+            return [
+                TextContent(
+                    type="text",
+                    text=f"Cached {ontology}: loaded {count} triples into local store",
+                )
+            ]
 
         case "sparql_query":
             store = get_store()
-            results = store.query(arguments["query"])
+            # Long scans run in a worker thread so the event loop stays live;
+            # iter_query stops after 100 rows instead of materializing all
+            results = await asyncio.to_thread(
+                lambda: list(store.iter_query(arguments["query"], limit=100))
+            )
             return [
                 TextContent(
                     type="text",
-                    text=json.dumps(results[:100], indent=2),
+                    text=orjson.dumps(results, option=orjson.OPT_INDENT_2).decode(),
                 )
             ]
 
         case "list_cached":
             store = get_store()
-            graphs = list(store.graphs())
+            graphs = await asyncio.to_thread(lambda: list(store.graphs()))
             return [
                 TextContent(
                     type="text",
-                    text=json.dumps(
+                    text=orjson.dumps(
                         {"graphs": graphs, "total_triples": len(store)},
-                        indent=2,
-                    ),
+                        option=orjson.OPT_INDENT_2,
+                    ).decode(),
                 )
             ]
 
@@ -302,5 +429,8 @@ async def run_stdio() -> None:
     """Run the server using stdio transport."""
     from mcp.server.stdio import stdio_server
 
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, server.create_initialization_options())
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, server.create_initialization_options())
+    finally:
+        await close_clients()
@@ -1,11 +1,15 @@
 """Local RDF store using pyoxigraph."""
 
 from enum import StrEnum
+from functools import lru_cache
+from itertools import count, islice
 from pathlib import Path
-from typing import Iterator
+from typing import TYPE_CHECKING, Iterator
 
 import pyoxigraph as ox
-from rdflib import Graph
+
+if TYPE_CHECKING:
+    from rdflib import Graph
 
 
 class RdfFormat(StrEnum):
@@ -28,6 +32,48 @@ class RdfFormat(StrEnum):
         return mime_types[self]
 
 
+# Exact-type converters for binding values: one dict hash per cell instead
+# of up to three isinstance checks in the conversion hot loop
+_TERM_CONVERTERS = {
+    ox.NamedNode: lambda v: str(v.value),
+    ox.Literal: lambda v: str(v.value),
+    ox.BlankNode: lambda v: f"_:{v.value}",
+}
+
+@lru_cache(maxsize=1)
+def _rdflib_converters():
+    """Exact-type dispatch for oxigraph -> rdflib term conversion.
+
+    Built on first use so that importing this module never pays for
+    rdflib - only construct() needs it.
+    """
+    from rdflib import BNode, Literal, URIRef
+
+    return {
+        ox.NamedNode: lambda t: URIRef(t.value),
+        ox.BlankNode: lambda t: BNode(t.value),
+        # Language-tagged literals carry rdf:langString as datatype, which
+        # rdflib rejects alongside lang - pass one or the other
+        ox.Literal: lambda t: Literal(t.value, lang=t.language)
+        if t.language
+        else Literal(t.value, datatype=URIRef(t.datatype.value) if t.datatype else None),
+    }
+
+
+# Distinguishes Store instances in cache tokens; id() is unsafe for this
+# because a collected store's address can be reissued to a new one
+_instance_ids = count()
+
+
+def _ox_triple_to_rdflib(triple: ox.Triple, converters):
+    """Convert an oxigraph triple to rdflib terms."""
+    return (
+        converters[type(triple.subject)](triple.subject),
+        converters[type(triple.predicate)](triple.predicate),
+        converters[type(triple.object)](triple.object),
+    )
+
+
 class Store:
     """A local RDF store backed by pyoxigraph."""
 
@@ -42,12 +88,37 @@ class Store:
             self._store = ox.Store(str(path))
         else:
             self._store = ox.Store()
+        # Monotonic write counter; bumped on every mutation so cached query
+        # results from older store states can never be served
+        self._version = 0
+        self._instance_id = next(_instance_ids)
+        self._query_cached = lru_cache(maxsize=512)(self._query_uncached)
+
+    @property
+    def version(self) -> int:
+        """Current write counter; changes whenever the store is mutated.
+
+        Callers can key derived caches on this to get automatic
+        invalidation on any write.
+        """
+        return self._version
+
+    @property
+    def cache_token(self) -> tuple[int, int]:
+        """Opaque token identifying this store instance and write state.
+
+        Unlike version alone, the token never collides across different
+        Store instances, so module-level caches validated against it
+        cannot serve one store's data for another.
+        """
+        return (self._instance_id, self._version)
 
     def load_rdf(
         self,
         data: str | bytes,
         format: RdfFormat = RdfFormat.TURTLE,
         graph_name: str | None = None,
+        bulk: bool = False,
     ) -> int:
         """Load RDF data into the store.
 
@@ -55,6 +126,9 @@ class Store:
             data: RDF data as string or bytes.
             format: RDF serialization format.
             graph_name: Optional named graph to load into.
+            bulk: Use pyoxigraph's bulk loader, which skips the transaction
+                log. Much faster for initial ingest of a fresh graph; keep
+                False for incremental updates.
 
         Returns:
             Number of triples loaded.
@@ -65,75 +139,287 @@ class Store:
         graph = ox.NamedNode(graph_name) if graph_name else ox.DefaultGraph()
 
         before = len(self._store)
-        self._store.load(data, format.mime_type, to_graph=graph)
+        if bulk:
+            self._store.bulk_load(
+                data, ox.RdfFormat.from_media_type(format.mime_type), to_graph=graph
+            )
+        else:
+            self._store.load(data, format.mime_type, to_graph=graph)
+        self._version += 1
         return len(self._store) - before
 
-    def query(self, sparql: str) -> list[dict[str, str]]:
+    def load_rdf_file(
+        self,
+        path: Path,
+        format: RdfFormat = RdfFormat.TURTLE,
+        graph_name: str | None = None,
+    ) -> int:
+        """Bulk-load RDF from a file on disk.
+
+        Parses straight from the file via pyoxigraph's bulk loader, so peak
+        memory stays at O(parse buffer) regardless of file size.
+
+        Args:
+            path: Path to the RDF file.
+            format: RDF serialization format.
+            graph_name: Optional named graph to load into.
+
+        Returns:
+            Number of triples loaded.
+        """
+        before = len(self._store)
+        self._store.bulk_load(
+            path=str(path),
+            format=ox.RdfFormat.from_media_type(format.mime_type),
+            to_graph=ox.NamedNode(graph_name) if graph_name else None,
+        )
+        self._version += 1
+        return len(self._store) - before
+
+    def dump(self, format: RdfFormat = RdfFormat.NQUADS) -> bytes:
+        """Serialize the whole store (all graphs) to bytes.
+
+        N-Quads round-trips named graphs and re-ingests far faster than
+        Turtle, so a dump taken once can seed many fresh stores cheaply.
+
+        Args:
+            format: RDF serialization format; must support named graphs.
+        """
+        return self._store.dump(format=ox.RdfFormat.from_media_type(format.mime_type))
+
+    def snapshot(self) -> "Store":
+        """Return an independent in-memory copy of this store.
+
+        pyoxigraph's Python bindings expose no copy-on-write view, so
+        this round-trips through an N-Quads dump and the bulk loader -
+        still far cheaper than re-parsing source Turtle, and the copy
+        can be mutated freely without touching the original.
+        """
+        copy = Store()
+        copy._store.bulk_load(self.dump(RdfFormat.NQUADS), ox.RdfFormat.N_QUADS)
+        return copy
+
+    def query(self, sparql: str, graph_name: str | None = None) -> list[dict[str, str]]:
         """Execute a SPARQL SELECT query.
 
+        Results are cached per (query, graph, store version): repeated
+        queries on an unchanged store skip the parse/plan/evaluate cost
+        entirely, and any write invalidates the cache by bumping the
+        version.
+
         Args:
             sparql: SPARQL query string.
+            graph_name: Optional graph to scope GRAPH ?g patterns to. Lets
+                callers keep the query text constant across graphs.
 
         Returns:
             List of result bindings as dictionaries.
         """
-        results = self._store.query(sparql)
-        variables = [v.value for v in results.variables]
-        rows: list[dict[str, str]] = []
+        rows = self._query_cached(sparql, graph_name, self._version)
+        # Hand out fresh dicts so callers can't mutate the cached copies
+        return [dict(row) for row in rows]
+
+    def _query_uncached(
+        self, sparql: str, graph_name: str | None, version: int
+    ) -> tuple[tuple[tuple[str, str], ...], ...]:
+        """Evaluate a SELECT query; version is part of the cache key only."""
+        return tuple(tuple(row.items()) for row in self._iter_solutions(sparql, graph_name))
+
+    def query_columns(
+        self, sparql: str, graph_name: str | None = None
+    ) -> dict[str, list[str | None]]:
+        """Execute a SPARQL SELECT query, returning one column per variable.
+
+        Avoids the per-row dict of query(): for an N-row, V-variable result
+        this allocates V lists instead of N dicts, so large results cost
+        roughly half the objects. Columns are row-aligned, with None where
+        a variable is unbound (e.g. under OPTIONAL).
+
+        Args:
+            sparql: SPARQL query string.
+            graph_name: Optional graph to scope GRAPH ?g patterns to.
+        """
+        named_graphs = [ox.NamedNode(graph_name)] if graph_name else None
+        results = self._store.query(sparql, named_graphs=named_graphs)
+        variables = tuple(v.value for v in results.variables)
+        columns: dict[str, list[str | None]] = {v: [] for v in variables}
+        appends = tuple(columns[v].append for v in variables)
+        converters = _TERM_CONVERTERS
+        for solution in results:
+            for var_name, append in zip(variables, appends):
+                value = solution[var_name]
+                if value is None:
+                    append(None)
+                else:
+                    conv = converters.get(type(value))
+                    append(conv(value) if conv is not None else None)
+        return columns
+
+    def ask(self, sparql: str, graph_name: str | None = None) -> bool:
+        """Execute a SPARQL ASK query.
+
+        Cheap existence probe - lets endpoints skip expensive aggregation
+        queries entirely when a graph has none of the relevant triples.
+
+        Args:
+            sparql: SPARQL ASK query string.
+            graph_name: Optional graph to scope GRAPH ?g patterns to.
+        """
+        named_graphs = [ox.NamedNode(graph_name)] if graph_name else None
+        return bool(self._store.query(sparql, named_graphs=named_graphs))
+
+    def match(
+        self,
+        subject: str | None = None,
+        predicate: str | None = None,
+        object: str | None = None,
+        graph_name: str | None = None,
+    ) -> Iterator[tuple[str, str, str]]:
+        """Yield triples matching a pattern straight from the quad index.
+
+        pyoxigraph keeps SPO/POS/OSP-style permutations, so any
+        combination of bound terms is a prefix scan over the right index
+        - O(matches), not O(store) - and there is no SPARQL parse/plan
+        cost at all. Use for simple lookups like "all subjects with this
+        rdf:type"; anything with joins still belongs in query().
+
+        Args:
+            subject: Subject IRI to match, or None for any.
+            predicate: Predicate IRI to match, or None for any.
+            object: Object IRI to match, or None for any (IRIs only;
+                literal objects can't be addressed through this API).
+            graph_name: Optional named graph to restrict the scan to.
+        """
+        converters = _TERM_CONVERTERS
+        quads = self._store.quads_for_pattern(
+            ox.NamedNode(subject) if subject else None,
+            ox.NamedNode(predicate) if predicate else None,
+            ox.NamedNode(object) if object else None,
+            ox.NamedNode(graph_name) if graph_name else None,
+        )
+        for quad in quads:
+            yield (
+                converters[type(quad.subject)](quad.subject),
+                converters[type(quad.predicate)](quad.predicate),
+                converters[type(quad.object)](quad.object),
+            )
+
+    def contains_triple(
+        self,
+        subject: str | None = None,
+        predicate: str | None = None,
+        object: str | None = None,
+        graph_name: str | None = None,
+    ) -> bool:
+        """Check whether any triple matches a pattern.
+
+        Index probe with early exit - no SPARQL parse, no result
+        materialization, no term conversion. The cheapest possible
+        "does this graph have any X?" check.
+
+        Args: same as match().
+        """
+        quads = self._store.quads_for_pattern(
+            ox.NamedNode(subject) if subject else None,
+            ox.NamedNode(predicate) if predicate else None,
+            ox.NamedNode(object) if object else None,
+            ox.NamedNode(graph_name) if graph_name else None,
+        )
+        return next(iter(quads), None) is not None
+
+    def iter_query(
+        self, sparql: str, limit: int | None = None, graph_name: str | None = None
+    ) -> Iterator[dict[str, str]]:
+        """Execute a SPARQL SELECT query, yielding one binding dict at a time.
+
+        Unlike query(), results are neither materialized in full nor cached:
+        evaluation stops after limit rows, so peak memory is O(limit) even
+        when the query matches far more. Use for ad-hoc queries whose
+        results are shown truncated, or for "at least N rows" checks that
+        should stop as soon as N is reached.
+
+        Args:
+            sparql: SPARQL query string.
+            limit: Maximum number of rows to yield (None = all).
+            graph_name: Optional graph to scope GRAPH ?g patterns to.
+        """
+        solutions = self._iter_solutions(sparql, graph_name)
+        return islice(solutions, limit) if limit is not None else solutions
+
+    def _iter_solutions(
+        self, sparql: str, graph_name: str | None = None
+    ) -> Iterator[dict[str, str]]:
+        """Yield binding dicts for a SELECT query as pyoxigraph produces them."""
+        named_graphs = [ox.NamedNode(graph_name)] if graph_name else None
+        results = self._store.query(sparql, named_graphs=named_graphs)
+        variables = tuple(v.value for v in results.variables)
+        converters = _TERM_CONVERTERS
         for solution in results:
             row: dict[str, str] = {}
             for var_name in variables:
                 value = solution[var_name]
                 if value is not None:
-                    if isinstance(value, ox.NamedNode):
-                        row[var_name] = str(value.value)
-                    elif isinstance(value, ox.Literal):
-                        row[var_name] = str(value.value)
-                    elif isinstance(value, ox.BlankNode):
-                        row[var_name] = f"_:{value.value}"
-            rows.append(row)
-        return rows
-
-    def construct(self, sparql: str) -> Graph:
+                    conv = converters.get(type(value))
+                    if conv is not None:
+                        row[var_name] = conv(value)
+            yield row
+
+    def construct(self, sparql: str) -> "Graph":
         """Execute a SPARQL CONSTRUCT query.
 
+        Callers that just re-serialize the result should prefer
+        construct_raw(), which skips the per-triple rdflib wrapping
+        (and the rdflib import - it is only loaded here, on first use).
+
         Args:
             sparql: SPARQL CONSTRUCT query string.
 
         Returns:
             rdflib Graph with constructed triples.
         """
-        results = self._store.query(sparql)
+        from rdflib import Graph
+
         g = Graph()
-        for triple in results:
-            g.add(self._ox_triple_to_rdflib(triple))
+        add = g.add
+        converters = _rdflib_converters()
+        for triple in self.construct_raw(sparql):
+            add(_ox_triple_to_rdflib(triple, converters))
         return g
 
-    def _ox_triple_to_rdflib(self, triple: ox.Triple):
-        """Convert an oxigraph triple to rdflib terms."""
-        from rdflib import BNode, Literal, URIRef
-
-        def convert(term: ox.NamedNode | ox.BlankNode | ox.Literal):
-            if isinstance(term, ox.NamedNode):
-                return URIRef(term.value)
-            elif isinstance(term, ox.BlankNode):
-                return BNode(term.value)
-            elif isinstance(term, ox.Literal):
-                return Literal(
-                    term.value,
-                    lang=term.language,
-                    datatype=URIRef(term.datatype.value) if term.datatype else None,
-                )
-            return term
-
-        return (convert(triple.subject), convert(triple.predicate), convert(triple.object))
+    def construct_raw(self, sparql: str) -> Iterator[ox.Triple]:
+        """Execute a SPARQL CONSTRUCT query, yielding oxigraph triples as-is.
+
+        Args:
+            sparql: SPARQL CONSTRUCT query string.
+        """
+        return iter(self._store.query(sparql))
 
     def graphs(self) -> Iterator[str]:
-        """List all named graphs in the store."""
-        sparql = "SELECT DISTINCT ?g WHERE { GRAPH ?g { ?s ?p ?o } }"
-        for row in self.query(sparql):
-            if "g" in row:
-                yield row["g"]
+        """List all named graphs in the store.
+
+        Uses pyoxigraph's graph index - O(#graphs), unlike a DISTINCT
+        query which scans every quad.
+        """
+        for graph in self._store.named_graphs():
+            if isinstance(graph, ox.NamedNode):
+                yield str(graph.value)
+
+    def has_graph(self, graph_name: str) -> bool:
+        """Check whether a named graph exists - O(1) index lookup.
+
+        Prefer this over scanning graphs() when membership is the only
+        question.
+        """
+        return self._store.contains_named_graph(ox.NamedNode(graph_name))
+
+    def graph_names(self) -> set[str]:
+        """Named graph IRIs as a set, for membership checks.
+
+        Reads the same graph index as graphs() - O(#graphs) - so there
+        is no shadow bookkeeping to drift when graphs are created or
+        dropped through SPARQL updates.
+        """
+        return set(self.graphs())
 
     def __len__(self) -> int:
         return len(self._store)
@@ -145,10 +431,14 @@ class Store:
             sparql: SPARQL UPDATE query string.
         """
         self._store.update(sparql)
+        self._version += 1
 
     def clear(self, graph_name: str | None = None) -> None:
         """Clear all triples, optionally from a specific graph."""
         if graph_name:
-            self._store.update(f"CLEAR GRAPH <{graph_name}>")
+            # DROP (not CLEAR) so the graph also leaves the named-graph
+            # index that graphs() now reads
+            self._store.update(f"DROP SILENT GRAPH <{graph_name}>")
         else:
             self._store.update("CLEAR ALL")
+        self._version += 1
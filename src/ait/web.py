@@ -1,20 +1,29 @@
 """FastAPI web server for ait - serves the SvelteKit frontend and API."""
 
-import json
+import asyncio
+import os
 import re
+import sys
+import tempfile
+from collections import Counter, deque
+from functools import cached_property, lru_cache
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
+from operator import itemgetter
+from urllib.parse import quote, unquote
 
+import orjson
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from mcp.server import Server as McpServer
 from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
 from mcp.types import TextContent, Tool
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
 
 from ait.clients.ontoportal import OntoPortalClient, OntoPortalInstance
 from ait.store import RdfFormat, Store
@@ -23,6 +32,12 @@ from ait.store import RdfFormat, Store
 AIT_META_GRAPH = "urn:ait:meta"
 AIT_NS = "urn:ait:ontology#"  # Namespace for ait predicates
 
+# Predicate IRIs derived from AIT_NS, built once instead of per call/row
+AIT_PREFIX_PRED_BASE = f"{AIT_NS}prefix/"
+AIT_SELECTED_NS_PRED = f"{AIT_NS}selectedNamespace"
+AIT_DISPLAY_MODE_PRED = f"{AIT_NS}displayNameMode"
+AIT_SHOW_DEPRECATED_PRED = f"{AIT_NS}showDeprecated"
+
 # Well-known namespace prefixes (curated from prefix.cc and common ontologies)
 WELL_KNOWN_PREFIXES: dict[str, str] = {
     # W3C standards
@@ -71,6 +86,118 @@ WELL_KNOWN_PREFIXES: dict[str, str] = {
 }
 
 
+# Characters that cannot appear in a valid IRI; anything matching would let
+# a crafted URI break out of the <...> it is inlined into
+_IRI_UNSAFE = re.compile(r'[<>"{}|^`\\\s]')
+
+# Escapes backslash and double quote for embedding in SPARQL string literals;
+# one translate pass instead of chained str.replace
+_LITERAL_ESCAPE = str.maketrans({"\\": "\\\\", '"': '\\"'})
+
+
+def _safe_iri(iri: str) -> str:
+    """Validate an IRI before inlining it into a SPARQL template.
+
+    Inlined IRIs are the one place user input reaches query text, so reject
+    anything that could terminate the IRI early. Returns the IRI unchanged
+    when safe.
+    """
+    if not iri or _IRI_UNSAFE.search(iri):
+        raise HTTPException(status_code=400, detail=f"Invalid IRI: {iri!r}")
+    return iri
+
+
+# Module-level query templates: formatting a constant keeps the rendered
+# query byte-identical per URI, so the store's result cache can hit
+_DESCRIBE_CLASS_IN_GRAPH_TPL = """
+SELECT ?predicate ?object WHERE {{
+    GRAPH <{ontology_uri}> {{
+        <{class_uri}> ?predicate ?object .
+    }}
+}}
+"""
+
+_DESCRIBE_CLASS_ALL_TPL = """
+SELECT ?graph ?predicate ?object WHERE {{
+    GRAPH ?graph {{
+        <{class_uri}> ?predicate ?object .
+    }}
+}}
+"""
+
+# Scoped to one graph via Store.query(graph_name=...) so the text stays
+# constant across ontologies; only the limit varies
+_CLASS_GRAPH_TPL = """
+SELECT DISTINCT ?class ?label ?parent WHERE {{
+    GRAPH ?g {{
+        ?class a <http://www.w3.org/2002/07/owl#Class> .
+        OPTIONAL {{ ?class <http://www.w3.org/2000/01/rdf-schema#label> ?label }}
+        OPTIONAL {{ ?class <http://www.w3.org/2000/01/rdf-schema#subClassOf> ?parent }}
+    }}
+}} LIMIT {limit}
+"""
+
+# Variant without the subClassOf join, for edge_label filters that rule
+# out every edge this endpoint can produce - the parent scan is skipped
+# entirely instead of fetched and discarded
+_CLASS_NODES_TPL = """
+SELECT DISTINCT ?class ?label WHERE {{
+    GRAPH ?g {{
+        ?class a <http://www.w3.org/2002/07/owl#Class> .
+        OPTIONAL {{ ?class <http://www.w3.org/2000/01/rdf-schema#label> ?label }}
+    }}
+}} LIMIT {limit}
+"""
+
+_CLASS_LIST_TPL = """
+SELECT DISTINCT ?class ?label ?comment WHERE {{
+    GRAPH ?g {{
+        ?class a <http://www.w3.org/2002/07/owl#Class> .
+        OPTIONAL {{ ?class <http://www.w3.org/2000/01/rdf-schema#label> ?label }}
+        OPTIONAL {{ ?class <http://www.w3.org/2000/01/rdf-schema#comment> ?comment }}
+    }}
+}} LIMIT {limit}
+"""
+
+# Fully constant query texts (scoped per graph via Store.query(graph_name=...))
+# and single-hole templates: keeping the SPARQL byte-identical across calls
+# lets the store's result cache key on stable strings
+_NS_CLASS_QUERY = """
+SELECT ?class WHERE {
+    GRAPH ?g {
+        ?class a <http://www.w3.org/2002/07/owl#Class> .
+        FILTER(isIRI(?class))
+    }
+}
+"""
+
+_CONFIG_TPL = """
+SELECT ?p ?o WHERE {{
+    GRAPH <urn:ait:meta> {{
+        <{ontology_uri}> ?p ?o .
+        VALUES ?p {{
+            <urn:ait:ontology#selectedNamespace>
+            <urn:ait:ontology#displayNameMode>
+            <urn:ait:ontology#showDeprecated>
+        }}
+    }}
+}}
+"""
+
+_SUPERCLASS_EDGES_TPL = """
+SELECT ?child ?parent ?parentLabel ?parentPrefixIRI WHERE {{
+    GRAPH ?g {{
+        <{class_uri}> <http://www.w3.org/2000/01/rdf-schema#subClassOf>* ?child .
+        ?child <http://www.w3.org/2000/01/rdf-schema#subClassOf> ?parent .
+        FILTER(isIRI(?child))
+        FILTER(isIRI(?parent))
+        OPTIONAL {{ ?parent <http://www.w3.org/2000/01/rdf-schema#label> ?parentLabel }}
+        OPTIONAL {{ ?parent <http://data.bioontology.org/metadata/prefixIRI> ?parentPrefixIRI }}
+    }}
+}}
+"""
+
+
 def _find_env_file() -> Path | None:
     """Find .env file by walking up from this file's location."""
     current = Path(__file__).resolve().parent
@@ -96,17 +223,20 @@ class Settings(BaseSettings):
     ecoportal_api_key: str = ""
     matportal_api_key: str = ""
 
-    def get_api_key(self, instance: OntoPortalInstance) -> str | None:
-        """Get the API key for a given OntoPortal instance."""
-        key_map = {
+    @cached_property
+    def _key_map(self) -> dict[OntoPortalInstance, str]:
+        """Instance -> API key, built once since settings are immutable at runtime."""
+        return {
             OntoPortalInstance.BIOPORTAL: self.bioportal_api_key,
             OntoPortalInstance.AGROPORTAL: self.agroportal_api_key,
             OntoPortalInstance.ECOPORTAL: self.ecoportal_api_key,
             OntoPortalInstance.MATPORTAL: self.matportal_api_key,
             OntoPortalInstance.SIFR: self.bioportal_api_key,  # SIFR uses same as BioPortal
         }
-        key = key_map.get(instance, "")
-        return key if key else None
+
+    def get_api_key(self, instance: OntoPortalInstance) -> str | None:
+        """Get the API key for a given OntoPortal instance."""
+        return self._key_map.get(instance) or None
 
 
 settings = Settings()
@@ -173,59 +303,51 @@ async def call_mcp_tool(name: str, arguments: dict) -> list[TextContent]:
     match name:
         case "sparql_query":
             try:
-                results = store.query(arguments["query"])
+                # Stream at most 100 rows instead of materializing everything
+                results = list(store.iter_query(arguments["query"], limit=100))
                 return [
                     TextContent(
                         type="text",
-                        text=json.dumps(results[:100], indent=2),
+                        text=orjson.dumps(results, option=orjson.OPT_INDENT_2).decode(),
                     )
                 ]
             except Exception as e:
                 return [TextContent(type="text", text=f"Query error: {e}")]
 
         case "list_cached_ontologies":
-            graphs = list(store.graphs())
-            # Get triple counts for each graph (skip internal meta graph)
-            ontologies = []
-            for graph_uri in graphs:
-                if graph_uri == AIT_META_GRAPH:
-                    continue
-                count_query = f"SELECT (COUNT(*) as ?count) WHERE {{ GRAPH <{graph_uri}> {{ ?s ?p ?o }} }}"
-                count_result = store.query(count_query)
-                triple_count = int(count_result[0].get("count", 0)) if count_result else 0
-                ontologies.append({"uri": graph_uri, "triple_count": triple_count})
+            # One grouped query instead of a COUNT per graph; the meta graph
+            # is excluded in the query itself
+            ontologies = [
+                {"uri": graph_uri, "triple_count": count}
+                for graph_uri, count in _graph_triple_counts(store).items()
+            ]
             return [
                 TextContent(
                     type="text",
-                    text=json.dumps(ontologies, indent=2),
+                    text=orjson.dumps(ontologies, option=orjson.OPT_INDENT_2).decode(),
                 )
             ]
 
         case "describe_class":
-            class_uri = arguments["class_uri"]
-            ontology_uri = arguments.get("ontology_uri")
+            try:
+                class_uri = _safe_iri(arguments["class_uri"])
+                ontology_uri = arguments.get("ontology_uri")
+                if ontology_uri:
+                    ontology_uri = _safe_iri(ontology_uri)
+            except HTTPException as e:
+                return [TextContent(type="text", text=e.detail)]
 
             if ontology_uri:
-                query = f"""
-                SELECT ?predicate ?object WHERE {{
-                    GRAPH <{ontology_uri}> {{
-                        <{class_uri}> ?predicate ?object .
-                    }}
-                }}
-                """
+                query = _DESCRIBE_CLASS_IN_GRAPH_TPL.format(
+                    ontology_uri=ontology_uri, class_uri=class_uri
+                )
             else:
-                query = f"""
-                SELECT ?graph ?predicate ?object WHERE {{
-                    GRAPH ?graph {{
-                        <{class_uri}> ?predicate ?object .
-                    }}
-                }}
-                """
-            results = store.query(query)
+                query = _DESCRIBE_CLASS_ALL_TPL.format(class_uri=class_uri)
+            results = list(store.iter_query(query, limit=50))
             return [
                 TextContent(
                     type="text",
-                    text=json.dumps(results[:50], indent=2),
+                    text=orjson.dumps(results, option=orjson.OPT_INDENT_2).decode(),
                 )
             ]
 
@@ -244,11 +366,43 @@ mcp_session_manager = StreamableHTTPSessionManager(
 )
 
 
+# Pooled OntoPortal clients, keyed by (instance, api_key) so ingest and
+# refresh reuse connection pools and TLS sessions across requests instead
+# of handshaking per ontology
+_ontoportal_clients: dict[tuple[str, str | None], OntoPortalClient] = {}
+
+
+def _get_ontoportal_client(
+    instance: OntoPortalInstance, api_key: str | None
+) -> OntoPortalClient:
+    """Get or create a pooled OntoPortal client."""
+    key = (str(instance), api_key)
+    client = _ontoportal_clients.get(key)
+    if client is None:
+        client = OntoPortalClient(instance, api_key=api_key)
+        _ontoportal_clients[key] = client
+    return client
+
+
+async def _close_ontoportal_clients() -> None:
+    """Close all pooled OntoPortal clients."""
+    for client in _ontoportal_clients.values():
+        await client.close()
+    _ontoportal_clients.clear()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager to initialize MCP session manager."""
-    async with mcp_session_manager.run():
-        yield
+    # Open the store at startup: the first request no longer pays the
+    # database-open cost, and there is no first-access race under
+    # concurrent startup traffic
+    app.state.store = get_store()
+    try:
+        async with mcp_session_manager.run():
+            yield
+    finally:
+        await _close_ontoportal_clients()
 
 
 # ============================================================================
@@ -258,7 +412,10 @@ async def lifespan(app: FastAPI):
 app = FastAPI(
     title="ait",
     description="Archive of Interconnected Terms",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson is several times faster than stdlib json on the nested
+    # model payloads the entity endpoints return
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -457,62 +614,136 @@ class OntologyConfig(BaseModel):
     show_deprecated: bool = False  # Whether to show owl:deprecated entities
 
 
-# Map web portal URLs to data API URLs
-ONTOPORTAL_URL_PATTERNS = [
-    # bioportal.bioontology.org/ontologies/ACRONYM -> data.bioontology.org
-    (r"https?://bioportal\.bioontology\.org/ontologies/([A-Za-z0-9_-]+)", OntoPortalInstance.BIOPORTAL),
-    (r"https?://data\.bioontology\.org/ontologies/([A-Za-z0-9_-]+)", OntoPortalInstance.BIOPORTAL),
-    # agroportal
-    (r"https?://agroportal\.lirmm\.fr/ontologies/([A-Za-z0-9_-]+)", OntoPortalInstance.AGROPORTAL),
-    (r"https?://data\.agroportal\.lirmm\.fr/ontologies/([A-Za-z0-9_-]+)", OntoPortalInstance.AGROPORTAL),
-    # ecoportal
-    (r"https?://ecoportal\.lifewatch\.eu/ontologies/([A-Za-z0-9_-]+)", OntoPortalInstance.ECOPORTAL),
-    (r"https?://data\.ecoportal\.lifewatch\.eu/ontologies/([A-Za-z0-9_-]+)", OntoPortalInstance.ECOPORTAL),
-    # matportal
-    (r"https?://matportal\.org/ontologies/([A-Za-z0-9_-]+)", OntoPortalInstance.MATPORTAL),
-    (r"https?://data\.matportal\.org/ontologies/([A-Za-z0-9_-]+)", OntoPortalInstance.MATPORTAL),
-]
+# One alternation covering every known portal host (web UI and data API
+# hostnames both), compiled once: a single engine pass classifies the URL
+# instead of a Python loop over per-portal patterns
+_ONTOPORTAL_URL_RE = re.compile(
+    r"https?://(?:"
+    r"(?P<bioportal>(?:bioportal|data)\.bioontology\.org)"
+    r"|(?P<agroportal>(?:data\.)?agroportal\.lirmm\.fr)"
+    r"|(?P<ecoportal>(?:data\.)?ecoportal\.lifewatch\.eu)"
+    r"|(?P<matportal>(?:data\.)?matportal\.org)"
+    r")/ontologies/(?P<acronym>[A-Za-z0-9_-]+)",
+    re.ASCII,
+)
+
+_ONTOPORTAL_GROUP_TO_INSTANCE = {
+    "bioportal": OntoPortalInstance.BIOPORTAL,
+    "agroportal": OntoPortalInstance.AGROPORTAL,
+    "ecoportal": OntoPortalInstance.ECOPORTAL,
+    "matportal": OntoPortalInstance.MATPORTAL,
+}
 
 
+@lru_cache(maxsize=1024)
 def parse_ontoportal_url(url: str) -> tuple[OntoPortalInstance, str] | None:
-    """Parse an OntoPortal URL and return (instance, acronym) or None."""
-    for pattern, instance in ONTOPORTAL_URL_PATTERNS:
-        match = re.match(pattern, url.strip())
-        if match:
-            return instance, match.group(1)
+    """Parse an OntoPortal URL and return (instance, acronym) or None.
+
+    Memoized: the UI tends to resubmit the same handful of URLs, and a
+    cache hit is a dict probe instead of a regex match.
+    """
+    if not url:
+        return None
+    match = _ONTOPORTAL_URL_RE.match(url.strip())
+    if match is None:
+        return None
+    for group, instance in _ONTOPORTAL_GROUP_TO_INSTANCE.items():
+        if match.group(group) is not None:
+            return instance, match.group("acronym")
     return None
 
 
+
+def _sniff_format(data: bytes) -> RdfFormat | None:
+    """Guess the RDF serialization from leading content, or None if unclear.
+
+    Picking the right parser up front avoids a doomed multi-MB parse in the
+    wrong format before the fallback loop finds the correct one.
+    """
+    head = data[:4096].lstrip()
+    if head.startswith(b"<?xml") or b"<rdf:RDF" in head:
+        return RdfFormat.XML
+    if head.startswith((b"@prefix", b"@base", b"PREFIX", b"BASE", b"prefix", b"base")):
+        return RdfFormat.TURTLE
+    return None
+
+
+async def _download_to_temp(client: OntoPortalClient, acronym: str) -> Path:
+    """Stream an ontology download into a temp file and return its path.
+
+    Keeps peak memory at one chunk regardless of download size; the caller
+    is responsible for unlinking the file.
+    """
+    tmp = tempfile.NamedTemporaryFile(suffix=".rdf", delete=False)
+    try:
+        async for chunk in client.stream_ontology(acronym):
+            tmp.write(chunk)
+    except Exception:
+        tmp.close()
+        os.unlink(tmp.name)
+        raise
+    tmp.close()
+    return Path(tmp.name)
+
+
+def _load_ontology_file(store: Store, path: Path, graph_uri: str) -> int:
+    """Bulk-load an RDF file into a graph, sniffing the format first.
+
+    Falls back to trying each parser when the content is ambiguous or the
+    sniffed parse fails. Raises HTTPException when no parser accepts it.
+    """
+    with open(path, "rb") as f:
+        head = f.read(4096)
+    sniffed = _sniff_format(head)
+    formats = [RdfFormat.XML, RdfFormat.TURTLE, RdfFormat.NTRIPLES]
+    if sniffed:
+        formats.remove(sniffed)
+        formats.insert(0, sniffed)
+    for fmt in formats:
+        try:
+            # pyoxigraph reads straight from the file - no in-memory copy
+            return store.load_rdf_file(path, format=fmt, graph_name=graph_uri)
+        except Exception:
+            continue
+    raise HTTPException(status_code=500, detail="Failed to parse ontology RDF")
+
+
+def _graph_triple_counts(store: Store) -> dict[str, int]:
+    """Triple counts for the named graphs via a single GROUP BY query.
+
+    The internal meta graph is filtered server-side so callers get only
+    ontology graphs.
+    """
+    results = store.query(
+        "SELECT ?g (COUNT(*) AS ?count) WHERE { GRAPH ?g { ?s ?p ?o } "
+        f"FILTER(?g != <{AIT_META_GRAPH}>) }} GROUP BY ?g"
+    )
+    return {r["g"]: int(r.get("count", 0)) for r in results if r.get("g")}
+
+
+def _graph_labels(store: Store) -> dict[str, str]:
+    """rdfs:label of each graph URI within its own graph, in one query."""
+    results = store.query(
+        "SELECT ?g ?label WHERE { GRAPH ?g { "
+        "?g <http://www.w3.org/2000/01/rdf-schema#label> ?label } }"
+    )
+    return {r["g"]: r["label"] for r in results if r.get("g") and r.get("label")}
+
+
 @app.get("/api/ontologies", response_model=list[OntologyInfo])
 async def list_ontologies() -> list[OntologyInfo]:
     """List all cached ontologies (named graphs)."""
     store = get_store()
-    ontologies = []
 
-    for graph_uri in store.graphs():
-        # Skip internal meta graph
-        if graph_uri == AIT_META_GRAPH:
-            continue
-        # Get triple count for this graph
-        count_query = f"SELECT (COUNT(*) as ?count) WHERE {{ GRAPH <{graph_uri}> {{ ?s ?p ?o }} }}"
-        count_result = store.query(count_query)
-        triple_count = int(count_result[0].get("count", 0)) if count_result else 0
-
-        # Try to get a label
-        label_query = f"""
-        SELECT ?label WHERE {{
-            GRAPH <{graph_uri}> {{
-                <{graph_uri}> <http://www.w3.org/2000/01/rdf-schema#label> ?label .
-            }}
-        }} LIMIT 1
-        """
-        label_result = store.query(label_query)
-        label = label_result[0].get("label") if label_result else None
+    # Two grouped queries total instead of a COUNT plus label query per
+    # graph - per-query parse/plan overhead dominates for tiny results
+    counts = _graph_triple_counts(store)
+    labels = _graph_labels(store)
 
+    ontologies = []
+    for graph_uri, triple_count in counts.items():
         # Fallback: extract name from URI
-        if not label:
-            label = graph_uri.split("/")[-1].split("#")[-1]
-
+        label = labels.get(graph_uri) or graph_uri.split("/")[-1].split("#")[-1]
         ontologies.append(
             OntologyInfo(uri=graph_uri, label=label, triple_count=triple_count)
         )
@@ -521,8 +752,15 @@ async def list_ontologies() -> list[OntologyInfo]:
 
 
 @app.get("/api/ontologies/{ontology_uri:path}/graph", response_model=GraphData)
-async def get_ontology_graph(ontology_uri: str, limit: int = 200) -> GraphData:
-    """Get graph visualization data for an ontology."""
+async def get_ontology_graph(
+    ontology_uri: str, limit: int = 200, edge_label: str | None = None
+) -> GraphData:
+    """Get graph visualization data for an ontology.
+
+    edge_label optionally restricts edges to those with that label, so
+    callers interested in one relationship don't pay to serialize (or
+    query) the rest.
+    """
     store = get_store()
 
     # Check if ontology exists
@@ -533,18 +771,12 @@ async def get_ontology_graph(ontology_uri: str, limit: int = 200) -> GraphData:
     nodes: dict[str, GraphNode] = {}
     edges: list[GraphEdge] = []
 
-    # Get classes and their relationships
-    class_query = f"""
-    SELECT DISTINCT ?class ?label ?parent WHERE {{
-        GRAPH <{ontology_uri}> {{
-            ?class a <http://www.w3.org/2002/07/owl#Class> .
-            OPTIONAL {{ ?class <http://www.w3.org/2000/01/rdf-schema#label> ?label }}
-            OPTIONAL {{ ?class <http://www.w3.org/2000/01/rdf-schema#subClassOf> ?parent }}
-        }}
-    }} LIMIT {limit}
-    """
-
-    results = store.query(class_query)
+    # Filter pushdown: the only edges this endpoint emits are subClassOf,
+    # so any other edge_label means nodes only - no parent join at all
+    if edge_label is not None and edge_label != "subClassOf":
+        results = store.query(_CLASS_NODES_TPL.format(limit=limit), graph_name=ontology_uri)
+    else:
+        results = store.query(_CLASS_GRAPH_TPL.format(limit=limit), graph_name=ontology_uri)
 
     for row in results:
         class_uri = row.get("class", "")
@@ -569,9 +801,10 @@ async def execute_query(request: QueryRequest) -> QueryResponse:
     store = get_store()
 
     try:
-        results = store.query(request.sparql)
-        limited = results[: request.limit]
-        return QueryResponse(results=limited, count=len(results))
+        # Fetch limit+1 rows so truncation is detectable (count > limit)
+        # without materializing the full result set
+        rows = list(store.iter_query(request.sparql, limit=request.limit + 1))
+        return QueryResponse(results=rows[: request.limit], count=len(rows))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -580,18 +813,9 @@ async def execute_query(request: QueryRequest) -> QueryResponse:
 async def list_classes(ontology_uri: str, limit: int = 100) -> list[dict[str, str | None]]:
     """List classes in an ontology."""
     store = get_store()
+    ontology_uri = _safe_iri(ontology_uri)
 
-    query = f"""
-    SELECT DISTINCT ?class ?label ?comment WHERE {{
-        GRAPH <{ontology_uri}> {{
-            ?class a <http://www.w3.org/2002/07/owl#Class> .
-            OPTIONAL {{ ?class <http://www.w3.org/2000/01/rdf-schema#label> ?label }}
-            OPTIONAL {{ ?class <http://www.w3.org/2000/01/rdf-schema#comment> ?comment }}
-        }}
-    }} LIMIT {limit}
-    """
-
-    results = store.query(query)
+    results = store.query(_CLASS_LIST_TPL.format(limit=limit), graph_name=ontology_uri)
     classes = []
     for row in results:
         class_uri = row.get("class", "")
@@ -626,35 +850,29 @@ async def ingest_ontology(request: IngestRequest) -> IngestResponse:
             detail=f"No API key configured for {instance.name}. Set {instance.name}_API_KEY in .env or provide one in the request.",
         )
 
-    async with OntoPortalClient(instance, api_key=api_key) as client:
-        # Get ontology metadata
-        try:
-            info = await client.get_ontology(acronym)
-        except Exception as e:
-            raise HTTPException(status_code=404, detail=f"Ontology not found: {e}")
+    client = _get_ontoportal_client(instance, api_key)
+    # Get ontology metadata
+    try:
+        info = await client.get_ontology(acronym)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"Ontology not found: {e}")
 
-        # Download the ontology
-        try:
-            rdf_data = await client.download_ontology(acronym)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to download: {e}")
+    # Stream the download to disk - the full RDF never sits in memory
+    try:
+        rdf_path = await _download_to_temp(client, acronym)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to download: {e}")
 
     # Determine graph URI (use ontology IRI or construct from portal)
     graph_uri = f"{instance}/ontologies/{acronym}"
 
-    # Try to load as RDF/XML first (most common), fallback to Turtle
-    triple_count = 0
-    for fmt in [RdfFormat.XML, RdfFormat.TURTLE, RdfFormat.NTRIPLES]:
-        try:
-            triple_count = store.load_rdf(rdf_data, format=fmt, graph_name=graph_uri)
-            break
-        except Exception:
-            continue
-    else:
-        raise HTTPException(status_code=500, detail="Failed to parse ontology RDF")
+    try:
+        triple_count = _load_ontology_file(store, rdf_path, graph_uri)
 
-    # Extract prefixes from the downloaded RDF data
-    prefixes = _extract_prefixes_from_rdf(rdf_data)
+        # Extract prefixes from the downloaded RDF file
+        prefixes = _extract_prefixes_from_rdf(rdf_path)
+    finally:
+        os.unlink(rdf_path)
 
     # Store extracted prefixes in meta graph
     if prefixes:
@@ -712,30 +930,25 @@ async def refresh_ontology(ontology_uri: str) -> IngestResponse:
         )
 
     # Re-download and import
-    async with OntoPortalClient(instance, api_key=api_key) as client:
-        try:
-            info = await client.get_ontology(acronym)
-        except Exception as e:
-            raise HTTPException(status_code=404, detail=f"Ontology not found: {e}")
+    client = _get_ontoportal_client(instance, api_key)
+    try:
+        info = await client.get_ontology(acronym)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"Ontology not found: {e}")
 
-        try:
-            rdf_data = await client.download_ontology(acronym)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to download: {e}")
+    try:
+        rdf_path = await _download_to_temp(client, acronym)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to download: {e}")
 
-    # Load the ontology
-    triple_count = 0
-    for fmt in [RdfFormat.XML, RdfFormat.TURTLE, RdfFormat.NTRIPLES]:
-        try:
-            triple_count = store.load_rdf(rdf_data, format=fmt, graph_name=ontology_uri)
-            break
-        except Exception:
-            continue
-    else:
-        raise HTTPException(status_code=500, detail="Failed to parse ontology RDF")
+    try:
+        triple_count = _load_ontology_file(store, rdf_path, ontology_uri)
+
+        # Extract and store prefixes from the downloaded RDF file
+        prefixes = _extract_prefixes_from_rdf(rdf_path)
+    finally:
+        os.unlink(rdf_path)
 
-    # Extract and store prefixes from the downloaded RDF data
-    prefixes = _extract_prefixes_from_rdf(rdf_data)
     if prefixes:
         _store_ontology_prefixes(store, ontology_uri, prefixes)
 
@@ -751,7 +964,7 @@ async def refresh_ontology(ontology_uri: str) -> IngestResponse:
 # ============================================================================
 
 @app.get("/api/ontologies/{ontology_uri:path}/namespaces", response_model=list[NamespaceInfo])
-async def list_namespaces(ontology_uri: str) -> list[NamespaceInfo]:
+async def list_namespaces(ontology_uri: str) -> StreamingResponse:
     """List all namespaces in an ontology with class counts.
 
     Also indicates which namespaces are currently selected (from stored config).
@@ -759,18 +972,13 @@ async def list_namespaces(ontology_uri: str) -> list[NamespaceInfo]:
     to well-known prefixes.
     """
     store = get_store()
+    ontology_uri = _safe_iri(ontology_uri)
 
-    # Query for all class namespaces with counts
-    query = f"""
-    SELECT ?ns (COUNT(?class) as ?count) WHERE {{
-        GRAPH <{ontology_uri}> {{
-            ?class a <http://www.w3.org/2002/07/owl#Class> .
-            FILTER(isIRI(?class))
-            BIND(REPLACE(STR(?class), "(.*[#/])[^#/]*$", "$1") AS ?ns)
-        }}
-    }} GROUP BY ?ns ORDER BY DESC(?count)
-    """
-    results = store.query(query)
+    # Fetch class IRIs columnar and split off the namespace in Python: a
+    # string rfind per row instead of a per-row SPARQL REPLACE regex in
+    # the store, with no per-row dict allocation
+    class_uris = store.query_columns(_NS_CLASS_QUERY, graph_name=ontology_uri)["class"]
+    ns_counts = Counter(_split_namespace(uri)[0] for uri in class_uris if uri)
 
     # Get current config
     config = _get_ontology_config(store, ontology_uri)
@@ -785,19 +993,26 @@ async def list_namespaces(ontology_uri: str) -> list[NamespaceInfo]:
             return stored_prefixes[ns]
         return _get_prefix_for_namespace(ns)
 
-    namespaces = []
-    for row in results:
-        ns = row.get("ns")
-        count = int(row.get("count", 0))
-        if ns and count > 0:
-            namespaces.append(NamespaceInfo(
-                namespace=ns,
-                prefix=get_prefix(ns),
-                class_count=count,
-                selected=ns in selected_set
-            ))
+    def gen():
+        # Stream one JSON-array element per namespace via orjson: no list
+        # of Pydantic models is materialized and FastAPI skips response
+        # re-validation, which dominates for large ontologies
+        yield b"["
+        first = True
+        for ns, count in ns_counts.most_common():
+            if not ns:
+                continue
+            chunk = orjson.dumps({
+                "namespace": ns,
+                "prefix": get_prefix(ns),
+                "class_count": count,
+                "selected": ns in selected_set,
+            })
+            yield chunk if first else b"," + chunk
+            first = False
+        yield b"]"
 
-    return namespaces
+    return StreamingResponse(gen(), media_type="application/json")
 
 
 @app.get("/api/ontologies/{ontology_uri:path}/config", response_model=OntologyConfig)
@@ -830,8 +1045,8 @@ async def get_ontology_prefixes_endpoint(ontology_uri: str) -> dict[str, str]:
     return _get_ontology_prefixes(store, ontology_uri)
 
 
-def _extract_prefixes_from_rdf(data: bytes) -> dict[str, str]:
-    """Extract namespace prefix bindings from RDF data.
+def _extract_prefixes_from_rdf(path: Path) -> dict[str, str]:
+    """Extract namespace prefix bindings from an RDF file.
 
     Tries multiple formats (RDF/XML, Turtle, N-Triples) and returns
     a dict mapping namespace URIs to their prefixes.
@@ -840,10 +1055,20 @@ def _extract_prefixes_from_rdf(data: bytes) -> dict[str, str]:
 
     g = RdfLibGraph()
 
-    # Try parsing in different formats
-    for fmt in ["xml", "turtle", "nt"]:
+    # Sniff the head so the right parser runs first - a wrong-format
+    # attempt reads the whole file before failing
+    with open(path, "rb") as f:
+        head = f.read(4096)
+    formats = ["xml", "turtle", "nt"]
+    sniffed = _sniff_format(head)
+    if sniffed is not None:
+        fmt = {RdfFormat.XML: "xml", RdfFormat.TURTLE: "turtle"}.get(sniffed, "nt")
+        formats.remove(fmt)
+        formats.insert(0, fmt)
+
+    for fmt in formats:
         try:
-            g.parse(data=data, format=fmt)
+            g.parse(source=str(path), format=fmt)
             break
         except Exception:
             continue
@@ -896,31 +1121,33 @@ def _store_ontology_prefixes(store: Store, ontology_uri: str, prefixes: dict[str
         pass  # Graph might not exist yet
 
     # Insert prefixes: <ontology> ait:prefix_<PREFIX> "namespace_uri"
-    # This encodes the prefix in the predicate and namespace as the literal value
-    stored_count = 0
-    failed_count = 0
+    # This encodes the prefix in the predicate and namespace as the literal
+    # value. One INSERT DATA covers the whole table: a single SPARQL parse
+    # and transaction instead of one per prefix.
+    lines = []
     for namespace, prefix in prefixes.items():
-        # URL-encode the prefix for use in predicate IRI
-        import urllib.parse
-        safe_prefix = urllib.parse.quote(prefix, safe='')
-        # Escape namespace for literal
-        escaped_ns = namespace.replace("\\", "\\\\").replace('"', '\\"')
-
-        insert_query = f"""
-        INSERT DATA {{
-            GRAPH <{AIT_META_GRAPH}> {{
-                <{ontology_uri}> <{AIT_NS}prefix/{safe_prefix}> "{escaped_ns}" .
-            }}
+        safe_prefix = quote(prefix, safe="")
+        escaped_ns = namespace.translate(_LITERAL_ESCAPE)
+        lines.append(f'<{ontology_uri}> <{AIT_NS}prefix/{safe_prefix}> "{escaped_ns}" .')
+    triples = "\n".join(lines)
+    insert_query = f"""
+    INSERT DATA {{
+        GRAPH <{AIT_META_GRAPH}> {{
+            {triples}
         }}
-        """
-        try:
-            store.update(insert_query)
-            stored_count += 1
-        except Exception as e:
-            failed_count += 1
-            print(f"FAILED to store prefix {prefix}: {namespace} - {e}")
+    }}
+    """
+    try:
+        store.update(insert_query)
+    except Exception as e:
+        print(f"FAILED to store prefixes for {ontology_uri}: {e}")
+
 
-    print(f"Stored {stored_count} prefixes, {failed_count} failed")
+# Derived-data caches keyed on ontology URI, validated against the store's
+# cache token (instance id + write counter): any mutation bumps the
+# version, and entries from a different Store instance never validate
+_PREFIX_CACHE: dict[str, tuple[tuple[int, int], dict[str, str]]] = {}
+_CONFIG_CACHE: dict[str, tuple[tuple[int, int], "OntologyConfig"]] = {}
 
 
 def _get_ontology_prefixes(store: Store, ontology_uri: str) -> dict[str, str]:
@@ -930,9 +1157,13 @@ def _get_ontology_prefixes(store: Store, ontology_uri: str) -> dict[str, str]:
     1. Stored prefixes in the meta graph (from RDF source)
     2. Derived from metadata:prefixIRI annotations in the ontology
 
+    Results are cached per ontology until the store changes.
+
     Returns dict mapping namespace URI to prefix string.
     """
-    import urllib.parse
+    cached = _PREFIX_CACHE.get(ontology_uri)
+    if cached is not None and cached[0] == store.cache_token:
+        return cached[1]
 
     prefixes: dict[str, str] = {}
 
@@ -947,13 +1178,12 @@ def _get_ontology_prefixes(store: Store, ontology_uri: str) -> dict[str, str]:
     """
     stored_results = store.query(stored_query)
 
-    prefix_base = f"{AIT_NS}prefix/"
     for r in stored_results:
         pred = r.get("pred", "")
         namespace = r.get("namespace", "")
-        if pred and namespace and pred.startswith(prefix_base):
-            encoded_prefix = pred[len(prefix_base):]
-            prefix = urllib.parse.unquote(encoded_prefix)
+        if pred and namespace and pred.startswith(AIT_PREFIX_PRED_BASE):
+            encoded_prefix = pred.removeprefix(AIT_PREFIX_PRED_BASE)
+            prefix = unquote(encoded_prefix)
             prefixes[namespace] = prefix
 
     # 2. Derive prefixes from metadata:prefixIRI annotations
@@ -982,53 +1212,46 @@ def _get_ontology_prefixes(store: Store, ontology_uri: str) -> dict[str, str]:
                     if namespace and namespace not in prefixes:
                         prefixes[namespace] = prefix
 
+    _PREFIX_CACHE[ontology_uri] = (store.cache_token, prefixes)
     return prefixes
 
 
 def _get_ontology_config(store: Store, ontology_uri: str) -> OntologyConfig:
-    """Read ontology config from the meta graph."""
-    # Get selected namespaces
-    ns_query = f"""
-    SELECT ?namespace WHERE {{
-        GRAPH <{AIT_META_GRAPH}> {{
-            <{ontology_uri}> <{AIT_NS}selectedNamespace> ?namespace .
-        }}
-    }}
-    """
-    ns_results = store.query(ns_query)
-    namespaces = [r.get("namespace") for r in ns_results if r.get("namespace")]
+    """Read ontology config from the meta graph.
 
-    # Get display name mode
-    mode_query = f"""
-    SELECT ?mode WHERE {{
-        GRAPH <{AIT_META_GRAPH}> {{
-            <{ontology_uri}> <{AIT_NS}displayNameMode> ?mode .
-        }}
-    }}
+    All three settings come back from one query - a VALUES-constrained
+    predicate scan demultiplexed in Python - instead of three separate
+    SPARQL dispatches, and the parsed result is cached per ontology until
+    the store changes.
     """
-    mode_results = store.query(mode_query)
-    display_mode = mode_results[0].get("mode", "label") if mode_results else "label"
+    cached = _CONFIG_CACHE.get(ontology_uri)
+    if cached is not None and cached[0] == store.cache_token:
+        return cached[1]
 
-    # Get show_deprecated setting
-    deprecated_query = f"""
-    SELECT ?show WHERE {{
-        GRAPH <{AIT_META_GRAPH}> {{
-            <{ontology_uri}> <{AIT_NS}showDeprecated> ?show .
-        }}
-    }}
-    """
-    deprecated_results = store.query(deprecated_query)
+    config_query = _CONFIG_TPL.format(ontology_uri=ontology_uri)
+    namespaces: list[str] = []
+    display_mode = "label"
     show_deprecated = False
-    if deprecated_results:
-        val = deprecated_results[0].get("show", "false")
-        show_deprecated = str(val).lower() == "true"
-
-    return OntologyConfig(
+    for r in store.query(config_query):
+        predicate = r.get("p")
+        value = r.get("o")
+        if value is None:
+            continue
+        if predicate == AIT_SELECTED_NS_PRED:
+            namespaces.append(value)
+        elif predicate == AIT_DISPLAY_MODE_PRED:
+            display_mode = value
+        elif predicate == AIT_SHOW_DEPRECATED_PRED:
+            show_deprecated = str(value).lower() == "true"
+
+    config = OntologyConfig(
         ontology_uri=ontology_uri,
         selected_namespaces=namespaces,
         display_name_mode=display_mode,
         show_deprecated=show_deprecated
     )
+    _CONFIG_CACHE[ontology_uri] = (store.cache_token, config)
+    return config
 
 
 def _save_ontology_config(store: Store, ontology_uri: str, namespaces: list[str], display_name_mode: str = "label", show_deprecated: bool = False) -> None:
@@ -1103,6 +1326,45 @@ OWL_NAMED_INDIVIDUAL = "http://www.w3.org/2002/07/owl#NamedIndividual"
 OWL_ONE_OF = "http://www.w3.org/2002/07/owl#oneOf"
 OWL_EQUIVALENT_CLASS = "http://www.w3.org/2002/07/owl#equivalentClass"
 RDFS_CLASS = "http://www.w3.org/2000/01/rdf-schema#Class"
+
+# Well-known URIs to exclude from the tree (they're implicit roots or meta-classes)
+EXCLUDED_CLASSES = {
+    "http://www.w3.org/2002/07/owl#Thing",
+    "http://www.w3.org/2002/07/owl#Nothing",
+    "http://www.w3.org/2000/01/rdf-schema#Resource",
+    "http://www.w3.org/2000/01/rdf-schema#Class",
+    "http://www.w3.org/2002/07/owl#Class",
+}
+
+_EXCLUDED_CLASS_LIST = ", ".join(f"<{u}>" for u in sorted(EXCLUDED_CLASSES))
+
+_HIERARCHY_QUERY_TPL = f"""
+SELECT DISTINCT ?class ?label ?prefixIRI ?parent ?deprecated WHERE {{{{
+    GRAPH ?g {{{{
+        {{{{ ?class a <{OWL_CLASS}> . }}}}
+        UNION
+        {{{{ ?class a <{RDFS_CLASS}> . }}}}
+
+        OPTIONAL {{{{ ?class <http://www.w3.org/2000/01/rdf-schema#label> ?label }}}}
+        OPTIONAL {{{{ ?class <http://data.bioontology.org/metadata/prefixIRI> ?prefixIRI }}}}
+        OPTIONAL {{{{ ?class <http://www.w3.org/2002/07/owl#deprecated> ?deprecated }}}}
+        OPTIONAL {{{{
+            ?class <http://www.w3.org/2000/01/rdf-schema#subClassOf> ?parent .
+            FILTER(isIRI(?parent))
+            FILTER(?parent NOT IN ({_EXCLUDED_CLASS_LIST}))
+        }}}}
+        FILTER(?class NOT IN ({_EXCLUDED_CLASS_LIST}))
+        {{deprecated_filter}}
+    }}}}
+}}}}
+"""
+
+_HIERARCHY_QUERY = _HIERARCHY_QUERY_TPL.format(deprecated_filter="")
+# Variant used when the config hides deprecated classes: their rows are
+# pruned in the store instead of materialized and discarded in Python
+_HIERARCHY_QUERY_HIDE_DEPRECATED = _HIERARCHY_QUERY_TPL.format(
+    deprecated_filter='FILTER (!BOUND(?deprecated) || LCASE(STR(?deprecated)) != "true")'
+)
 SKOS_CONCEPT_SCHEME = "http://www.w3.org/2004/02/skos/core#ConceptScheme"
 SKOS_CONCEPT = "http://www.w3.org/2004/02/skos/core#Concept"
 SKOS_IN_SCHEME = "http://www.w3.org/2004/02/skos/core#inScheme"
@@ -1111,29 +1373,160 @@ SKOS_PREF_LABEL = "http://www.w3.org/2004/02/skos/core#prefLabel"
 RDF_FIRST = "http://www.w3.org/1999/02/22-rdf-syntax-ns#first"
 RDF_REST = "http://www.w3.org/1999/02/22-rdf-syntax-ns#rest"
 
+# Codelist query templates, built once at import; graph scoping goes
+# through Store.query(graph_name=...) so each template has at most the
+# entity URI as a hole (pyoxigraph has no prepared-query objects, so
+# stable query text is the closest we get to precompilation)
+_CODELIST_PROBE_TPL = f"""
+SELECT DISTINCT ?which WHERE {{{{
+    GRAPH ?g {{{{
+        {{{{ ?member <{SKOS_IN_SCHEME}> <{{entity}}> . BIND("skos_scheme" AS ?which) }}}}
+        UNION
+        {{{{ <{{entity}}> <{OWL_ONE_OF}>/<{RDF_REST}>*/<{RDF_FIRST}> ?member .
+           BIND("owl_oneof" AS ?which) }}}}
+        UNION
+        {{{{ <{{entity}}> <{OWL_EQUIVALENT_CLASS}>/<{OWL_ONE_OF}>/<{RDF_REST}>*/<{RDF_FIRST}> ?member .
+           BIND("owl_equivalent_oneof" AS ?which) }}}}
+        UNION
+        {{{{ <{{entity}}> <{SKOS_MEMBER}> ?member . BIND("skos_collection" AS ?which) }}}}
+    }}}}
+}}}}
+"""
+
+_CODELIST_SCHEME_MEMBERS_TPL = """
+SELECT DISTINCT ?member ?label ?notation ?description ?entityLabel WHERE {{
+    GRAPH ?g {{
+        OPTIONAL {{ <{entity}> <http://www.w3.org/2000/01/rdf-schema#label> ?entityLabel }}
+        ?member <http://www.w3.org/2004/02/skos/core#inScheme> <{entity}> .
+        OPTIONAL {{
+            {{ ?member <http://www.w3.org/2004/02/skos/core#prefLabel> ?label }}
+            UNION
+            {{
+                ?member <http://www.w3.org/2000/01/rdf-schema#label> ?label .
+                FILTER NOT EXISTS {{ ?member <http://www.w3.org/2004/02/skos/core#prefLabel> ?any }}
+            }}
+        }}
+        OPTIONAL {{ ?member <http://www.w3.org/2004/02/skos/core#notation> ?notation }}
+        OPTIONAL {{ ?member <http://www.w3.org/2004/02/skos/core#definition> ?description }}
+    }}
+}} LIMIT 500
+"""
+
+_CODELIST_COLLECTION_MEMBERS_TPL = """
+SELECT DISTINCT ?member ?label ?notation ?description ?entityLabel WHERE {{
+    GRAPH ?g {{
+        OPTIONAL {{ <{entity}> <http://www.w3.org/2000/01/rdf-schema#label> ?entityLabel }}
+        <{entity}> <http://www.w3.org/2004/02/skos/core#member> ?member .
+        OPTIONAL {{
+            {{ ?member <http://www.w3.org/2004/02/skos/core#prefLabel> ?label }}
+            UNION
+            {{
+                ?member <http://www.w3.org/2000/01/rdf-schema#label> ?label .
+                FILTER NOT EXISTS {{ ?member <http://www.w3.org/2004/02/skos/core#prefLabel> ?any }}
+            }}
+        }}
+        OPTIONAL {{ ?member <http://www.w3.org/2004/02/skos/core#notation> ?notation }}
+        OPTIONAL {{ ?member <http://www.w3.org/2004/02/skos/core#definition> ?description }}
+    }}
+}} LIMIT 500
+"""
+
+_CODELIST_ONEOF_MEMBERS_TPL = """
+SELECT DISTINCT ?member ?label ?entityLabel WHERE {{
+    GRAPH ?g {{
+        OPTIONAL {{ <{entity}> <http://www.w3.org/2000/01/rdf-schema#label> ?entityLabel }}
+        <{entity}> <http://www.w3.org/2002/07/owl#oneOf>/<http://www.w3.org/1999/02/22-rdf-syntax-ns#rest>*/<http://www.w3.org/1999/02/22-rdf-syntax-ns#first> ?member .
+        FILTER(isIRI(?member))
+        OPTIONAL {{ ?member <http://www.w3.org/2000/01/rdf-schema#label> ?label }}
+    }}
+}} LIMIT 500
+"""
+
+_CODELIST_EQUIV_ONEOF_MEMBERS_TPL = """
+SELECT DISTINCT ?member ?label ?entityLabel WHERE {{
+    GRAPH ?g {{
+        OPTIONAL {{ <{entity}> <http://www.w3.org/2000/01/rdf-schema#label> ?entityLabel }}
+        <{entity}> <http://www.w3.org/2002/07/owl#equivalentClass>/<http://www.w3.org/2002/07/owl#oneOf>/<http://www.w3.org/1999/02/22-rdf-syntax-ns#rest>*/<http://www.w3.org/1999/02/22-rdf-syntax-ns#first> ?member .
+        FILTER(isIRI(?member))
+        OPTIONAL {{ ?member <http://www.w3.org/2000/01/rdf-schema#label> ?label }}
+    }}
+}} LIMIT 500
+"""
+
+_CODELIST_SCHEMES_QUERY = f"""
+SELECT ?scheme ?label (COUNT(DISTINCT ?member) as ?count) (SAMPLE(?pIRI) AS ?prefixIRI) WHERE {{
+    GRAPH ?g {{
+        ?member <{SKOS_IN_SCHEME}> ?scheme .
+        OPTIONAL {{ ?scheme <http://www.w3.org/2000/01/rdf-schema#label> ?label }}
+        OPTIONAL {{ ?scheme <http://data.bioontology.org/metadata/prefixIRI> ?pIRI }}
+    }}
+}} GROUP BY ?scheme ?label
+"""
+
+_CODELIST_HAS_SKOS_ASK = f"""
+ASK {{
+    GRAPH ?g {{
+        {{ ?x <{SKOS_IN_SCHEME}> ?y }}
+        UNION
+        {{ ?x <{SKOS_MEMBER}> ?y }}
+    }}
+}}
+"""
+
+_CODELIST_COLLECTIONS_QUERY = f"""
+SELECT ?collection ?label (COUNT(DISTINCT ?member) as ?count) (SAMPLE(?pIRI) AS ?prefixIRI) WHERE {{
+    GRAPH ?g {{
+        ?collection <{SKOS_MEMBER}> ?member .
+        OPTIONAL {{ ?collection <http://www.w3.org/2000/01/rdf-schema#label> ?label }}
+        OPTIONAL {{ ?collection <http://data.bioontology.org/metadata/prefixIRI> ?pIRI }}
+    }}
+}} GROUP BY ?collection ?label
+"""
+
+
+def _split_namespace(uri: str) -> tuple[str, str]:
+    """Split a URI into (namespace, local name) at the last # or /."""
+    idx = max(uri.rfind("#"), uri.rfind("/"))
+    return (uri[:idx + 1], uri[idx + 1:]) if idx >= 0 else ("", uri)
 
+
+@lru_cache(maxsize=4096)
 def _extract_local_name(uri: str) -> str:
-    """Extract local name from URI."""
-    hash_idx = uri.rfind("#")
-    slash_idx = uri.rfind("/")
-    idx = max(hash_idx, slash_idx)
-    return uri[idx + 1:] if idx >= 0 else uri
+    """Extract local name from URI.
+
+    Cached: the same handful of well-known and ontology-local URIs come
+    through thousands of times per page render.
+    """
+    return _split_namespace(uri)[1]
 
 
-def _resolve_blank_node_range(store: Store, graph_uri: str, property_uri: str) -> list[dict[str, str]]:
+def _resolve_blank_node_ranges(
+    store: Store, graph_uri: str, property_uris: list[str]
+) -> dict[str, list[dict[str, str]]]:
     """Resolve blank node ranges that contain owl:oneOf restrictions.
 
-    Returns a list of {uri, label} dicts for the actual values in the oneOf list.
+    Handles all properties in one VALUES-batched query rather than one
+    dispatch per property. Returns {property_uri: [{uri, label}, ...]}
+    for the actual values in each oneOf list; properties without oneOf
+    ranges are absent from the result.
     """
-    # Query for owl:oneOf first element (most restrictions have a single value)
+    if not property_uris:
+        return {}
+
+    # Query for owl:oneOf first element (most restrictions have a single
+    # value). This is a plain BGP - no property path - so the store walks
+    # its direct triple indices; DISTINCT collapses duplicate rows when a
+    # property declares the same restriction more than once.
+    values = " ".join(f"<{p}>" for p in property_uris)
     query = f"""
     PREFIX owl: <http://www.w3.org/2002/07/owl#>
     PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
     PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
 
-    SELECT ?member ?memberLabel WHERE {{
+    SELECT DISTINCT ?prop ?member ?memberLabel WHERE {{
         GRAPH <{graph_uri}> {{
-            <{property_uri}> rdfs:range ?range .
+            VALUES ?prop {{ {values} }}
+            ?prop rdfs:range ?range .
             ?range owl:oneOf ?list .
             ?list rdf:first ?member .
             FILTER(!isBlank(?member))
@@ -1141,20 +1534,42 @@ def _resolve_blank_node_range(store: Store, graph_uri: str, property_uri: str) -
         }}
     }}
     """
-    results = store.query(query)
-
-    resolved = []
-    for r in results:
+    resolved: dict[str, list[dict[str, str]]] = {}
+    for r in store.query(query):
+        prop_uri = r.get("prop")
         member_uri = r.get("member")
-        if member_uri:
-            resolved.append({
+        if prop_uri and member_uri:
+            resolved.setdefault(prop_uri, []).append({
                 "uri": member_uri,
                 "label": r.get("memberLabel") or _extract_local_name(member_uri)
             })
     return resolved
 
 
+# Entity-type cache, version-validated like the prefix/config caches; the
+# size guard keeps it from growing without bound across large ontologies
+_ENTITY_TYPE_CACHE: dict[tuple[str, str], tuple[tuple[int, int], str]] = {}
+
+
 def _detect_entity_type(store: Store, graph_uri: str, entity_uri: str) -> str:
+    """Detect the OWL/SKOS type of an entity.
+
+    Results are cached per (graph, entity) until the store changes, so
+    handlers touching the same entity repeatedly skip the type query.
+    """
+    key = (graph_uri, entity_uri)
+    cached = _ENTITY_TYPE_CACHE.get(key)
+    if cached is not None and cached[0] == store.cache_token:
+        return cached[1]
+
+    entity_type = _detect_entity_type_uncached(store, graph_uri, entity_uri)
+    if len(_ENTITY_TYPE_CACHE) >= 4096:
+        _ENTITY_TYPE_CACHE.clear()
+    _ENTITY_TYPE_CACHE[key] = (store.cache_token, entity_type)
+    return entity_type
+
+
+def _detect_entity_type_uncached(store: Store, graph_uri: str, entity_uri: str) -> str:
     """Detect the OWL/SKOS type of an entity."""
     type_query = f"""
     SELECT ?type WHERE {{
@@ -1187,65 +1602,18 @@ def _detect_entity_type(store: Store, graph_uri: str, entity_uri: str) -> str:
 
 
 def _detect_codelist_pattern(store: Store, graph_uri: str, entity_uri: str) -> str | None:
-    """Detect if an entity is a code list and which pattern it uses."""
-    # Check for SKOS ConceptScheme
-    skos_check = f"""
-    ASK {{
-        GRAPH <{graph_uri}> {{
-            {{ <{entity_uri}> a <{SKOS_CONCEPT_SCHEME}> }}
-            UNION
-            {{ <{entity_uri}> a ?subtype . ?subtype <http://www.w3.org/2000/01/rdf-schema#subClassOf>+ <{SKOS_CONCEPT_SCHEME}> }}
-        }}
-    }}
-    """
-    # We can't do ASK easily, so check for members instead
-    skos_members = f"""
-    SELECT (COUNT(?member) as ?count) WHERE {{
-        GRAPH <{graph_uri}> {{
-            ?member <{SKOS_IN_SCHEME}> <{entity_uri}> .
-        }}
-    }}
-    """
-    skos_result = store.query(skos_members)
-    if skos_result and int(skos_result[0].get("count", 0)) > 0:
-        return "skos_scheme"
-
-    # Check for owl:oneOf directly on class
-    oneof_check = f"""
-    SELECT (COUNT(?member) as ?count) WHERE {{
-        GRAPH <{graph_uri}> {{
-            <{entity_uri}> <{OWL_ONE_OF}>/<{RDF_REST}>*/<{RDF_FIRST}> ?member .
-        }}
-    }}
-    """
-    oneof_result = store.query(oneof_check)
-    if oneof_result and int(oneof_result[0].get("count", 0)) > 0:
-        return "owl_oneof"
+    """Detect if an entity is a code list and which pattern it uses.
 
-    # Check for owl:equivalentClass with owl:oneOf
-    equiv_oneof_check = f"""
-    SELECT (COUNT(?member) as ?count) WHERE {{
-        GRAPH <{graph_uri}> {{
-            <{entity_uri}> <{OWL_EQUIVALENT_CLASS}>/<{OWL_ONE_OF}>/<{RDF_REST}>*/<{RDF_FIRST}> ?member .
-        }}
-    }}
+    One UNION query probes all four patterns in a single dispatch; each
+    branch binds a marker so the matches come back as a set, and priority
+    between patterns is applied in Python (UNION branch order carries no
+    ordering guarantee).
     """
-    equiv_result = store.query(equiv_oneof_check)
-    if equiv_result and int(equiv_result[0].get("count", 0)) > 0:
-        return "owl_equivalent_oneof"
-
-    # Check for skos:member (for skos:Collection)
-    collection_check = f"""
-    SELECT (COUNT(?member) as ?count) WHERE {{
-        GRAPH <{graph_uri}> {{
-            <{entity_uri}> <{SKOS_MEMBER}> ?member .
-        }}
-    }}
-    """
-    collection_result = store.query(collection_check)
-    if collection_result and int(collection_result[0].get("count", 0)) > 0:
-        return "skos_collection"
-
+    probe_query = _CODELIST_PROBE_TPL.format(entity=entity_uri)
+    matched = {r.get("which") for r in store.query(probe_query, graph_name=graph_uri)}
+    for pattern in ("skos_scheme", "owl_oneof", "owl_equivalent_oneof", "skos_collection"):
+        if pattern in matched:
+            return pattern
     return None
 
 
@@ -1253,101 +1621,100 @@ def _detect_codelist_pattern(store: Store, graph_uri: str, entity_uri: str) -> s
 async def get_entity_info(ontology: str, entity: str) -> EntityInfo:
     """Get detailed information about an OWL entity."""
     store = get_store()
+    ontology = _safe_iri(ontology)
+    entity = _safe_iri(entity)
 
     # Detect entity type
-    entity_type = _detect_entity_type(store, ontology, entity)
+    entity_type = await asyncio.to_thread(_detect_entity_type, store, ontology, entity)
 
-    # Get basic info
-    info_query = f"""
-    SELECT ?label ?comment ?isDefinedBy ?prefixIRI WHERE {{
+    # Basic info, rdf:types, and direct subclasses all come back from one
+    # UNION query with a role marker per branch, demultiplexed in a single
+    # Python pass - one SPARQL dispatch instead of three
+    combined_query = f"""
+    SELECT DISTINCT ?role ?x ?xLabel ?xPrefixIRI WHERE {{
         GRAPH <{ontology}> {{
-            OPTIONAL {{ <{entity}> <http://www.w3.org/2000/01/rdf-schema#label> ?label }}
-            OPTIONAL {{ <{entity}> <http://www.w3.org/2000/01/rdf-schema#comment> ?comment }}
-            OPTIONAL {{ <{entity}> <http://www.w3.org/2000/01/rdf-schema#isDefinedBy> ?isDefinedBy }}
-            OPTIONAL {{ <{entity}> <http://data.bioontology.org/metadata/prefixIRI> ?prefixIRI }}
+            {{ <{entity}> <http://www.w3.org/2000/01/rdf-schema#label> ?x .
+               BIND("label" AS ?role) }}
+            UNION
+            {{ <{entity}> <http://www.w3.org/2000/01/rdf-schema#comment> ?x .
+               BIND("comment" AS ?role) }}
+            UNION
+            {{ <{entity}> <http://www.w3.org/2000/01/rdf-schema#isDefinedBy> ?x .
+               BIND("definedBy" AS ?role) }}
+            UNION
+            {{ <{entity}> <http://data.bioontology.org/metadata/prefixIRI> ?x .
+               BIND("prefix" AS ?role) }}
+            UNION
+            {{ <{entity}> a ?x .
+               FILTER(isIRI(?x))
+               BIND("type" AS ?role)
+               OPTIONAL {{ ?x <http://www.w3.org/2000/01/rdf-schema#label> ?xLabel }}
+               OPTIONAL {{ ?x <http://data.bioontology.org/metadata/prefixIRI> ?xPrefixIRI }} }}
+            UNION
+            {{ ?x <http://www.w3.org/2000/01/rdf-schema#subClassOf> <{entity}> .
+               FILTER(isIRI(?x))
+               BIND("sub" AS ?role)
+               OPTIONAL {{ ?x <http://www.w3.org/2000/01/rdf-schema#label> ?xLabel }}
+               OPTIONAL {{ ?x <http://data.bioontology.org/metadata/prefixIRI> ?xPrefixIRI }} }}
         }}
-    }} LIMIT 1
+    }}
     """
-    info_results = store.query(info_query)
-    info = info_results[0] if info_results else {}
-
-    # Get superclass chain for breadcrumb (for Classes)
-    superclasses: list[EntityRef] = []
+    # The combined query and the superclass walk are independent: run both
+    # in worker threads concurrently (pyoxigraph reads are thread-safe)
     if entity_type == "Class":
-        # Walk up the superclass chain
-        visited = {entity}
-        current = entity
-        for _ in range(20):  # Max depth to prevent infinite loops
-            parent_query = f"""
-            SELECT ?parent ?parentLabel ?parentPrefixIRI WHERE {{
-                GRAPH <{ontology}> {{
-                    <{current}> <http://www.w3.org/2000/01/rdf-schema#subClassOf> ?parent .
-                    FILTER(isIRI(?parent))
-                    OPTIONAL {{ ?parent <http://www.w3.org/2000/01/rdf-schema#label> ?parentLabel }}
-                    OPTIONAL {{ ?parent <http://data.bioontology.org/metadata/prefixIRI> ?parentPrefixIRI }}
-                }}
-            }} LIMIT 1
-            """
-            parent_results = store.query(parent_query)
-            if not parent_results:
-                break
-            parent_uri = parent_results[0].get("parent")
-            if not parent_uri or parent_uri in visited:
-                break
-            visited.add(parent_uri)
-            superclasses.append(EntityRef(
-                uri=parent_uri,
-                label=parent_results[0].get("parentLabel") or _extract_local_name(parent_uri),
-                prefix_iri=parent_results[0].get("parentPrefixIRI")
-            ))
-            current = parent_uri
-
-    # Get direct subclasses
-    subclasses: list[EntityRef] = []
-    if entity_type == "Class":
-        subclass_query = f"""
-        SELECT DISTINCT ?sub ?subLabel ?subPrefixIRI WHERE {{
-            GRAPH <{ontology}> {{
-                ?sub <http://www.w3.org/2000/01/rdf-schema#subClassOf> <{entity}> .
-                FILTER(isIRI(?sub))
-                OPTIONAL {{ ?sub <http://www.w3.org/2000/01/rdf-schema#label> ?subLabel }}
-                OPTIONAL {{ ?sub <http://data.bioontology.org/metadata/prefixIRI> ?subPrefixIRI }}
-            }}
-        }} LIMIT 50
-        """
-        sub_results = store.query(subclass_query)
-        for r in sub_results:
-            sub_uri = r.get("sub")
-            if sub_uri:
-                subclasses.append(EntityRef(
-                    uri=sub_uri,
-                    label=r.get("subLabel") or _extract_local_name(sub_uri),
-                    prefix_iri=r.get("subPrefixIRI")
-                ))
+        combined_results, chain = await asyncio.gather(
+            asyncio.to_thread(store.query, combined_query),
+            asyncio.to_thread(_walk_superclass_chain, store, ontology, entity, 20),
+        )
+    else:
+        combined_results = await asyncio.to_thread(store.query, combined_query)
+        chain = []
 
-    # Get all rdf:types for this entity
+    info: dict[str, str] = {}
     all_types: list[EntityRef] = []
-    types_query = f"""
-    SELECT DISTINCT ?type ?typeLabel ?typePrefixIRI WHERE {{
-        GRAPH <{ontology}> {{
-            <{entity}> a ?type .
-            FILTER(isIRI(?type))
-            OPTIONAL {{ ?type <http://www.w3.org/2000/01/rdf-schema#label> ?typeLabel }}
-            OPTIONAL {{ ?type <http://data.bioontology.org/metadata/prefixIRI> ?typePrefixIRI }}
-        }}
-    }}
-    """
-    types_results = store.query(types_query)
-    for r in types_results:
-        type_uri = r.get("type")
-        if type_uri:
-            all_types.append(EntityRef(
-                uri=type_uri,
-                label=r.get("typeLabel") or _extract_local_name(type_uri),
-                prefix_iri=r.get("typePrefixIRI")
+    subclasses: list[EntityRef] = []
+    seen_types: set[str] = set()
+    seen_subs: set[str] = set()
+    for r in combined_results:
+        role = r.get("role")
+        x = r.get("x")
+        if not x:
+            continue
+        if role == "label":
+            info.setdefault("label", x)
+        elif role == "comment":
+            info.setdefault("comment", x)
+        elif role == "definedBy":
+            info.setdefault("isDefinedBy", x)
+        elif role == "prefix":
+            info.setdefault("prefixIRI", x)
+        elif role == "type" and x not in seen_types:
+            seen_types.add(x)
+            all_types.append(EntityRef.model_construct(
+                uri=x,
+                label=r.get("xLabel") or _extract_local_name(x),
+                prefix_iri=r.get("xPrefixIRI")
+            ))
+        elif role == "sub" and entity_type == "Class" and x not in seen_subs:
+            seen_subs.add(x)
+            subclasses.append(EntityRef.model_construct(
+                uri=x,
+                label=r.get("xLabel") or _extract_local_name(x),
+                prefix_iri=r.get("xPrefixIRI")
             ))
+
+    # Superclass chain for breadcrumb (for Classes)
+    superclasses: list[EntityRef] = []
+    for ancestor in chain:
+        superclasses.append(EntityRef.model_construct(
+            uri=ancestor["uri"],
+            label=ancestor["label"],
+            prefix_iri=ancestor.get("prefix_iri")
+        ))
+
     # Sort by label
     all_types = sorted(all_types, key=lambda x: x.label)
+    subclasses = sorted(subclasses, key=lambda x: x.label)[:50]
 
     return EntityInfo(
         uri=entity,
@@ -1358,140 +1725,203 @@ async def get_entity_info(ontology: str, entity: str) -> EntityInfo:
         all_types=all_types,
         is_defined_by=info.get("isDefinedBy"),
         superclasses=superclasses,
-        subclasses=sorted(subclasses, key=lambda x: x.label)
+        subclasses=subclasses
     )
 
 
+def _parse_concat_pairs(cell: str | None) -> list[dict[str, str]]:
+    """Parse a GROUP_CONCAT cell of unit-separator-joined (uri, label) pairs.
+
+    Pairs are tab-separated; within a pair the URI and label are joined
+    with \x1f, characters that cannot occur in IRIs. Empty labels fall
+    back to the local name.
+    """
+    pairs: list[dict[str, str]] = []
+    if not cell:
+        return pairs
+    seen: set[str] = set()
+    for token in cell.split("\t"):
+        uri, _, label = token.partition("\x1f")
+        if not uri or uri in seen:
+            continue
+        seen.add(uri)
+        pairs.append({"uri": uri, "label": label or _extract_local_name(uri)})
+    return pairs
+
+
 def _get_properties_for_class(store: Store, ontology: str, class_uri: str) -> dict[str, PropertyInfo]:
     """Get properties where the given class is the domain."""
+    # Aggregate ranges inside the engine: one row per property with its
+    # IRI ranges GROUP_CONCATed, instead of a (prop, range) row explosion
+    # deduped in Python
     domain_query = f"""
-    SELECT DISTINCT ?prop ?propLabel ?propType ?range ?rangeLabel WHERE {{
+    SELECT ?prop ?propLabel ?propType
+           (GROUP_CONCAT(DISTINCT CONCAT(STR(?range), "\\u001F", COALESCE(?rangeLabel, "")); separator="\\t") AS ?ranges)
+    WHERE {{
         GRAPH <{ontology}> {{
             ?prop <http://www.w3.org/2000/01/rdf-schema#domain> <{class_uri}> .
             OPTIONAL {{ ?prop <http://www.w3.org/2000/01/rdf-schema#label> ?propLabel }}
             OPTIONAL {{ ?prop a ?propType . FILTER(?propType IN (<{OWL_OBJECT_PROPERTY}>, <{OWL_DATATYPE_PROPERTY}>, <{OWL_ANNOTATION_PROPERTY}>)) }}
             OPTIONAL {{
                 ?prop <http://www.w3.org/2000/01/rdf-schema#range> ?range .
+                FILTER(isIRI(?range))
                 OPTIONAL {{ ?range <http://www.w3.org/2000/01/rdf-schema#label> ?rangeLabel }}
             }}
         }}
-    }}
+    }} GROUP BY ?prop ?propLabel ?propType
     """
     domain_results = store.query(domain_query)
 
     props: dict[str, PropertyInfo] = {}
     for r in domain_results:
         prop_uri = r.get("prop")
-        if not prop_uri:
+        if not prop_uri or prop_uri in props:
             continue
-        if prop_uri not in props:
-            prop_type_uri = r.get("propType", "")
-            prop_type = "ObjectProperty"
-            if OWL_DATATYPE_PROPERTY in prop_type_uri:
-                prop_type = "DatatypeProperty"
-            elif OWL_ANNOTATION_PROPERTY in prop_type_uri:
-                prop_type = "AnnotationProperty"
-
-            props[prop_uri] = PropertyInfo(
-                uri=prop_uri,
-                label=r.get("propLabel") or _extract_local_name(prop_uri),
-                property_type=prop_type,
-                domains=[{"uri": class_uri, "label": _extract_local_name(class_uri)}],
-                ranges=[]
-            )
-        range_uri = r.get("range")
-        if range_uri and not range_uri.startswith("_:"):
-            existing_ranges = [rg["uri"] for rg in props[prop_uri].ranges]
-            if range_uri not in existing_ranges:
-                props[prop_uri].ranges.append({
-                    "uri": range_uri,
-                    "label": r.get("rangeLabel") or _extract_local_name(range_uri)
-                })
-
-    # Resolve blank node ranges (e.g., owl:oneOf restrictions)
-    for prop_uri, prop_info in props.items():
-        if not prop_info.ranges:
-            resolved = _resolve_blank_node_range(store, ontology, prop_uri)
-            if resolved:
-                prop_info.ranges.extend(resolved)
+        prop_type_uri = r.get("propType", "")
+        prop_type = "ObjectProperty"
+        if OWL_DATATYPE_PROPERTY in prop_type_uri:
+            prop_type = "DatatypeProperty"
+        elif OWL_ANNOTATION_PROPERTY in prop_type_uri:
+            prop_type = "AnnotationProperty"
+
+        props[prop_uri] = PropertyInfo.model_construct(
+            uri=prop_uri,
+            label=r.get("propLabel") or _extract_local_name(prop_uri),
+            property_type=prop_type,
+            domains=[{"uri": class_uri, "label": _extract_local_name(class_uri)}],
+            ranges=_parse_concat_pairs(r.get("ranges"))
+        )
+
+    # Resolve blank node ranges (e.g., owl:oneOf restrictions) for all
+    # rangeless properties in a single batched query
+    needs_resolving = [p for p, info in props.items() if not info.ranges]
+    resolved_by_prop = _resolve_blank_node_ranges(store, ontology, needs_resolving)
+    for prop_uri, resolved in resolved_by_prop.items():
+        props[prop_uri].ranges.extend(resolved)
 
     return props
 
 
-def _get_superclass_chain(store: Store, ontology: str, class_uri: str) -> list[dict[str, str]]:
-    """Get all superclasses in order from immediate parent to root."""
-    superclasses: list[dict[str, str]] = []
+def _walk_superclass_chain(
+    store: Store,
+    ontology: str,
+    class_uri: str,
+    max_depth: int,
+    excluded: set[str] | frozenset[str] = frozenset(),
+) -> list[dict[str, str]]:
+    """Walk from a class to the root, one superclass per level.
+
+    Fetches every subClassOf edge reachable from the class in a single
+    property-path query, then follows the chain in Python - one SPARQL
+    dispatch regardless of hierarchy depth, instead of one LIMIT 1 query
+    per level. Where a class has several parents, the first edge returned
+    wins, matching the old LIMIT 1 behavior.
+    """
+    edge_query = _SUPERCLASS_EDGES_TPL.format(class_uri=class_uri)
+    first_edge: dict[str, dict[str, str]] = {}
+    for row in store.query(edge_query, graph_name=ontology):
+        child = row.get("child")
+        if child and child not in first_edge:
+            first_edge[child] = row
+
+    chain: list[dict[str, str]] = []
     visited = {class_uri}
     current = class_uri
-
-    for _ in range(50):  # Max depth to prevent infinite loops
-        parent_query = f"""
-        SELECT ?parent ?parentLabel WHERE {{
-            GRAPH <{ontology}> {{
-                <{current}> <http://www.w3.org/2000/01/rdf-schema#subClassOf> ?parent .
-                FILTER(isIRI(?parent))
-                OPTIONAL {{ ?parent <http://www.w3.org/2000/01/rdf-schema#label> ?parentLabel }}
-            }}
-        }} LIMIT 1
-        """
-        parent_results = store.query(parent_query)
-        if not parent_results:
+    for _ in range(max_depth):
+        row = first_edge.get(current)
+        if not row:
             break
-        parent_uri = parent_results[0].get("parent")
-        if not parent_uri or parent_uri in visited:
-            break
-        if parent_uri in EXCLUDED_CLASSES:
+        parent_uri = row.get("parent")
+        if not parent_uri or parent_uri in visited or parent_uri in excluded:
             break
         visited.add(parent_uri)
-        superclasses.append({
+        ancestor = {
             "uri": parent_uri,
-            "label": parent_results[0].get("parentLabel") or _extract_local_name(parent_uri)
-        })
+            "label": row.get("parentLabel") or _extract_local_name(parent_uri),
+        }
+        # Only set when present: downstream models expect the key absent,
+        # not None
+        prefix_iri = row.get("parentPrefixIRI")
+        if prefix_iri:
+            ancestor["prefix_iri"] = prefix_iri
+        chain.append(ancestor)
         current = parent_uri
 
-    return superclasses
+    return chain
+
+
+# Superclass chains are stable until the store changes; version-validated
+# like the prefix/config/entity-type caches, with the same size guard
+_SUPERCLASS_CACHE: dict[tuple[str, str], tuple[tuple[int, int], list[dict[str, str]]]] = {}
+
+
+def _get_superclass_chain(store: Store, ontology: str, class_uri: str) -> list[dict[str, str]]:
+    """Get all superclasses in order from immediate parent to root."""
+    key = (ontology, class_uri)
+    cached = _SUPERCLASS_CACHE.get(key)
+    if cached is not None and cached[0] == store.cache_token:
+        return list(cached[1])
+
+    chain = _walk_superclass_chain(
+        store, ontology, class_uri, max_depth=50, excluded=EXCLUDED_CLASSES
+    )
+    if len(_SUPERCLASS_CACHE) >= 4096:
+        _SUPERCLASS_CACHE.clear()
+    _SUPERCLASS_CACHE[key] = (store.cache_token, chain)
+    return list(chain)
 
 
 @app.get("/api/class-properties", response_model=ClassProperties)
-async def get_class_properties(ontology: str, class_uri: str) -> ClassProperties:
+async def get_class_properties(ontology: str, class_uri: str) -> Response:
     """Get properties associated with a class (as domain or range).
 
     Includes inherited properties from all superclasses in the hierarchy.
     """
     store = get_store()
 
-    # Get direct properties for this class
-    domain_props = _get_properties_for_class(store, ontology, class_uri)
+    # Direct properties and the superclass chain are independent - run
+    # both off the event loop and in parallel
+    domain_props, superclasses = await asyncio.gather(
+        asyncio.to_thread(_get_properties_for_class, store, ontology, class_uri),
+        asyncio.to_thread(_get_superclass_chain, store, ontology, class_uri),
+    )
 
-    # Get inherited properties from superclass chain
-    superclasses = _get_superclass_chain(store, ontology, class_uri)
+    # Inherited properties: one lookup per ancestor, also in parallel
+    ancestor_props_list = await asyncio.gather(*(
+        asyncio.to_thread(_get_properties_for_class, store, ontology, ancestor["uri"])
+        for ancestor in superclasses
+    ))
     inherited_groups: list[InheritedPropertyGroup] = []
     seen_prop_uris = set(domain_props.keys())  # Don't duplicate props already on this class
 
-    for ancestor in superclasses:
-        ancestor_props = _get_properties_for_class(store, ontology, ancestor["uri"])
+    for ancestor, ancestor_props in zip(superclasses, ancestor_props_list):
         # Filter out properties we've already seen
         new_props = {uri: prop for uri, prop in ancestor_props.items() if uri not in seen_prop_uris}
         if new_props:
-            inherited_groups.append(InheritedPropertyGroup(
+            inherited_groups.append(InheritedPropertyGroup.model_construct(
                 from_class=ancestor,
                 properties=sorted(new_props.values(), key=lambda x: x.label or "")
             ))
             seen_prop_uris.update(new_props.keys())
 
     # Properties where this class is the range (these properties POINT TO this class)
+    # Same engine-side aggregation as _get_properties_for_class: one row
+    # per property with its domains GROUP_CONCATed
     range_query = f"""
-    SELECT DISTINCT ?prop ?propLabel ?propType ?domain ?domainLabel WHERE {{
+    SELECT ?prop ?propLabel ?propType
+           (GROUP_CONCAT(DISTINCT CONCAT(STR(?domain), "\\u001F", COALESCE(?domainLabel, "")); separator="\\t") AS ?domains)
+    WHERE {{
         GRAPH <{ontology}> {{
             ?prop <http://www.w3.org/2000/01/rdf-schema#range> <{class_uri}> .
             OPTIONAL {{ ?prop <http://www.w3.org/2000/01/rdf-schema#label> ?propLabel }}
             OPTIONAL {{ ?prop a ?propType . FILTER(?propType IN (<{OWL_OBJECT_PROPERTY}>, <{OWL_DATATYPE_PROPERTY}>, <{OWL_ANNOTATION_PROPERTY}>)) }}
             OPTIONAL {{
                 ?prop <http://www.w3.org/2000/01/rdf-schema#domain> ?domain .
+                FILTER(isIRI(?domain))
                 OPTIONAL {{ ?domain <http://www.w3.org/2000/01/rdf-schema#label> ?domainLabel }}
             }}
         }}
-    }}
+    }} GROUP BY ?prop ?propLabel ?propType
     """
     range_results = store.query(range_query)
 
@@ -1499,37 +1929,31 @@ async def get_class_properties(ontology: str, class_uri: str) -> ClassProperties
     range_props: dict[str, PropertyInfo] = {}
     for r in range_results:
         prop_uri = r.get("prop")
-        if not prop_uri:
+        if not prop_uri or prop_uri in range_props:
             continue
-        if prop_uri not in range_props:
-            prop_type_uri = r.get("propType", "")
-            prop_type = "ObjectProperty"
-            if OWL_DATATYPE_PROPERTY in prop_type_uri:
-                prop_type = "DatatypeProperty"
-            elif OWL_ANNOTATION_PROPERTY in prop_type_uri:
-                prop_type = "AnnotationProperty"
-
-            range_props[prop_uri] = PropertyInfo(
-                uri=prop_uri,
-                label=r.get("propLabel") or _extract_local_name(prop_uri),
-                property_type=prop_type,
-                domains=[],
-                ranges=[{"uri": class_uri, "label": _extract_local_name(class_uri)}]
-            )
-        domain_uri = r.get("domain")
-        if domain_uri and not domain_uri.startswith("_:"):
-            existing_domains = [d["uri"] for d in range_props[prop_uri].domains]
-            if domain_uri not in existing_domains:
-                range_props[prop_uri].domains.append({
-                    "uri": domain_uri,
-                    "label": r.get("domainLabel") or _extract_local_name(domain_uri)
-                })
-
-    return ClassProperties(
+        prop_type_uri = r.get("propType", "")
+        prop_type = "ObjectProperty"
+        if OWL_DATATYPE_PROPERTY in prop_type_uri:
+            prop_type = "DatatypeProperty"
+        elif OWL_ANNOTATION_PROPERTY in prop_type_uri:
+            prop_type = "AnnotationProperty"
+
+        range_props[prop_uri] = PropertyInfo.model_construct(
+            uri=prop_uri,
+            label=r.get("propLabel") or _extract_local_name(prop_uri),
+            property_type=prop_type,
+            domains=_parse_concat_pairs(r.get("domains")),
+            ranges=[{"uri": class_uri, "label": _extract_local_name(class_uri)}]
+        )
+
+    result = ClassProperties(
         domain_of=sorted(domain_props.values(), key=lambda x: x.label or ""),
         inherited=inherited_groups,
         range_of=sorted(range_props.values(), key=lambda x: x.label or "")
     )
+    # Serialize once in pydantic-core and skip FastAPI's response
+    # re-validation pass, which doubles the cost on large property sets
+    return Response(content=result.model_dump_json(), media_type="application/json")
 
 
 @app.get("/api/property", response_model=PropertyInfo)
@@ -1593,102 +2017,65 @@ async def get_property_info(ontology: str, property: str) -> PropertyInfo:
     )
 
 
-@app.get("/api/codelist", response_model=CodeListInfo | None)
-async def get_codelist_info(ontology: str, entity: str) -> CodeListInfo | None:
-    """Get code list members if the entity is a code list/enumeration."""
-    store = get_store()
+def _build_codelist_info(store: Store, ontology: str, entity: str) -> CodeListInfo | None:
+    """Detect the code-list pattern and fetch its members.
 
+    Runs the pattern probe and the member query back to back; callers
+    dispatch the whole flow to one worker thread rather than paying an
+    executor hop per query.
+    """
     # Detect which pattern this entity uses
     pattern = _detect_codelist_pattern(store, ontology, entity)
     if not pattern:
         return None
 
-    # Get entity label
-    label_query = f"""
-    SELECT ?label WHERE {{
-        GRAPH <{ontology}> {{
-            <{entity}> <http://www.w3.org/2000/01/rdf-schema#label> ?label .
-        }}
-    }} LIMIT 1
-    """
-    label_result = store.query(label_query)
-    entity_label = label_result[0].get("label") if label_result else None
-
+    # The entity label rides along on each member row as an OPTIONAL
+    # binding, saving a separate label query per call
+    entity_label: str | None = None
     members: list[CodeListMember] = []
 
     if pattern == "skos_scheme":
         # Get members via skos:inScheme
-        members_query = f"""
-        SELECT DISTINCT ?member ?label ?notation ?description WHERE {{
-            GRAPH <{ontology}> {{
-                ?member <{SKOS_IN_SCHEME}> <{entity}> .
-                OPTIONAL {{
-                    ?member <{SKOS_PREF_LABEL}> ?label .
-                }}
-                OPTIONAL {{
-                    ?member <http://www.w3.org/2000/01/rdf-schema#label> ?rdfsLabel .
-                }}
-                OPTIONAL {{
-                    ?member <http://www.w3.org/2004/02/skos/core#notation> ?notation .
-                }}
-                OPTIONAL {{
-                    ?member <http://www.w3.org/2004/02/skos/core#definition> ?description .
-                }}
-                BIND(COALESCE(?label, ?rdfsLabel) AS ?finalLabel)
-            }}
-        }} ORDER BY ?notation ?label LIMIT 500
-        """
-        results = store.query(members_query)
+        members_query = _CODELIST_SCHEME_MEMBERS_TPL.format(entity=entity)
+        results = store.query(members_query, graph_name=ontology)
         for r in results:
+            if entity_label is None:
+                entity_label = r.get("entityLabel")
             member_uri = r.get("member")
             if member_uri:
-                members.append(CodeListMember(
+                members.append(CodeListMember.model_construct(
                     uri=member_uri,
-                    label=r.get("label") or r.get("rdfsLabel") or _extract_local_name(member_uri),
+                    label=r.get("label") or _extract_local_name(member_uri),
                     notation=r.get("notation"),
                     description=r.get("description")
                 ))
 
     elif pattern == "skos_collection":
         # Get members via skos:member
-        members_query = f"""
-        SELECT DISTINCT ?member ?label ?notation ?description WHERE {{
-            GRAPH <{ontology}> {{
-                <{entity}> <{SKOS_MEMBER}> ?member .
-                OPTIONAL {{ ?member <{SKOS_PREF_LABEL}> ?label }}
-                OPTIONAL {{ ?member <http://www.w3.org/2000/01/rdf-schema#label> ?rdfsLabel }}
-                OPTIONAL {{ ?member <http://www.w3.org/2004/02/skos/core#notation> ?notation }}
-                OPTIONAL {{ ?member <http://www.w3.org/2004/02/skos/core#definition> ?description }}
-            }}
-        }} ORDER BY ?notation ?label LIMIT 500
-        """
-        results = store.query(members_query)
+        members_query = _CODELIST_COLLECTION_MEMBERS_TPL.format(entity=entity)
+        results = store.query(members_query, graph_name=ontology)
         for r in results:
+            if entity_label is None:
+                entity_label = r.get("entityLabel")
             member_uri = r.get("member")
             if member_uri:
-                members.append(CodeListMember(
+                members.append(CodeListMember.model_construct(
                     uri=member_uri,
-                    label=r.get("label") or r.get("rdfsLabel") or _extract_local_name(member_uri),
+                    label=r.get("label") or _extract_local_name(member_uri),
                     notation=r.get("notation"),
                     description=r.get("description")
                 ))
 
     elif pattern == "owl_oneof":
         # Get members by traversing rdf:List via property path
-        members_query = f"""
-        SELECT DISTINCT ?member ?label WHERE {{
-            GRAPH <{ontology}> {{
-                <{entity}> <{OWL_ONE_OF}>/<{RDF_REST}>*/<{RDF_FIRST}> ?member .
-                FILTER(isIRI(?member))
-                OPTIONAL {{ ?member <http://www.w3.org/2000/01/rdf-schema#label> ?label }}
-            }}
-        }} LIMIT 500
-        """
-        results = store.query(members_query)
+        members_query = _CODELIST_ONEOF_MEMBERS_TPL.format(entity=entity)
+        results = store.query(members_query, graph_name=ontology)
         for r in results:
+            if entity_label is None:
+                entity_label = r.get("entityLabel")
             member_uri = r.get("member")
             if member_uri:
-                members.append(CodeListMember(
+                members.append(CodeListMember.model_construct(
                     uri=member_uri,
                     label=r.get("label") or _extract_local_name(member_uri),
                     description=None
@@ -1696,29 +2083,27 @@ async def get_codelist_info(ontology: str, entity: str) -> CodeListInfo | None:
 
     elif pattern == "owl_equivalent_oneof":
         # Get members through equivalentClass -> oneOf -> rdf:List
-        members_query = f"""
-        SELECT DISTINCT ?member ?label WHERE {{
-            GRAPH <{ontology}> {{
-                <{entity}> <{OWL_EQUIVALENT_CLASS}>/<{OWL_ONE_OF}>/<{RDF_REST}>*/<{RDF_FIRST}> ?member .
-                FILTER(isIRI(?member))
-                OPTIONAL {{ ?member <http://www.w3.org/2000/01/rdf-schema#label> ?label }}
-            }}
-        }} LIMIT 500
-        """
-        results = store.query(members_query)
+        members_query = _CODELIST_EQUIV_ONEOF_MEMBERS_TPL.format(entity=entity)
+        results = store.query(members_query, graph_name=ontology)
         for r in results:
+            if entity_label is None:
+                entity_label = r.get("entityLabel")
             member_uri = r.get("member")
             if member_uri:
-                members.append(CodeListMember(
+                members.append(CodeListMember.model_construct(
                     uri=member_uri,
                     label=r.get("label") or _extract_local_name(member_uri),
                     description=None
                 ))
 
-    # Sort members by label
-    members.sort(key=lambda m: m.label.lower())
+    # Sort members by label (decorate-sort so the key is a C-level
+    # itemgetter instead of a Python lambda per element)
+    keyed_members = [(m.label.lower(), m) for m in members]
+    keyed_members.sort(key=itemgetter(0))
+    members = [m for _, m in keyed_members]
 
-    return CodeListInfo(
+    # Values come straight from the store; skip re-validating them
+    return CodeListInfo.model_construct(
         uri=entity,
         label=entity_label or _extract_local_name(entity),
         pattern=pattern,
@@ -1727,14 +2112,12 @@ async def get_codelist_info(ontology: str, entity: str) -> CodeListInfo | None:
     )
 
 
-# Well-known URIs to exclude from the tree (they're implicit roots or meta-classes)
-EXCLUDED_CLASSES = {
-    "http://www.w3.org/2002/07/owl#Thing",
-    "http://www.w3.org/2002/07/owl#Nothing",
-    "http://www.w3.org/2000/01/rdf-schema#Resource",
-    "http://www.w3.org/2000/01/rdf-schema#Class",
-    "http://www.w3.org/2002/07/owl#Class",
-}
+@app.get("/api/codelist", response_model=CodeListInfo | None)
+async def get_codelist_info(ontology: str, entity: str) -> CodeListInfo | None:
+    """Get code list members if the entity is a code list/enumeration."""
+    store = get_store()
+    return await asyncio.to_thread(_build_codelist_info, store, ontology, entity)
+
 
 # Namespaces that are infrastructure/metadata, not domain content
 # Classes from these namespaces should not appear in the hierarchy
@@ -1742,8 +2125,13 @@ EXCLUDED_NAMESPACES = {
     "http://www.geneontology.org/formats/oboInOwl#",  # OBO-to-OWL translation infrastructure
 }
 
+@lru_cache(maxsize=4096)
 def _extract_namespace(uri: str) -> str:
-    """Extract namespace from a URI (everything up to and including last # or /)."""
+    """Extract namespace from a URI (everything up to and including last # or /).
+
+    Cached: ontologies draw from a bounded URI set and the hierarchy and
+    entity paths ask for the same namespaces over and over.
+    """
     hash_idx = uri.rfind("#")
     if hash_idx >= 0:
         return uri[: hash_idx + 1]
@@ -1764,9 +2152,31 @@ def _get_prefix_for_namespace(namespace: str) -> str | None:
     return WELL_KNOWN_PREFIXES.get(namespace)
 
 
-def _detect_internal_namespaces(class_uris: list[str], threshold: float = 0.05) -> set[str]:
+# Well-known namespaces sorted longest-first so the first startswith match
+# is the longest one; built once at import for per-URI shortening
+_WELL_KNOWN_SORTED: list[tuple[str, str]] = sorted(
+    WELL_KNOWN_PREFIXES.items(), key=lambda kv: -len(kv[0])
+)
+
+
+def shorten_uri(uri: str) -> str | None:
+    """Shorten a full URI to prefix:localName using well-known namespaces.
+
+    Returns None when no well-known namespace is a prefix of the URI.
+    """
+    for namespace, prefix in _WELL_KNOWN_SORTED:
+        if uri.startswith(namespace):
+            return f"{prefix}:{uri[len(namespace):]}"
+    return None
+
+
+def _detect_internal_namespaces(namespaces: list[str], threshold: float = 0.05) -> set[str]:
     """Detect internal namespaces by finding common prefixes among classes.
 
+    Takes one (pre-extracted) namespace per class, duplicates included, so
+    callers that already know each class's namespace don't pay for a second
+    round of URI splitting.
+
     Uses a two-pass approach:
     1. Find namespace prefixes that contain a significant portion of classes
     2. Also include any namespace that shares a common base with major namespaces
@@ -1774,47 +2184,57 @@ def _detect_internal_namespaces(class_uris: list[str], threshold: float = 0.05)
     This handles ontologies like GLOSIS where classes are spread across
     subnamespaces (e.g., glosis/model/layerhorizon/, glosis/model/common/).
     """
-    from collections import Counter
-
-    if not class_uris:
+    if not namespaces:
         return set()
 
-    # Get all exact namespaces
-    all_namespaces = [_extract_namespace(uri) for uri in class_uris]
-    namespace_counts = Counter(all_namespaces)
-    total = len(class_uris)
-    min_count = max(3, int(total * threshold))
+    namespace_counts = Counter(namespaces)
+    min_count = max(3, int(len(namespaces) * threshold))
 
     # Find major namespaces (above threshold)
     major_namespaces = {ns for ns, count in namespace_counts.items() if count >= min_count}
 
     # Find common base prefixes among major namespaces
     # e.g., if we have glosis/model/layerhorizon/ and glosis/model/common/,
-    # detect glosis/model/ as a common base
+    # detect glosis/model/ as a common base. Namespaces sharing a prefix are
+    # contiguous in sorted order, so scanning adjacent pairs finds every
+    # prefix shared by >=2 majors without sweeping all of major_namespaces
+    # per candidate prefix.
     base_prefixes: set[str] = set()
-    for ns in major_namespaces:
-        # Try progressively shorter prefixes
-        parts = ns.rstrip("/").split("/")
-        for i in range(3, len(parts)):  # At least 3 parts (http://domain/path)
-            prefix = "/".join(parts[:i]) + "/"
-            # Count how many major namespaces share this prefix
-            matches = sum(1 for mns in major_namespaces if mns.startswith(prefix))
-            if matches >= 2:  # At least 2 major namespaces share this prefix
-                base_prefixes.add(prefix)
+    sorted_majors = sorted(major_namespaces)
+    for a, b in zip(sorted_majors, sorted_majors[1:]):
+        a_parts = a.rstrip("/").split("/")
+        b_parts = b.rstrip("/").split("/")
+        shared = 0
+        for x, y in zip(a_parts, b_parts):
+            if x != y:
+                break
+            shared += 1
+        # Every /-terminated prefix of the shared run counts, down to
+        # 3 parts (http://domain/path)
+        for i in range(3, shared + 1):
+            base_prefixes.add("/".join(a_parts[:i]) + "/")
 
     # A namespace is internal if:
     # 1. It's a major namespace, OR
     # 2. It starts with a detected base prefix
     internal = set(major_namespaces)
-    for ns in namespace_counts.keys():
-        if any(ns.startswith(base) for base in base_prefixes):
-            internal.add(ns)
+    if base_prefixes:
+        bases = tuple(base_prefixes)
+        internal.update(ns for ns in namespace_counts if ns.startswith(bases))
 
     return internal
 
 
+# Serialized response bodies per ontology, validated against Store.version.
+# The tree is recomputed only after a write; repeated navigation fetches are
+# answered from the cached bytes, skipping SPARQL, tree assembly, and
+# serialization alike. Config edits also bump the version, so toggling
+# namespaces or show_deprecated invalidates naturally.
+_HIERARCHY_CACHE: dict[str, tuple[tuple[int, int], bytes]] = {}
+
+
 @app.get("/api/ontologies/{ontology_uri:path}/hierarchy", response_model=list[HierarchyNode])
-async def get_class_hierarchy(ontology_uri: str) -> list[HierarchyNode]:
+async def get_class_hierarchy(ontology_uri: str) -> Response:
     """Get the class hierarchy for an ontology.
 
     Returns classes from selected namespaces plus all their ancestors.
@@ -1827,136 +2247,125 @@ async def get_class_hierarchy(ontology_uri: str) -> list[HierarchyNode]:
     """
     store = get_store()
 
-    # Query for all OWL/RDFS classes with their metadata
-    query = f"""
-    SELECT DISTINCT ?class ?label ?prefixIRI ?parent ?deprecated WHERE {{
-        GRAPH <{ontology_uri}> {{
-            {{ ?class a <{OWL_CLASS}> . }}
-            UNION
-            {{ ?class a <{RDFS_CLASS}> . }}
+    cached = _HIERARCHY_CACHE.get(ontology_uri)
+    if cached is not None and cached[0] == store.cache_token:
+        return Response(content=cached[1], media_type="application/json")
 
-            OPTIONAL {{ ?class <http://www.w3.org/2000/01/rdf-schema#label> ?label }}
-            OPTIONAL {{ ?class <http://data.bioontology.org/metadata/prefixIRI> ?prefixIRI }}
-            OPTIONAL {{ ?class <http://www.w3.org/2002/07/owl#deprecated> ?deprecated }}
-            OPTIONAL {{
-                ?class <http://www.w3.org/2000/01/rdf-schema#subClassOf> ?parent .
-                FILTER(isIRI(?parent))
-            }}
-        }}
-    }}
-    """
-    results = store.query(query)
+    config = _get_ontology_config(store, ontology_uri)
 
-    def is_in_excluded_namespace(uri: str) -> bool:
-        """Check if a URI is in an excluded infrastructure namespace."""
-        ns = _extract_namespace(uri)
-        return ns in EXCLUDED_NAMESPACES
+    # Constant query text; the graph is scoped via graph_name
+    query = _HIERARCHY_QUERY if config.show_deprecated else _HIERARCHY_QUERY_HIDE_DEPRECATED
+    results = store.query(query, graph_name=ontology_uri)
 
     # Build complete class info map (all classes in ontology)
-    # Track has_label separately to filter stub classes later
-    all_classes: dict[str, dict] = {}  # uri -> {label, prefixIRI, deprecated, parents: [], has_label: bool}
+    # Track has_label separately to filter stub classes later. A class with
+    # N parents arrives as N rows, so the info dict is fetched once per row
+    # and parents collect in a set for O(1) dedup on multiple inheritance.
+    # Each class's namespace is extracted exactly once and kept on the info
+    # dict; later namespace checks are set lookups, not string splitting.
+    all_classes: dict[str, dict] = {}  # uri -> {label, ns, prefixIRI, deprecated, parents: set, has_label: bool}
+    excluded_uris: set[str] = set()
+    intern = sys.intern
     for row in results:
         class_uri = row.get("class")
-        if not class_uri or class_uri.startswith("_:") or class_uri in EXCLUDED_CLASSES:
+        if not class_uri or class_uri.startswith("_:"):
             continue
-        if is_in_excluded_namespace(class_uri):
+        # Long URIs escape CPython's automatic interning; the same class
+        # URI recurs as dict key, parent reference, and inclusion-set
+        # member, so interning collapses those copies to one object and
+        # turns later lookups into pointer comparisons
+        class_uri = intern(class_uri)
+        if class_uri in excluded_uris:
             continue
 
-        if class_uri not in all_classes:
+        info = all_classes.get(class_uri)
+        if info is None:
+            ns = intern(_extract_namespace(class_uri))
+            if ns in EXCLUDED_NAMESPACES:
+                excluded_uris.add(class_uri)
+                continue
             deprecated_val = row.get("deprecated")
             raw_label = row.get("label")
-            all_classes[class_uri] = {
+            info = all_classes[class_uri] = {
                 "label": raw_label or _extract_local_name(class_uri),
                 "has_label": raw_label is not None,  # True if class has rdfs:label
+                "ns": ns,
                 "prefixIRI": row.get("prefixIRI"),
                 "deprecated": str(deprecated_val).lower() == "true" if deprecated_val else False,
-                "parents": []
+                "parents": set()
             }
 
+        # Meta-classes and blank-node parents are already filtered in the query
         parent = row.get("parent")
-        if parent and parent not in EXCLUDED_CLASSES and not parent.startswith("_:"):
-            if parent not in all_classes[class_uri]["parents"]:
-                all_classes[class_uri]["parents"].append(parent)
+        if parent:
+            info["parents"].add(intern(parent))
 
-    # Get namespace config
-    config = _get_ontology_config(store, ontology_uri)
     if config.selected_namespaces:
         selected_namespaces = set(config.selected_namespaces)
     else:
         # No config yet - auto-detect for initial display
-        all_class_uris = list(all_classes.keys())
-        selected_namespaces = _detect_internal_namespaces(all_class_uris)
-
-    def is_in_selected_namespace(uri: str) -> bool:
-        ns = _extract_namespace(uri)
-        return ns in selected_namespaces
-
-    def is_stub_class(uri: str) -> bool:
-        """Check if a class is a stub (no label and no named parents).
-
-        Stub classes are references imported from other ontologies that only have
-        rdf:type owl:Class but no meaningful content. They shouldn't appear in the tree.
-        """
-        info = all_classes.get(uri)
-        if not info:
-            return True
-        # A class is a stub if it has no label AND no named parents
-        return not info["has_label"] and len(info["parents"]) == 0
+        selected_namespaces = _detect_internal_namespaces(
+            [info["ns"] for info in all_classes.values()]
+        )
 
-    # Find leaf classes (from selected namespaces, excluding stubs)
+    # Find leaf classes: selected namespace and not a stub. Stubs (no label
+    # and no named parents) are references imported from other ontologies
+    # that only carry rdf:type owl:Class; they shouldn't appear in the tree.
     leaf_classes = {
-        uri for uri in all_classes
-        if is_in_selected_namespace(uri) and not is_stub_class(uri)
+        uri for uri, info in all_classes.items()
+        if info["ns"] in selected_namespaces and (info["has_label"] or info["parents"])
     }
 
-    # Walk up ancestor chains to collect all classes we need to show
+    # Walk up ancestor chains to collect all classes we need to show.
+    # One reverse BFS seeded with every leaf: each class's parent list is
+    # expanded at most once in total, instead of once per leaf that
+    # inherits through it (parents are already filtered of excluded and
+    # blank-node entries above).
     classes_to_include: set[str] = set(leaf_classes)
-
-    def collect_ancestors(uri: str, visited: set[str]) -> None:
-        """Recursively collect all ancestors of a class."""
-        if uri in visited:
-            return
-        visited.add(uri)
-
-        class_info = all_classes.get(uri)
+    queue = deque(leaf_classes)
+    while queue:
+        class_info = all_classes.get(queue.popleft())
         if not class_info:
-            return
-
+            continue
         for parent_uri in class_info["parents"]:
-            if parent_uri not in EXCLUDED_CLASSES:
+            if parent_uri not in classes_to_include:
                 classes_to_include.add(parent_uri)
-                collect_ancestors(parent_uri, visited)
-
-    # Collect ancestors for all leaf classes
-    for leaf_uri in leaf_classes:
-        collect_ancestors(leaf_uri, set())
+                queue.append(parent_uri)
 
-    # Build result nodes (only classes we've decided to include)
-    nodes: list[HierarchyNode] = []
+    # Build result nodes (only classes we've decided to include). Plain
+    # dicts serialized with orjson: the response shape is documented by
+    # response_model, so constructing a HierarchyNode per class just to
+    # tear it back down for JSON would only add allocations.
+    nodes: list[dict] = []
     for uri in classes_to_include:
         class_info = all_classes.get(uri)
         if not class_info:
             # Parent class exists but wasn't in our query results (shouldn't happen often)
             continue
 
-        # Skip deprecated unless show_deprecated is enabled
-        if class_info["deprecated"] and not config.show_deprecated:
-            continue
-
         # Filter parent_uris to only include parents that are also in our included set
         # (This prevents dangling references to excluded classes)
-        filtered_parents = [p for p in class_info["parents"] if p in classes_to_include or p in EXCLUDED_CLASSES]
-
-        nodes.append(HierarchyNode(
-            uri=uri,
-            label=class_info["label"],
-            prefix_iri=class_info["prefixIRI"],
-            entity_type="Class",
-            parent_uris=filtered_parents,
-            is_deprecated=class_info["deprecated"]
-        ))
+        filtered_parents = sorted(
+            p for p in class_info["parents"] if p in classes_to_include
+        )
+
+        nodes.append({
+            "uri": uri,
+            "label": class_info["label"],
+            "prefix_iri": class_info["prefixIRI"],
+            "entity_type": "Class",
+            "parent_uris": filtered_parents,
+            "is_deprecated": class_info["deprecated"],
+        })
 
-    return sorted(nodes, key=lambda n: n.label.lower())
+    keyed_nodes = [(n["label"].lower(), n) for n in nodes]
+    keyed_nodes.sort(key=itemgetter(0))
+    nodes = [n for _, n in keyed_nodes]
+    body = orjson.dumps(nodes)
+    if len(_HIERARCHY_CACHE) >= 64:
+        _HIERARCHY_CACHE.clear()
+    _HIERARCHY_CACHE[ontology_uri] = (store.cache_token, body)
+    return Response(content=body, media_type="application/json")
 
 
 class CodeListSummary(BaseModel):
@@ -1969,8 +2378,12 @@ class CodeListSummary(BaseModel):
     member_count: int
 
 
+_CODELIST_CACHE: dict[str, tuple[tuple[int, int], bytes]] = {}
+_CodeListSummaryList = TypeAdapter(list[CodeListSummary])
+
+
 @app.get("/api/ontologies/{ontology_uri:path}/codelists", response_model=list[CodeListSummary])
-async def list_codelists(ontology_uri: str) -> list[CodeListSummary]:
+async def list_codelists(ontology_uri: str) -> Response:
     """List SKOS concept schemes and collections in an ontology.
 
     Returns schemes/collections with member counts for the sidebar.
@@ -1978,72 +2391,62 @@ async def list_codelists(ontology_uri: str) -> list[CodeListSummary]:
     """
     store = get_store()
 
+    cached = _CODELIST_CACHE.get(ontology_uri)
+    if cached is not None and cached[0] == store.cache_token:
+        return Response(content=cached[1], media_type="application/json")
+
+    codelists = await asyncio.to_thread(_build_codelist_summaries, store, ontology_uri)
+
+    keyed_lists = [(cl.label.lower(), cl) for cl in codelists]
+    keyed_lists.sort(key=itemgetter(0))
+    codelists = [cl for _, cl in keyed_lists]
+    body = _CodeListSummaryList.dump_json(codelists)
+    if len(_CODELIST_CACHE) >= 64:
+        _CODELIST_CACHE.clear()
+    _CODELIST_CACHE[ontology_uri] = (store.cache_token, body)
+    return Response(content=body, media_type="application/json")
+
+
+def _build_codelist_summaries(store: Store, ontology_uri: str) -> list[CodeListSummary]:
+    """Run both codelist aggregation queries in the calling thread."""
+    # Pure OWL ontologies have no SKOS membership triples at all; a cheap
+    # ASK spares them the two COUNT/GROUP BY scans below
+    if not store.ask(_CODELIST_HAS_SKOS_ASK, graph_name=ontology_uri):
+        return []
+
     codelists: list[CodeListSummary] = []
 
     # Pattern 1: SKOS ConceptSchemes with inScheme members
-    skos_query = f"""
-    SELECT ?scheme ?label (COUNT(DISTINCT ?member) as ?count) WHERE {{
-        GRAPH <{ontology_uri}> {{
-            ?member <{SKOS_IN_SCHEME}> ?scheme .
-            OPTIONAL {{ ?scheme <http://www.w3.org/2000/01/rdf-schema#label> ?label }}
-        }}
-    }} GROUP BY ?scheme ?label
-    """
-    skos_results = store.query(skos_query)
+    skos_results = store.query(_CODELIST_SCHEMES_QUERY, graph_name=ontology_uri)
     for r in skos_results:
         uri = r.get("scheme")
         if uri and not uri.startswith("_:"):
-            codelists.append(CodeListSummary(
+            codelists.append(CodeListSummary.model_construct(
                 uri=uri,
                 label=r.get("label") or _extract_local_name(uri),
                 pattern="skos_scheme",
-                member_count=int(r.get("count", 0))
+                member_count=int(r.get("count", 0)),
+                prefix_iri=r.get("prefixIRI")
             ))
 
     # Track URIs we've already added
     seen_uris = {cl.uri for cl in codelists}
 
     # Pattern 2: SKOS Collections with skos:member
-    collection_query = f"""
-    SELECT ?collection ?label (COUNT(DISTINCT ?member) as ?count) WHERE {{
-        GRAPH <{ontology_uri}> {{
-            ?collection <{SKOS_MEMBER}> ?member .
-            OPTIONAL {{ ?collection <http://www.w3.org/2000/01/rdf-schema#label> ?label }}
-        }}
-    }} GROUP BY ?collection ?label
-    """
-    collection_results = store.query(collection_query)
+    collection_results = store.query(_CODELIST_COLLECTIONS_QUERY, graph_name=ontology_uri)
     for r in collection_results:
         uri = r.get("collection")
         if uri and not uri.startswith("_:") and uri not in seen_uris:
-            codelists.append(CodeListSummary(
+            codelists.append(CodeListSummary.model_construct(
                 uri=uri,
                 label=r.get("label") or _extract_local_name(uri),
                 pattern="skos_collection",
-                member_count=int(r.get("count", 0))
+                member_count=int(r.get("count", 0)),
+                prefix_iri=r.get("prefixIRI")
             ))
             seen_uris.add(uri)
 
-    # Fetch prefixIRIs for all collected URIs
-    if codelists:
-        uris_to_check = [cl.uri for cl in codelists]
-        prefix_query = f"""
-        SELECT ?uri ?prefixIRI WHERE {{
-            GRAPH <{ontology_uri}> {{
-                VALUES ?uri {{ {' '.join(f'<{u}>' for u in uris_to_check)} }}
-                ?uri <http://data.bioontology.org/metadata/prefixIRI> ?prefixIRI .
-            }}
-        }}
-        """
-        prefix_results = store.query(prefix_query)
-        prefix_map = {r.get("uri"): r.get("prefixIRI") for r in prefix_results if r.get("uri")}
-
-        # Set prefix_iri field (let frontend compute display name)
-        for cl in codelists:
-            cl.prefix_iri = prefix_map.get(cl.uri)
-
-    # Sort by label
-    return sorted(codelists, key=lambda cl: cl.label.lower())
+    return codelists
 
 
 def configure(data_dir: Path, serve_frontend: bool = True) -> None:
@@ -135,30 +135,66 @@ def persistent_store(temp_store_path):
     return Store(temp_store_path)
 
 
-@pytest.fixture
-def loaded_store(memory_store):
-    """Provide a store pre-loaded with sample ontology."""
-    memory_store.load_rdf(
+@pytest.fixture(scope="session")
+def loaded_store():
+    """Provide a store pre-loaded with sample ontology.
+
+    Session-scoped: the sample Turtle is parsed once for the whole run.
+    Tests that mutate the store must use fresh_loaded_store instead.
+    """
+    store = Store()
+    store.load_rdf(
         SAMPLE_ONTOLOGY_TTL,
         format=RdfFormat.TURTLE,
         graph_name=ONTOLOGY_URI,
     )
-    return memory_store
+    return store
 
 
 @pytest.fixture
+def fresh_loaded_store(loaded_store):
+    """Function-scoped loaded store for tests that mutate it.
+
+    Snapshots the session store (N-Quads dump + bulk load) instead of
+    re-parsing the Turtle, so a private mutable copy costs almost
+    nothing per test.
+    """
+    return loaded_store.snapshot()
+
+
+@pytest.fixture(scope="session")
+def shared_store():
+    """One store shared by the whole session.
+
+    Named graphs isolate tests from each other, so small load-and-query
+    tests can reuse this store's warm indexes instead of each paying for
+    a fresh Store. Pair with unique_graph; tests that mutate outside
+    their own graph still need memory_store.
+    """
+    return Store()
+
+
+@pytest.fixture
+def unique_graph(request, shared_store):
+    """A per-test named graph in the shared store, dropped on teardown."""
+    graph_name = f"urn:test:{request.node.name}"
+    yield graph_name
+    shared_store.clear(graph_name=graph_name)
+
+
+@pytest.fixture(scope="session")
 def sample_ttl():
     """Return sample Turtle ontology data."""
     return SAMPLE_ONTOLOGY_TTL
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_xml():
     """Return sample RDF/XML ontology data."""
     return SAMPLE_ONTOLOGY_XML
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def ontology_uri():
     """Return the sample ontology URI."""
     return ONTOLOGY_URI
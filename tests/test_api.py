@@ -2,6 +2,7 @@
 
 import pytest
 from pathlib import Path
+from urllib.parse import quote
 from fastapi.testclient import TestClient
 
 from ait.store import Store, RdfFormat
@@ -37,42 +38,60 @@ ex:SiblingClass a owl:Class ;
 """
 
 ONTOLOGY_URI = "http://example.org/test"
+# Percent-encoded once for path-parameter URLs instead of per test
+ENCODED_ONTOLOGY_URI = quote(ONTOLOGY_URI, safe="")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_store():
-    """Create a test store with sample data (in-memory)."""
+    """Create a test store with sample data (in-memory).
+
+    Session-scoped: the API tests only read, so the Turtle is parsed once
+    and the same store is rebound per test by the client fixture.
+    """
     store = Store()  # In-memory store
     store.load_rdf(SAMPLE_ONTOLOGY, format=RdfFormat.TURTLE, graph_name=ONTOLOGY_URI)
     yield store, Path("/tmp/test-ait")
 
 
+@pytest.fixture(scope="session")
+def session_client():
+    """One TestClient for the whole run.
+
+    Entering TestClient runs the app lifespan (router build, MCP session
+    manager startup); doing that once instead of per test saves ~20
+    startup/shutdown cycles. Tests swap stores by rebinding web._store,
+    which every endpoint reads through get_store().
+    """
+    # Bind a placeholder store so lifespan startup never falls back to
+    # opening the persistent on-disk store
+    web._store = Store()
+    web._data_dir = Path("/tmp/test-ait")
+    with TestClient(web.app) as client:
+        yield client
+    web._store = None
+
+
 @pytest.fixture
-def client(test_store):
-    """Create a test client with configured store."""
+def client(session_client, test_store):
+    """The shared client, bound to the pre-loaded test store."""
     store, store_path = test_store
 
-    # Configure the web module to use our test store
     web._store = store
     web._data_dir = store_path.parent
 
-    with TestClient(web.app) as client:
-        yield client
+    yield session_client
 
-    # Cleanup
     web._store = None
 
 
 @pytest.fixture
-def empty_client():
-    """Create a test client with empty store (in-memory)."""
-    store = Store()  # In-memory store
-
-    web._store = store
+def empty_client(session_client):
+    """The shared client, bound to a fresh empty store (in-memory)."""
+    web._store = Store()
     web._data_dir = Path("/tmp/test-ait")
 
-    with TestClient(web.app) as client:
-        yield client
+    yield session_client
 
     web._store = None
 
@@ -113,8 +132,7 @@ class TestGetOntologyGraph:
 
     def test_get_graph(self, client):
         """Returns graph data with nodes and edges."""
-        encoded_uri = ONTOLOGY_URI.replace("/", "%2F").replace(":", "%3A")
-        response = client.get(f"/api/ontologies/{encoded_uri}/graph")
+        response = client.get(f"/api/ontologies/{ENCODED_ONTOLOGY_URI}/graph")
         assert response.status_code == 200
 
         data = response.json()
@@ -125,8 +143,7 @@ class TestGetOntologyGraph:
 
     def test_graph_nodes_have_required_fields(self, client):
         """Graph nodes have id, label, and type."""
-        encoded_uri = ONTOLOGY_URI.replace("/", "%2F").replace(":", "%3A")
-        response = client.get(f"/api/ontologies/{encoded_uri}/graph")
+        response = client.get(f"/api/ontologies/{ENCODED_ONTOLOGY_URI}/graph")
         data = response.json()
 
         for node in data["nodes"]:
@@ -136,8 +153,7 @@ class TestGetOntologyGraph:
 
     def test_graph_edges_have_required_fields(self, client):
         """Graph edges have source, target, and label."""
-        encoded_uri = ONTOLOGY_URI.replace("/", "%2F").replace(":", "%3A")
-        response = client.get(f"/api/ontologies/{encoded_uri}/graph")
+        response = client.get(f"/api/ontologies/{ENCODED_ONTOLOGY_URI}/graph")
         data = response.json()
 
         for edge in data["edges"]:
@@ -147,8 +163,7 @@ class TestGetOntologyGraph:
 
     def test_graph_contains_subclass_edges(self, client):
         """Graph includes subClassOf relationships."""
-        encoded_uri = ONTOLOGY_URI.replace("/", "%2F").replace(":", "%3A")
-        response = client.get(f"/api/ontologies/{encoded_uri}/graph")
+        response = client.get(f"/api/ontologies/{ENCODED_ONTOLOGY_URI}/graph")
         data = response.json()
 
         # Should have subClassOf edges
@@ -157,8 +172,7 @@ class TestGetOntologyGraph:
 
     def test_graph_limit_parameter(self, client):
         """Can limit number of results."""
-        encoded_uri = ONTOLOGY_URI.replace("/", "%2F").replace(":", "%3A")
-        response = client.get(f"/api/ontologies/{encoded_uri}/graph?limit=2")
+        response = client.get(f"/api/ontologies/{ENCODED_ONTOLOGY_URI}/graph?limit=2")
         assert response.status_code == 200
 
     def test_graph_not_found(self, client):
@@ -172,8 +186,7 @@ class TestListClasses:
 
     def test_list_classes(self, client):
         """Returns list of classes."""
-        encoded_uri = ONTOLOGY_URI.replace("/", "%2F").replace(":", "%3A")
-        response = client.get(f"/api/ontologies/{encoded_uri}/classes")
+        response = client.get(f"/api/ontologies/{ENCODED_ONTOLOGY_URI}/classes")
         assert response.status_code == 200
 
         data = response.json()
@@ -182,8 +195,7 @@ class TestListClasses:
 
     def test_classes_have_required_fields(self, client):
         """Classes have uri and label."""
-        encoded_uri = ONTOLOGY_URI.replace("/", "%2F").replace(":", "%3A")
-        response = client.get(f"/api/ontologies/{encoded_uri}/classes")
+        response = client.get(f"/api/ontologies/{ENCODED_ONTOLOGY_URI}/classes")
         data = response.json()
 
         for cls in data:
@@ -192,8 +204,7 @@ class TestListClasses:
 
     def test_classes_limit_parameter(self, client):
         """Can limit number of classes returned."""
-        encoded_uri = ONTOLOGY_URI.replace("/", "%2F").replace(":", "%3A")
-        response = client.get(f"/api/ontologies/{encoded_uri}/classes?limit=2")
+        response = client.get(f"/api/ontologies/{ENCODED_ONTOLOGY_URI}/classes?limit=2")
         assert response.status_code == 200
         assert len(response.json()) <= 2
 
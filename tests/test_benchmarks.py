@@ -0,0 +1,60 @@
+"""Micro-benchmarks for Store hot paths (requires pytest-benchmark).
+
+Skipped automatically when the plugin isn't installed, so the normal
+run stays fast; run them explicitly with:
+
+    pytest tests/test_benchmarks.py --benchmark-only
+
+Nightly CI can compare against a saved baseline with
+--benchmark-compare-fail=mean:10% to catch regressions mechanically.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from ait.store import Store, RdfFormat
+
+ONTOLOGY_URI = "http://example.org/ontology"
+
+_Q_SIMPLE_SELECT = f"""
+    SELECT ?s WHERE {{
+        GRAPH <{ONTOLOGY_URI}> {{
+            ?s a <http://www.w3.org/2002/07/owl#Class>
+        }}
+    }} LIMIT 5
+"""
+
+_Q_CLASS_LABELS = f"""
+    SELECT ?class ?label WHERE {{
+        GRAPH <{ONTOLOGY_URI}> {{
+            ?class a <http://www.w3.org/2002/07/owl#Class> .
+            ?class <http://www.w3.org/2000/01/rdf-schema#label> ?label .
+        }}
+    }} LIMIT 5
+"""
+
+
+@pytest.mark.benchmark(group="parse")
+def test_bench_load_turtle(benchmark, sample_ttl, ontology_uri):
+    """Turtle parse + load of the sample ontology."""
+    benchmark(lambda: Store().load_rdf(sample_ttl, format=RdfFormat.TURTLE, graph_name=ontology_uri))
+
+
+@pytest.mark.benchmark(group="parse")
+def test_bench_load_nquads(benchmark, loaded_store):
+    """Bulk N-Quads reload of the same data (the snapshot path)."""
+    data = loaded_store.dump(RdfFormat.NQUADS)
+    benchmark(lambda: Store().load_rdf(data, format=RdfFormat.NQUADS, bulk=True))
+
+
+@pytest.mark.benchmark(group="query")
+def test_bench_query_uncached(benchmark, loaded_store):
+    """SELECT evaluation without the result cache."""
+    benchmark(lambda: loaded_store._query_uncached(_Q_SIMPLE_SELECT, None, 0))
+
+
+@pytest.mark.benchmark(group="query")
+def test_bench_query_cached(benchmark, loaded_store):
+    """SELECT through query(), hitting the version-keyed cache."""
+    benchmark(lambda: loaded_store.query(_Q_CLASS_LABELS))
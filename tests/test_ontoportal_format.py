@@ -5,9 +5,11 @@ OntoPortal instances (BioPortal, AgroPortal, etc.) can be properly
 loaded and queried.
 """
 
+from itertools import islice
+
 import pytest
 from ait.store import Store, RdfFormat
-from ait.web import parse_ontoportal_url, ONTOPORTAL_URL_PATTERNS
+from ait.web import parse_ontoportal_url
 from ait.clients.ontoportal import OntoPortalInstance
 
 
@@ -117,10 +119,18 @@ skos:Concept a owl:Class ;
 
 ONTOLOGY_URI = "https://data.agroportal.lirmm.fr/ontologies/GLOSIS"
 
+# Well-known IRIs, folded to constants so pattern-lookup tests can hit
+# the quad index directly instead of re-parsing SPARQL with inline IRIs
+RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+OWL_OBJECT_PROPERTY = "http://www.w3.org/2002/07/owl#ObjectProperty"
+OWL_DATATYPE_PROPERTY = "http://www.w3.org/2002/07/owl#DatatypeProperty"
+RDFS_DOMAIN = "http://www.w3.org/2000/01/rdf-schema#domain"
+RDFS_RANGE = "http://www.w3.org/2000/01/rdf-schema#range"
+
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def glosis_store():
-    """Store loaded with GLOSIS-style ontology."""
+    """Store loaded with GLOSIS-style ontology (read-only, parsed once)."""
     store = Store()
     store.load_rdf(GLOSIS_STYLE_ONTOLOGY, format=RdfFormat.TURTLE, graph_name=ONTOLOGY_URI)
     return store
@@ -129,92 +139,31 @@ def glosis_store():
 class TestOntoPortalUrlParsing:
     """Test URL parsing for different OntoPortal instances."""
 
-    def test_parse_bioportal_web_url(self):
-        """Can parse BioPortal web interface URL."""
-        result = parse_ontoportal_url("https://bioportal.bioontology.org/ontologies/ENVO")
-        assert result is not None
-        instance, acronym = result
-        assert instance == OntoPortalInstance.BIOPORTAL
-        assert acronym == "ENVO"
-
-    def test_parse_bioportal_api_url(self):
-        """Can parse BioPortal API URL."""
-        result = parse_ontoportal_url("https://data.bioontology.org/ontologies/GO")
-        assert result is not None
-        instance, acronym = result
-        assert instance == OntoPortalInstance.BIOPORTAL
-        assert acronym == "GO"
-
-    def test_parse_agroportal_web_url(self):
-        """Can parse AgroPortal web interface URL."""
-        result = parse_ontoportal_url("https://agroportal.lirmm.fr/ontologies/GLOSIS")
-        assert result is not None
-        instance, acronym = result
-        assert instance == OntoPortalInstance.AGROPORTAL
-        assert acronym == "GLOSIS"
-
-    def test_parse_agroportal_api_url(self):
-        """Can parse AgroPortal API URL."""
-        result = parse_ontoportal_url("https://data.agroportal.lirmm.fr/ontologies/AGROVOC")
-        assert result is not None
-        instance, acronym = result
-        assert instance == OntoPortalInstance.AGROPORTAL
-        assert acronym == "AGROVOC"
-
-    def test_parse_ecoportal_url(self):
-        """Can parse EcoPortal URL."""
-        result = parse_ontoportal_url("https://ecoportal.lifewatch.eu/ontologies/ENVO")
-        assert result is not None
-        instance, acronym = result
-        assert instance == OntoPortalInstance.ECOPORTAL
-        assert acronym == "ENVO"
-
-    def test_parse_matportal_url(self):
-        """Can parse MatPortal URL."""
-        result = parse_ontoportal_url("https://matportal.org/ontologies/EMMO")
-        assert result is not None
-        instance, acronym = result
-        assert instance == OntoPortalInstance.MATPORTAL
-        assert acronym == "EMMO"
-
-    def test_parse_http_url(self):
-        """Can parse HTTP (non-HTTPS) URLs."""
-        result = parse_ontoportal_url("http://bioportal.bioontology.org/ontologies/ENVO")
-        assert result is not None
-
-    def test_parse_url_with_trailing_slash(self):
-        """Handles URLs with trailing content gracefully."""
-        # URLs should not have trailing parts for basic parsing
-        result = parse_ontoportal_url("https://bioportal.bioontology.org/ontologies/ENVO")
-        assert result is not None
-
-    def test_parse_invalid_url(self):
-        """Returns None for non-OntoPortal URLs."""
-        result = parse_ontoportal_url("https://example.org/ontologies/TEST")
-        assert result is None
-
-    def test_parse_empty_string(self):
-        """Returns None for empty string."""
-        result = parse_ontoportal_url("")
-        assert result is None
-
-    def test_acronym_with_numbers(self):
-        """Can parse acronyms containing numbers."""
-        result = parse_ontoportal_url("https://bioportal.bioontology.org/ontologies/GO2")
-        assert result is not None
-        assert result[1] == "GO2"
-
-    def test_acronym_with_underscore(self):
-        """Can parse acronyms containing underscores."""
-        result = parse_ontoportal_url("https://bioportal.bioontology.org/ontologies/SOME_ONTO")
-        assert result is not None
-        assert result[1] == "SOME_ONTO"
-
-    def test_acronym_with_hyphen(self):
-        """Can parse acronyms containing hyphens."""
-        result = parse_ontoportal_url("https://bioportal.bioontology.org/ontologies/SOME-ONTO")
-        assert result is not None
-        assert result[1] == "SOME-ONTO"
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            # web and data-API hosts for each portal
+            ("https://bioportal.bioontology.org/ontologies/ENVO", (OntoPortalInstance.BIOPORTAL, "ENVO")),
+            ("https://data.bioontology.org/ontologies/GO", (OntoPortalInstance.BIOPORTAL, "GO")),
+            ("https://agroportal.lirmm.fr/ontologies/GLOSIS", (OntoPortalInstance.AGROPORTAL, "GLOSIS")),
+            ("https://data.agroportal.lirmm.fr/ontologies/AGROVOC", (OntoPortalInstance.AGROPORTAL, "AGROVOC")),
+            ("https://ecoportal.lifewatch.eu/ontologies/ENVO", (OntoPortalInstance.ECOPORTAL, "ENVO")),
+            ("https://matportal.org/ontologies/EMMO", (OntoPortalInstance.MATPORTAL, "EMMO")),
+            # plain HTTP still parses
+            ("http://bioportal.bioontology.org/ontologies/ENVO", (OntoPortalInstance.BIOPORTAL, "ENVO")),
+            # acronym character classes
+            ("https://bioportal.bioontology.org/ontologies/GO2", (OntoPortalInstance.BIOPORTAL, "GO2")),
+            ("https://bioportal.bioontology.org/ontologies/SOME_ONTO", (OntoPortalInstance.BIOPORTAL, "SOME_ONTO")),
+            ("https://bioportal.bioontology.org/ontologies/SOME-ONTO", (OntoPortalInstance.BIOPORTAL, "SOME-ONTO")),
+            # non-portal hosts and empty input
+            ("https://example.org/ontologies/TEST", None),
+            ("", None),
+        ],
+    )
+    def test_parse(self, url, expected):
+        """parse_ontoportal_url maps each URL to (instance, acronym) or None."""
+        assert parse_ontoportal_url(url) == expected
+
 
 
 class TestGlosisFormatLoading:
@@ -226,86 +175,71 @@ class TestGlosisFormatLoading:
 
     def test_glosis_graph_exists(self, glosis_store):
         """Ontology is loaded into named graph."""
-        graphs = list(glosis_store.graphs())
-        assert ONTOLOGY_URI in graphs
+        assert ONTOLOGY_URI in glosis_store.graph_names()
+
+
+@pytest.fixture(scope="session")
+def glosis_class_facts(glosis_store):
+    """All (class, label, parent) facts from one batched query.
+
+    The class tests each re-scanned the same ?class a owl:Class pattern;
+    fetching the joined facts once and filtering in Python pays the
+    triple-pattern scan a single time for the whole session.
+    """
+    return glosis_store.query(f"""
+        SELECT ?class ?label ?parent WHERE {{
+            GRAPH <{ONTOLOGY_URI}> {{
+                ?class a <http://www.w3.org/2002/07/owl#Class> .
+                OPTIONAL {{ ?class <http://www.w3.org/2000/01/rdf-schema#label> ?label }}
+                OPTIONAL {{ ?class <http://www.w3.org/2000/01/rdf-schema#subClassOf> ?parent }}
+            }}
+        }}
+    """)
 
 
 class TestGlosisClassQueries:
     """Test querying classes from GLOSIS-style ontology."""
 
-    def test_find_owl_classes(self, glosis_store):
+    def test_find_owl_classes(self, glosis_class_facts):
         """Can find OWL classes."""
-        results = glosis_store.query(f"""
-            SELECT ?class WHERE {{
-                GRAPH <{ONTOLOGY_URI}> {{
-                    ?class a <http://www.w3.org/2002/07/owl#Class> .
-                }}
-            }}
-        """)
-        assert len(results) > 0
+        assert len(glosis_class_facts) > 0
 
-    def test_find_classes_with_labels(self, glosis_store):
+    def test_find_classes_with_labels(self, glosis_class_facts):
         """Can find classes with their labels."""
-        results = glosis_store.query(f"""
-            SELECT ?class ?label WHERE {{
-                GRAPH <{ONTOLOGY_URI}> {{
-                    ?class a <http://www.w3.org/2002/07/owl#Class> .
-                    ?class <http://www.w3.org/2000/01/rdf-schema#label> ?label .
-                }}
-            }}
-        """)
-        assert len(results) > 0
-        assert all("label" in r for r in results)
+        labelled = [r for r in glosis_class_facts if r.get("label")]
+        assert len(labelled) > 0
 
-    def test_find_subclass_relationships(self, glosis_store):
+    def test_find_subclass_relationships(self, glosis_class_facts):
         """Can find subClassOf relationships."""
-        results = glosis_store.query(f"""
-            SELECT ?child ?parent WHERE {{
-                GRAPH <{ONTOLOGY_URI}> {{
-                    ?child <http://www.w3.org/2000/01/rdf-schema#subClassOf> ?parent .
-                }}
-            }}
-        """)
-        assert len(results) > 0
+        pairs = [(r["class"], r["parent"]) for r in glosis_class_facts if r.get("parent")]
+        assert len(pairs) > 0
 
-    def test_find_domain_classes(self, glosis_store):
+    def test_find_domain_classes(self, glosis_class_facts):
         """Can find domain-specific classes (glosis namespace)."""
-        results = glosis_store.query(f"""
-            SELECT ?class ?label WHERE {{
-                GRAPH <{ONTOLOGY_URI}> {{
-                    ?class a <http://www.w3.org/2002/07/owl#Class> .
-                    ?class <http://www.w3.org/2000/01/rdf-schema#label> ?label .
-                    FILTER(STRSTARTS(STR(?class), "http://w3id.org/glosis/"))
-                }}
-            }}
-        """)
-        assert len(results) > 0
-
-    def test_find_codelist_classes(self, glosis_store):
+        domain = [
+            r
+            for r in glosis_class_facts
+            if r.get("label") and r["class"].startswith("http://w3id.org/glosis/")
+        ]
+        assert len(domain) > 0
+
+    def test_find_codelist_classes(self, glosis_class_facts):
         """Can find code list classes (subclass of skos:Concept)."""
-        results = glosis_store.query(f"""
-            SELECT ?codelist ?label WHERE {{
-                GRAPH <{ONTOLOGY_URI}> {{
-                    ?codelist a <http://www.w3.org/2002/07/owl#Class> .
-                    ?codelist <http://www.w3.org/2000/01/rdf-schema#subClassOf> <http://www.w3.org/2004/02/skos/core#Concept> .
-                    ?codelist <http://www.w3.org/2000/01/rdf-schema#label> ?label .
-                }}
-            }}
-        """)
-        assert len(results) >= 3  # We have 3 codelist classes
-
-    def test_find_observation_classes(self, glosis_store):
+        codelists = {
+            r["class"]
+            for r in glosis_class_facts
+            if r.get("label") and r.get("parent") == "http://www.w3.org/2004/02/skos/core#Concept"
+        }
+        assert len(codelists) >= 3  # We have 3 codelist classes
+
+    def test_find_observation_classes(self, glosis_class_facts):
         """Can find observation classes (subclass of sosa:Observation)."""
-        results = glosis_store.query(f"""
-            SELECT ?obs ?label WHERE {{
-                GRAPH <{ONTOLOGY_URI}> {{
-                    ?obs a <http://www.w3.org/2002/07/owl#Class> .
-                    ?obs <http://www.w3.org/2000/01/rdf-schema#subClassOf> <http://www.w3.org/ns/sosa/Observation> .
-                    ?obs <http://www.w3.org/2000/01/rdf-schema#label> ?label .
-                }}
-            }}
-        """)
-        assert len(results) >= 2  # AluminiumExtractableElements and CarbonTotal
+        observations = {
+            r["class"]
+            for r in glosis_class_facts
+            if r.get("label") and r.get("parent") == "http://www.w3.org/ns/sosa/Observation"
+        }
+        assert len(observations) >= 2  # AluminiumExtractableElements and CarbonTotal
 
 
 class TestGlosisPropertyQueries:
@@ -313,49 +247,26 @@ class TestGlosisPropertyQueries:
 
     def test_find_object_properties(self, glosis_store):
         """Can find OWL object properties."""
-        results = glosis_store.query(f"""
-            SELECT ?prop ?label WHERE {{
-                GRAPH <{ONTOLOGY_URI}> {{
-                    ?prop a <http://www.w3.org/2002/07/owl#ObjectProperty> .
-                    ?prop <http://www.w3.org/2000/01/rdf-schema#label> ?label .
-                }}
-            }}
-        """)
-        assert len(results) >= 2
+        props = glosis_store.match(
+            predicate=RDF_TYPE, object=OWL_OBJECT_PROPERTY, graph_name=ONTOLOGY_URI
+        )
+        # Early exit: stop scanning as soon as two matches stream out
+        assert sum(1 for _ in islice(props, 2)) == 2
 
     def test_find_datatype_properties(self, glosis_store):
         """Can find OWL datatype properties."""
-        results = glosis_store.query(f"""
-            SELECT ?prop ?label WHERE {{
-                GRAPH <{ONTOLOGY_URI}> {{
-                    ?prop a <http://www.w3.org/2002/07/owl#DatatypeProperty> .
-                    ?prop <http://www.w3.org/2000/01/rdf-schema#label> ?label .
-                }}
-            }}
-        """)
-        assert len(results) >= 2
+        props = glosis_store.match(
+            predicate=RDF_TYPE, object=OWL_DATATYPE_PROPERTY, graph_name=ONTOLOGY_URI
+        )
+        assert sum(1 for _ in islice(props, 2)) == 2
 
     def test_find_property_domains(self, glosis_store):
         """Can find property domain restrictions."""
-        results = glosis_store.query(f"""
-            SELECT ?prop ?domain WHERE {{
-                GRAPH <{ONTOLOGY_URI}> {{
-                    ?prop <http://www.w3.org/2000/01/rdf-schema#domain> ?domain .
-                }}
-            }}
-        """)
-        assert len(results) > 0
+        assert glosis_store.contains_triple(predicate=RDFS_DOMAIN, graph_name=ONTOLOGY_URI)
 
     def test_find_property_ranges(self, glosis_store):
         """Can find property range restrictions."""
-        results = glosis_store.query(f"""
-            SELECT ?prop ?range WHERE {{
-                GRAPH <{ONTOLOGY_URI}> {{
-                    ?prop <http://www.w3.org/2000/01/rdf-schema#range> ?range .
-                }}
-            }}
-        """)
-        assert len(results) > 0
+        assert glosis_store.contains_triple(predicate=RDFS_RANGE, graph_name=ONTOLOGY_URI)
 
 
 class TestGlosisHierarchy:
@@ -363,23 +274,21 @@ class TestGlosisHierarchy:
 
     def test_class_hierarchy_depth(self, glosis_store):
         """Can traverse class hierarchy."""
-        # Find SoilHorizon's parent chain
-        results = glosis_store.query(f"""
-            SELECT ?class ?parent WHERE {{
+        # ASK short-circuits on the first parent in SoilHorizon's chain
+        # instead of materializing every transitive superclass
+        assert glosis_store.ask(f"""
+            ASK {{
                 GRAPH <{ONTOLOGY_URI}> {{
                     <http://w3id.org/glosis/model/layerhorizon/SoilHorizon>
                         <http://www.w3.org/2000/01/rdf-schema#subClassOf>+ ?parent .
                 }}
             }}
         """)
-        # Should find SoilLayer and SF_SamplingFeature in hierarchy
-        parents = [r["parent"] for r in results if "parent" in r]
-        assert len(parents) > 0
 
     def test_find_leaf_classes(self, glosis_store):
         """Can identify leaf classes (no subclasses)."""
-        results = glosis_store.query(f"""
-            SELECT ?class WHERE {{
+        assert glosis_store.ask(f"""
+            ASK {{
                 GRAPH <{ONTOLOGY_URI}> {{
                     ?class a <http://www.w3.org/2002/07/owl#Class> .
                     FILTER NOT EXISTS {{
@@ -389,7 +298,6 @@ class TestGlosisHierarchy:
                 }}
             }}
         """)
-        assert len(results) > 0
 
     def test_multiple_inheritance(self, glosis_store):
         """Can query classes with multiple parents."""
@@ -434,53 +342,71 @@ class TestGlosisMetadata:
         assert results[0]["version"] == "1.0.0"
 
 
+# RDF/XML blobs for format tests, hoisted so the stores below parse
+# them once per module instead of once per test
+RDFXML_ONTOLOGY = """<?xml version="1.0" encoding="UTF-8"?>
+<rdf:RDF
+    xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+    xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#"
+    xmlns:owl="http://www.w3.org/2002/07/owl#">
+
+    <owl:Ontology rdf:about="http://example.org/test">
+        <rdfs:label>Test</rdfs:label>
+    </owl:Ontology>
+
+    <owl:Class rdf:about="http://example.org/test#MyClass">
+        <rdfs:label>My Class</rdfs:label>
+        <rdfs:subClassOf rdf:resource="http://www.w3.org/2002/07/owl#Thing"/>
+    </owl:Class>
+</rdf:RDF>
+"""
+
+RDFXML_CLASSES = """<?xml version="1.0" encoding="UTF-8"?>
+<rdf:RDF
+    xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+    xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#"
+    xmlns:owl="http://www.w3.org/2002/07/owl#">
+
+    <owl:Class rdf:about="http://example.org/test#ClassA">
+        <rdfs:label>Class A</rdfs:label>
+    </owl:Class>
+
+    <owl:Class rdf:about="http://example.org/test#ClassB">
+        <rdfs:label>Class B</rdfs:label>
+        <rdfs:subClassOf rdf:resource="http://example.org/test#ClassA"/>
+    </owl:Class>
+</rdf:RDF>
+"""
+
+
+@pytest.fixture(scope="module")
+def rdfxml_store():
+    """Store with RDFXML_ONTOLOGY parsed once (read-only)."""
+    store = Store()
+    count = store.load_rdf(RDFXML_ONTOLOGY, format=RdfFormat.XML, graph_name="http://test")
+    return store, count
+
+
+@pytest.fixture(scope="module")
+def rdfxml_classes_store():
+    """Store with RDFXML_CLASSES parsed once (read-only)."""
+    store = Store()
+    store.load_rdf(RDFXML_CLASSES, format=RdfFormat.XML, graph_name="http://test")
+    return store
+
+
 class TestRdfXmlFormat:
     """Test loading RDF/XML format (common OntoPortal download format)."""
 
-    def test_load_rdfxml(self):
+    def test_load_rdfxml(self, rdfxml_store):
         """Can load RDF/XML format."""
-        rdfxml = """<?xml version="1.0" encoding="UTF-8"?>
-        <rdf:RDF
-            xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
-            xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#"
-            xmlns:owl="http://www.w3.org/2002/07/owl#">
-
-            <owl:Ontology rdf:about="http://example.org/test">
-                <rdfs:label>Test</rdfs:label>
-            </owl:Ontology>
-
-            <owl:Class rdf:about="http://example.org/test#MyClass">
-                <rdfs:label>My Class</rdfs:label>
-                <rdfs:subClassOf rdf:resource="http://www.w3.org/2002/07/owl#Thing"/>
-            </owl:Class>
-        </rdf:RDF>
-        """
-        store = Store()
-        count = store.load_rdf(rdfxml, format=RdfFormat.XML, graph_name="http://test")
+        store, count = rdfxml_store
         assert count > 0
+        assert len(store) == count
 
-    def test_rdfxml_classes_queryable(self):
+    def test_rdfxml_classes_queryable(self, rdfxml_classes_store):
         """Classes from RDF/XML are queryable."""
-        rdfxml = """<?xml version="1.0" encoding="UTF-8"?>
-        <rdf:RDF
-            xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
-            xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#"
-            xmlns:owl="http://www.w3.org/2002/07/owl#">
-
-            <owl:Class rdf:about="http://example.org/test#ClassA">
-                <rdfs:label>Class A</rdfs:label>
-            </owl:Class>
-
-            <owl:Class rdf:about="http://example.org/test#ClassB">
-                <rdfs:label>Class B</rdfs:label>
-                <rdfs:subClassOf rdf:resource="http://example.org/test#ClassA"/>
-            </owl:Class>
-        </rdf:RDF>
-        """
-        store = Store()
-        store.load_rdf(rdfxml, format=RdfFormat.XML, graph_name="http://test")
-
-        results = store.query("""
+        results = rdfxml_classes_store.query("""
             SELECT ?class ?label WHERE {
                 GRAPH <http://test> {
                     ?class a <http://www.w3.org/2002/07/owl#Class> .